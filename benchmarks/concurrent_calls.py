@@ -0,0 +1,84 @@
+"""
+PyMiecraft Fabric
+基准测试：多线程并发调用
+
+需要已启动并加载本模组的服务器；使用 --client-server 时服务器需以
+-Dpymc.clientServer=true 启动。分别用 1、2、4、8 个工作线程发起同样总数的调用：
+- 短调用：server.getTicks()
+- 阻塞调用：java.lang.Thread.sleep(1)，调用被串行化时总耗时随线程数不变
+输出总耗时、吞吐量与相对单线程的加速比。
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import argparse
+import threading
+import time
+from typing import Callable
+
+from pyminecraft.connection import Connection, get_gateway
+from pyminecraft.javaobj import PymcMngr
+
+N = 2000
+THREADS = (1, 2, 4, 8)
+
+
+def run(case: Callable[[], None], threads: int, calls: int) -> float:
+    """用 threads 个线程共发起 calls 次调用，返回总耗时"""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker() -> None:
+        barrier.wait()
+        for _ in range(calls // threads):
+            case()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """按参数连接，运行全部测量并输出表格"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--client-server", action="store_true")
+    parser.add_argument("--pool-size", type=int, default=0)
+    args = parser.parse_args()
+    Connection.client_server = args.client_server
+    Connection.pool_size = args.pool_size
+
+    gateway = get_gateway()
+    server = PymcMngr.from_gateway(gateway).server
+    factory = server.class_factory
+
+    cases: dict[str, tuple[Callable[[], None], int]] = {
+        "getTicks": (lambda: server.call("getTicks", (), int), N),
+        "sleep 1ms": (
+            lambda: factory.call_static("java.lang.Thread.sleep", (1,)),
+            N // 10,
+        ),
+    }
+
+    mode = "ClientServer" if args.client_server else "JavaGateway"
+    print(f"{mode}, pool size {args.pool_size or 'unbounded'}")
+    print(f"{'case':<12}{'threads':>8}{'ms':>10}{'calls/s':>10}{'speedup':>9}")
+    for name, (case, calls) in cases.items():
+        case()  # 预热，建立连接与缓存
+        base = 0.0
+        for threads in THREADS:
+            spent = run(case, threads, calls)
+            base = base or spent
+            print(
+                f"{name:<12}{threads:>8}{spent * 1e3:>10.1f}"
+                f"{calls / spent:>10.0f}{base / spent:>9.2f}"
+            )
+
+    gateway.close()
+
+
+if __name__ == "__main__":
+    main()
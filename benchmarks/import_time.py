@@ -0,0 +1,58 @@
+"""
+PyMiecraft Fabric
+基准测试：导入耗时
+
+不需要服务器。在新的解释器中 import pyminecraft，输出耗时，并检查导入时：
+- 没有导入 py4j、multiprocessing 与 NumPy
+- 没有启动线程（回调服务器只在第一次连接时启动）
+- 没有连接游戏
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import json
+import subprocess
+import sys
+
+N = 10
+
+PROBE = """
+import json, sys, threading, time
+start = time.perf_counter()
+import pyminecraft
+spent = time.perf_counter() - start
+from pyminecraft.connection import _connection
+heavy = [name for name in ("py4j", "multiprocessing", "numpy") if name in sys.modules]
+print(json.dumps({
+    "spent": spent,
+    "heavy": heavy,
+    "threads": threading.active_count(),
+    "connected": _connection.connected,
+}))
+"""
+
+
+def main() -> None:
+    """多次在子进程中导入并输出结果"""
+    times: list[float] = []
+    for _ in range(N):
+        stdout = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            capture_output=True,
+            check=True,
+            text=True,
+            timeout=60,
+        ).stdout
+        result = json.loads(stdout.splitlines()[-1])
+        assert not result["heavy"], f"imported at import time: {result['heavy']}"
+        assert result["threads"] == 1, f"{result['threads']} threads after import"
+        assert not result["connected"], "connected at import time"
+        times.append(result["spent"])
+
+    times.sort()
+    print(f"import pyminecraft: min {times[0] * 1e3:.1f} ms")
+    print(f"import pyminecraft: median {times[N // 2] * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
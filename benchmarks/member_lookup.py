@@ -0,0 +1,71 @@
+"""
+PyMiecraft Fabric
+基准测试：成员查找缓存
+
+需要已启动并加载本模组的服务器。分别在关闭与开启 MemberCache 时测量：
+- 新对象上的方法调用（每次先获取主世界，事件回调收到的对象同样都是新的 py4j 对象）
+- 同一对象上的重复方法调用
+- 静态方法调用与静态字段读取
+输出每次调用的耗时与 py4j 往返次数（含 py4j 回收对象时的往返）。
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import time
+from typing import Callable
+
+from py4j.java_gateway import GatewayClient
+
+from pyminecraft.cache import MEMBER_CACHE
+from pyminecraft.connection import get_gateway
+from pyminecraft.javaobj import PymcMngr
+
+N = 2000
+
+
+def main() -> None:
+    """运行全部测量并输出表格"""
+    gateway = get_gateway()
+    mngr = PymcMngr.from_gateway(gateway)
+    server = mngr.server
+    factory = server.class_factory
+
+    # 在类上替换 send_command，统计默认 JavaGateway 模式下的全部往返
+    round_trips = [0]
+    send_command = GatewayClient.send_command
+
+    def counting_send_command(self, *args, **kwargs):
+        round_trips[0] += 1
+        return send_command(self, *args, **kwargs)
+
+    GatewayClient.send_command = counting_send_command
+
+    cases: dict[str, Callable[[], None]] = {
+        "fresh object call": lambda: server.overworld.call("getTime", (), int),
+        "same object call": lambda: server.call("getTicks", (), int),
+        "call_static": lambda: factory.call_static("java.lang.Math.max", (1, 2), int),
+        "get_static": lambda: factory.get_static("net.minecraft.util.math.Vec3d.ZERO"),
+    }
+
+    print(f"{'case':<20}{'cache':>7}{'us/call':>10}{'trips/call':>12}")
+    for name, case in cases.items():
+        for enabled in (False, True):
+            MEMBER_CACHE.enable(enabled)
+            case()  # 预热，开启缓存时填充缓存
+            round_trips[0] = 0
+            start = time.perf_counter()
+            for _ in range(N):
+                case()
+            spent = time.perf_counter() - start
+            print(
+                f"{name:<20}{'on' if enabled else 'off':>7}"
+                f"{spent / N * 1e6:>10.1f}{round_trips[0] / N:>12.2f}"
+            )
+
+    GatewayClient.send_command = send_command
+    MEMBER_CACHE.enable(True)
+    gateway.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+PyMiecraft Fabric
+pytest 配置：仓库根目录下的 conftest 使测试可以直接导入 pyminecraft
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
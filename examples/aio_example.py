@@ -0,0 +1,41 @@
+"""
+PyMiecraft Fabric
+示例：asyncio 接口
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import asyncio
+import logging
+import pyminecraft as pymc
+from pyminecraft import aio
+
+logging.basicConfig(level=logging.INFO)
+
+
+async def countdown():
+    """倒计时5秒"""
+    server = await aio.next_tick()
+    for i in range(5, 0, -1):
+        await aio.call(server.say, f"{i}...")
+        await aio.ticks(20)
+    await aio.call(server.say, "Go!")
+
+
+async def watch_ticks():
+    """前100个tick每20个tick报告一次"""
+    count = 0
+    async for _server in aio.events("tick", pymc.Server):
+        count += 1
+        if count % 20 == 0:
+            print(f"{count} ticks passed")
+        if count >= 100:
+            break
+
+
+async def main():
+    """两个协程同时运行"""
+    await asyncio.gather(countdown(), watch_ticks())
+
+
+aio.run(main())
@@ -19,34 +19,29 @@ def start_timer(server: pymc.Server, _data: pymc.AtDict):
     server.mngr.log("Hello from pymc-fabric!")
     server.cmd("say hello!!!!!!")
 
-    (pymc.AtTick & pymc.After(20 * 5) & pymc.ALWAYS & pymc.Data(counter=1))(
-        func_after_5_sec
-    )
+    (pymc.AtTick & pymc.After(20 * 5))(func_every_5_sec)
 
 
-def func_after_5_sec(server: pymc.Server, data: pymc.AtDict):
-    """每5秒执行一次"""
-    print("5 sec passed")
-    server.cmd("say 5 sec passed")
+def func_every_5_sec(server: pymc.Server, _data: pymc.AtDict):
+    """每5秒执行一次，生成器函数在 yield 处挂起，只占用一个Java端任务"""
+    for counter in range(1, 6):
+        print(f"{5 * counter} sec passed")
+        server.cmd(f"say {5 * counter} sec passed")
+        server = yield 20 * 5
 
-    data["counter"] += 1
+    print("total 30 sec passed, stoped")
+    server.cmd("say total 30 sec passed, stoped")
 
-    # 计数器实现和MaxTimesFlag实现效果相同
-    if data["counter"] >= 6:
-        at = data[pymc.At]
-        at.cancel()
-        print("total 30 sec passed, stoped")
-        server.cmd("say total 30 sec passed, stoped")
 
-
-@ pymc.AtTick & pymc.After(20) & pymc.ALWAYS & pymc.MaxTimes(64)
+@ pymc.AtTick & pymc.Every(20) & pymc.MaxTimes(64)
 def tick(server: pymc.Server, data: pymc.AtDict):
     """每秒给大家一个钻石"""
 
     times_left = data[pymc.MaxTimes].times_left
     print(f"They must need more diamonds (diamond: {64 - times_left}/64)")
-    server.cmd("say Wanna diamonds?")
-    server.cmd("give @a diamond")
+    with server.batch() as batch:
+        batch.say("Wanna diamonds?")
+        batch.cmd("give @a diamond")
 
     if data[pymc.MaxTimes].the_last:
         print("They are full of diamonds")
@@ -46,29 +46,41 @@ def init(server: pymc.Server, _data: pymc.AtDict):
         LifeTime=40,
     )
 
-    @ pymc.AtEntity("removed", firework) & pymc.Data(chance=1, amount=20)
-    def on_removed(entity: pymc.Entity, data: pymc.AtDict) -> None:
-        # server.mngr.executor.print_debug()
-        if random.random() < 1 - data["chance"] or data["amount"] <= 0:
-            return
+    # 每个小烟花剩余的爆炸数量，按 UUID 记录
+    amounts: dict[str, int] = {}
 
-        for _ in range(data["amount"]):
-            new_firework = server.overworld.summon(
-                "firework_rocket",
-                entity.pos,
-                **firework_data(random.choice(colors)),
-                ShotAtAngle=True,
-                LifeTime=random.randint(5, 15),
-            )
+    def explode(pos: pymc.Vec3, amount: int) -> None:
+        """在 pos 处一次召唤 amount 个小烟花，共用同一个 removed 回调"""
+        if amount <= 0:
+            return
 
-            new_firework.velocity = (
-                random.uniform(-1, 1),
-                random.uniform(-1, 1),
-                random.uniform(-1, 1),
-            )
-            (
-                pymc.AtEntity("removed", new_firework)
-                & pymc.Data(
-                    amount=data["amount"] - random.randint(5, 20),
+        uuids = server.overworld.summon_many(
+            [
+                pymc.SummonSpec(
+                    "firework_rocket",
+                    pos,
+                    velocity=(
+                        random.uniform(-1, 1),
+                        random.uniform(-1, 1),
+                        random.uniform(-1, 1),
+                    ),
+                    nbt={
+                        **firework_data(random.choice(colors)),
+                        "ShotAtAngle": True,
+                        "LifeTime": random.randint(5, 15),
+                    },
                 )
-            )(on_removed)
+                for _ in range(amount)
+            ],
+            on_removed=on_removed,
+        )
+        for uuid in uuids:
+            if uuid is not None:
+                amounts[uuid] = amount - random.randint(5, 20)
+
+    def on_removed(entity: pymc.Entity, _data: pymc.AtDict) -> None:
+        explode(entity.pos, amounts.pop(entity.uuid, 0))
+
+    @ pymc.AtEntity("removed", firework)
+    def on_first_removed(entity: pymc.Entity, _data: pymc.AtDict) -> None:
+        explode(entity.pos, 20)
@@ -0,0 +1,107 @@
+package top.fish1000.pymcfabric;
+
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.util.UUID;
+import java.util.function.Consumer;
+
+import org.jetbrains.annotations.Nullable;
+
+import net.minecraft.entity.Entity;
+import net.minecraft.nbt.NbtCompound;
+import net.minecraft.server.world.ServerWorld;
+import net.minecraft.util.math.Vec3d;
+
+/**
+ * 一次调用召唤多个实体
+ *
+ * 参数为小端序：数量 (int32)，之后每个实体依次为
+ * id (int32 长度 + UTF-8)、标志 (int8)，以及标志中存在的
+ * 位置 (3 x float64)、速度 (3 x float64)、旋转 (2 x float32，俯仰角、偏航角)、
+ * NBT (int32 长度 + 二进制 NBT)
+ */
+public class BulkSummon {
+    public static final int HAS_POS = 1;
+    public static final int HAS_VELOCITY = 2;
+    public static final int HAS_ROTATION = 4;
+    public static final int HAS_NBT = 8;
+
+    /** 每个实体的结果：UUID (2 x int64) 与 on removed 任务 id (int32) */
+    public static final int RESULT_BYTES = 2 * Long.BYTES + Integer.BYTES;
+
+    /**
+     * 召唤全部实体
+     *
+     * @param onRemoved 不为 null 时，为每个召唤成功的实体注册一次性的 "entity removed &lt;uuid&gt;" 任务
+     * @return 每个实体依次为 UUID（小端 int64 高位、低位，召唤失败时为全 0）与任务 id（小端 int32，
+     *         没有注册任务时为 -1），Python 端按任务 id 登记共用的回调，全部任务移出执行器后释放
+     */
+    public static byte[] summon(ServerWorld world, ByteBuffer specs, @Nullable Consumer<Object> onRemoved) {
+        ByteBuffer result = ByteBuffer.allocate(count(specs) * RESULT_BYTES).order(ByteOrder.LITTLE_ENDIAN);
+        summon(world, specs, result, onRemoved);
+        return result.array();
+    }
+
+    /** 参数中的实体数量，不移动读取位置 */
+    public static int count(ByteBuffer specs) {
+        return specs.getInt(specs.position());
+    }
+
+    /**
+     * 召唤全部实体，UUID 与任务 id 依次写入 result
+     *
+     * @param result 至少有 {@link #count} x {@link #RESULT_BYTES} 字节剩余空间的小端缓冲区
+     */
+    public static void summon(ServerWorld world, ByteBuffer specs, ByteBuffer result,
+            @Nullable Consumer<Object> onRemoved) {
+        int count = specs.getInt();
+        Vec3d spawnPos = Vec3d.of(world.getSpawnPos());
+
+        for (int i = 0; i < count; i++) {
+            String id = Mutations.getString(specs);
+            int flags = specs.get();
+            Vec3d pos = (flags & HAS_POS) != 0 ? getVec3d(specs) : spawnPos;
+            Vec3d velocity = (flags & HAS_VELOCITY) != 0 ? getVec3d(specs) : null;
+            float pitch = 0, yaw = 0;
+            if ((flags & HAS_ROTATION) != 0) {
+                pitch = specs.getFloat();
+                yaw = specs.getFloat();
+            }
+            byte[] nbt = null;
+            if ((flags & HAS_NBT) != 0) {
+                nbt = new byte[specs.getInt()];
+                specs.get(nbt);
+            }
+
+            Entity entity = null;
+            try {
+                entity = PymcMngr.loadEntity(id, world, nbt == null ? new NbtCompound() : PymcMngr.readNbt(nbt),
+                        pos.x, pos.y, pos.z, yaw, pitch);
+                if (entity != null && velocity != null)
+                    entity.setVelocity(velocity);
+                if (entity != null && !world.spawnNewEntityAndPassengers(entity))
+                    entity = null;
+            } catch (IOException | RuntimeException e) {
+                PymcMngr.LOGGER.error("Failed to summon {}", id, e);
+                entity = null;
+            }
+
+            if (entity == null) {
+                result.putLong(0L).putLong(0L).putInt(-1);
+                continue;
+            }
+            UUID uuid = entity.getUuid();
+            result.putLong(uuid.getMostSignificantBits()).putLong(uuid.getLeastSignificantBits());
+            if (onRemoved != null && PymcMngr.executor != null)
+                result.putInt(PymcMngr.executor.pushOnce(onRemoved,
+                        EntitySubscriptions.Action.REMOVED.eventName + " " + uuid));
+            else
+                result.putInt(-1);
+        }
+    }
+
+    private static Vec3d getVec3d(ByteBuffer buffer) {
+        return new Vec3d(buffer.getDouble(), buffer.getDouble(), buffer.getDouble());
+    }
+}
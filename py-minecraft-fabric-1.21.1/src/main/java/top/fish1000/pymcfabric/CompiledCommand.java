@@ -0,0 +1,55 @@
+package top.fish1000.pymcfabric;
+
+import com.mojang.brigadier.CommandDispatcher;
+import com.mojang.brigadier.ParseResults;
+
+import net.minecraft.server.MinecraftServer;
+import net.minecraft.server.command.ServerCommandSource;
+
+/**
+ * 预编译的命令
+ *
+ * 保存 Brigadier 的解析结果，重复执行时跳过解析；
+ * 命令树重新加载（如 /reload）后，下一次执行会自动重新解析
+ */
+public class CompiledCommand {
+    public final String command;
+    public final String name;
+
+    private final MinecraftServer server;
+    private CommandDispatcher<ServerCommandSource> dispatcher;
+    private ParseResults<ServerCommandSource> parseResults;
+    private int result;
+
+    public CompiledCommand(MinecraftServer server, String command, String name) {
+        this.server = server;
+        this.command = command.startsWith("/") ? command.substring(1) : command;
+        this.name = name;
+        parse();
+    }
+
+    private void parse() {
+        ServerCommandSource source = PymcMngr.getCommandSource(name)
+                .withReturnValueConsumer((successful, returnValue) -> result = successful ? returnValue : 0);
+        dispatcher = server.getCommandManager().getDispatcher();
+        parseResults = dispatcher.parse(command, source);
+    }
+
+    /** 解析结果是否对应当前的命令树 */
+    public boolean isValid() {
+        return dispatcher == server.getCommandManager().getDispatcher();
+    }
+
+    /**
+     * 执行命令
+     *
+     * @return 命令的返回值，失败或未返回时为 0
+     */
+    public int run() {
+        if (!isValid())
+            parse();
+        result = 0;
+        server.getCommandManager().execute(parseResults, command);
+        return result;
+    }
+}
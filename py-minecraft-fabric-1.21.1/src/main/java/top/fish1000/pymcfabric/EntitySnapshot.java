@@ -0,0 +1,119 @@
+package top.fish1000.pymcfabric;
+
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.UUID;
+import java.util.function.IntFunction;
+
+import org.jetbrains.annotations.Nullable;
+
+import net.minecraft.entity.Entity;
+import net.minecraft.entity.EntityType;
+import net.minecraft.util.math.Vec3d;
+
+/**
+ * 将实体列表按列打包为小端字节数组，供 Python 端一次性解码
+ *
+ * 格式: int32 实体数量，之后按请求顺序依次写入各字段的列
+ * <ul>
+ * <li>uuid: 每个实体 2 个 int64 (高位, 低位)</li>
+ * <li>pos / vel: 每个实体 3 个 float64 (x, y, z)</li>
+ * <li>rot: 每个实体 2 个 float32 (pitch, yaw)</li>
+ * <li>type: int32 调色板大小，调色板字符串 (int16 长度 + UTF-8)，之后每个实体 1 个 int32 下标</li>
+ * </ul>
+ */
+public class EntitySnapshot {
+    public static final String FIELD_UUID = "uuid";
+    public static final String FIELD_POS = "pos";
+    public static final String FIELD_VEL = "vel";
+    public static final String FIELD_ROT = "rot";
+    public static final String FIELD_TYPE = "type";
+
+    public static byte[] pack(List<? extends Entity> entities, String[] fields) {
+        return pack(entities, fields, size -> ByteBuffer.allocate(size).order(ByteOrder.LITTLE_ENDIAN)).array();
+    }
+
+    /**
+     * 打包到 allocator 提供的缓冲区
+     *
+     * @param allocator 按所需字节数提供小端缓冲区，返回 null 表示空间不足
+     * @return 写入完毕的缓冲区，空间不足时为 null
+     */
+    public static @Nullable ByteBuffer pack(List<? extends Entity> entities, String[] fields,
+            IntFunction<@Nullable ByteBuffer> allocator) {
+        int count = entities.size();
+        ArrayList<String> palette = new ArrayList<>();
+        int[] typeIndices = null;
+        int size = Integer.BYTES;
+        for (String field : fields) {
+            switch (field) {
+                case FIELD_UUID -> size += count * 2 * Long.BYTES;
+                case FIELD_POS, FIELD_VEL -> size += count * 3 * Double.BYTES;
+                case FIELD_ROT -> size += count * 2 * Float.BYTES;
+                case FIELD_TYPE -> {
+                    typeIndices = typeIndices(entities, palette);
+                    size += Integer.BYTES + count * Integer.BYTES;
+                    for (String id : palette)
+                        size += Short.BYTES + id.getBytes(StandardCharsets.UTF_8).length;
+                }
+                default -> throw new IllegalArgumentException("Unknown snapshot field: " + field);
+            }
+        }
+
+        ByteBuffer buffer = allocator.apply(size);
+        if (buffer == null)
+            return null;
+        buffer.putInt(count);
+        for (String field : fields) {
+            switch (field) {
+                case FIELD_UUID -> entities.forEach(entity -> {
+                    UUID uuid = entity.getUuid();
+                    buffer.putLong(uuid.getMostSignificantBits());
+                    buffer.putLong(uuid.getLeastSignificantBits());
+                });
+                case FIELD_POS -> entities.forEach(entity -> putVec3d(buffer, entity.getPos()));
+                case FIELD_VEL -> entities.forEach(entity -> putVec3d(buffer, entity.getVelocity()));
+                case FIELD_ROT -> entities.forEach(entity -> {
+                    buffer.putFloat(entity.getPitch());
+                    buffer.putFloat(entity.getYaw());
+                });
+                case FIELD_TYPE -> {
+                    buffer.putInt(palette.size());
+                    palette.forEach(id -> putString(buffer, id));
+                    for (int index : typeIndices)
+                        buffer.putInt(index);
+                }
+                default -> throw new IllegalArgumentException("Unknown snapshot field: " + field);
+            }
+        }
+        return buffer;
+    }
+
+    private static int[] typeIndices(List<? extends Entity> entities, List<String> palette) {
+        HashMap<EntityType<?>, Integer> indices = new HashMap<>();
+        int[] result = new int[entities.size()];
+        for (int i = 0; i < result.length; i++) {
+            result[i] = indices.computeIfAbsent(entities.get(i).getType(), type -> {
+                palette.add(EntityType.getId(type).toString());
+                return palette.size() - 1;
+            });
+        }
+        return result;
+    }
+
+    static void putVec3d(ByteBuffer buffer, Vec3d vec) {
+        buffer.putDouble(vec.x);
+        buffer.putDouble(vec.y);
+        buffer.putDouble(vec.z);
+    }
+
+    static void putString(ByteBuffer buffer, String string) {
+        byte[] bytes = string.getBytes(StandardCharsets.UTF_8);
+        buffer.putShort((short) bytes.length);
+        buffer.put(bytes);
+    }
+}
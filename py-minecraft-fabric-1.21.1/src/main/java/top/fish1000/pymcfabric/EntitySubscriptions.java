@@ -0,0 +1,86 @@
+package top.fish1000.pymcfabric;
+
+import java.util.Arrays;
+
+import org.jetbrains.annotations.Nullable;
+
+/**
+ * 实体事件订阅登记表
+ *
+ * 由执行器的名称监听器维护，记录每种 (动作, 键类型) 当前的回调数量，
+ * 使 EntityMixin 在无人订阅时无需拼接任何字符串即可返回
+ */
+public class EntitySubscriptions {
+    public static final String PREFIX = "entity ";
+
+    public enum Action {
+        TICK("tick"), INTERACT("interact"), REMOVED("removed");
+
+        public final String id;
+        public final String eventName;
+
+        Action(String id) {
+            this.id = id;
+            this.eventName = PREFIX + id;
+        }
+
+        public static @Nullable Action byId(String id) {
+            for (Action action : values()) {
+                if (action.id.equals(id))
+                    return action;
+            }
+            return null;
+        }
+    }
+
+    /** 事件名称中键的类型：无键、实体名称、实体 UUID */
+    public enum KeyKind {
+        ALL, NAME, UUID
+    }
+
+    private static final int[][] counts = new int[Action.values().length][KeyKind.values().length];
+    private static final int[] totals = new int[Action.values().length];
+
+    /**
+     * 名称订阅数变化时调用，非实体事件会被忽略
+     *
+     * @param name  事件名称，如 "entity tick"、"entity tick Creeper"、"entity tick &lt;uuid&gt;"
+     * @param delta 回调数量变化
+     */
+    public static void update(String name, int delta) {
+        if (!name.startsWith(PREFIX))
+            return;
+        int split = name.indexOf(' ', PREFIX.length());
+        Action action = Action.byId(split < 0 ? name.substring(PREFIX.length())
+                : name.substring(PREFIX.length(), split));
+        if (action == null)
+            return;
+
+        KeyKind kind = split < 0 ? KeyKind.ALL : isUuid(name.substring(split + 1)) ? KeyKind.UUID : KeyKind.NAME;
+        int[] row = counts[action.ordinal()];
+        int before = row[kind.ordinal()];
+        row[kind.ordinal()] = Math.max(0, before + delta);
+        totals[action.ordinal()] += row[kind.ordinal()] - before;
+    }
+
+    /** 该动作是否可能有任何订阅者 */
+    public static boolean any(Action action) {
+        return totals[action.ordinal()] > 0;
+    }
+
+    /** 该动作的该键类型是否可能有订阅者 */
+    public static boolean has(Action action, KeyKind kind) {
+        return counts[action.ordinal()][kind.ordinal()] > 0;
+    }
+
+    public static void clear() {
+        for (int[] row : counts)
+            Arrays.fill(row, 0);
+        Arrays.fill(totals, 0);
+    }
+
+    private static boolean isUuid(String key) {
+        return key.length() == 36 && key.charAt(8) == '-' && key.charAt(13) == '-' && key.charAt(18) == '-'
+                && key.charAt(23) == '-';
+    }
+}
@@ -0,0 +1,184 @@
+package top.fish1000.pymcfabric;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Set;
+import java.util.concurrent.ThreadLocalRandom;
+
+import net.minecraft.entity.Entity;
+import net.minecraft.nbt.NbtCompound;
+import net.minecraft.registry.Registries;
+import net.minecraft.util.math.Box;
+import net.minecraft.util.math.Vec3d;
+import top.fish1000.pymcfabric.executor.EventFilter;
+
+/**
+ * 解析 Python 端编译的事件过滤条件
+ *
+ * 条件为 S 表达式，如 {@code (and (type minecraft:creeper) (near 0 64 0 16))}：
+ * <ul>
+ * <li>(and f...) / (or f...) / (not f)</li>
+ * <li>(type id...)：实体类型之一</li>
+ * <li>(box x1 y1 z1 x2 y2 z2)：实体位于长方体内</li>
+ * <li>(near x y z r)：实体与点的距离不超过 r</li>
+ * <li>(every n offset)：tick % n == offset</li>
+ * <li>(sample p)：以概率 p 通过</li>
+ * <li>(tag name)：实体带有命令标签（/tag）</li>
+ * <li>(nbt key)：实体 NBT 中存在该键</li>
+ * </ul>
+ * 实体条件在事件对象不是实体时不通过
+ */
+public class EventFilters {
+    public static EventFilter parse(String source) {
+        Parser parser = new Parser(tokenize(source));
+        EventFilter filter = parser.expr();
+        if (parser.pos != parser.tokens.size())
+            throw new IllegalArgumentException("Unexpected token after filter: " + parser.tokens.get(parser.pos));
+        return filter;
+    }
+
+    private static List<String> tokenize(String source) {
+        List<String> tokens = new ArrayList<>();
+        StringBuilder current = new StringBuilder();
+        for (char c : source.toCharArray()) {
+            if (c == '(' || c == ')' || Character.isWhitespace(c)) {
+                if (!current.isEmpty()) {
+                    tokens.add(current.toString());
+                    current.setLength(0);
+                }
+                if (!Character.isWhitespace(c))
+                    tokens.add(String.valueOf(c));
+            } else {
+                current.append(c);
+            }
+        }
+        if (!current.isEmpty())
+            tokens.add(current.toString());
+        return tokens;
+    }
+
+    private static class Parser {
+        final List<String> tokens;
+        int pos = 0;
+
+        Parser(List<String> tokens) {
+            this.tokens = tokens;
+        }
+
+        String peek() {
+            if (pos >= tokens.size())
+                throw new IllegalArgumentException("Unexpected end of filter");
+            return tokens.get(pos);
+        }
+
+        String next() {
+            String token = peek();
+            pos++;
+            return token;
+        }
+
+        void expect(String token) {
+            String actual = next();
+            if (!actual.equals(token))
+                throw new IllegalArgumentException("Expected '" + token + "' but got '" + actual + "'");
+        }
+
+        /** 读取到右括号为止的全部原子参数 */
+        List<String> atoms() {
+            List<String> atoms = new ArrayList<>();
+            while (!peek().equals(")"))
+                atoms.add(next());
+            next();
+            return atoms;
+        }
+
+        double[] numbers(int count) {
+            List<String> atoms = atoms();
+            if (atoms.size() != count)
+                throw new IllegalArgumentException("Expected " + count + " numbers but got " + atoms);
+            double[] values = new double[count];
+            for (int i = 0; i < count; i++)
+                values[i] = Double.parseDouble(atoms.get(i));
+            return values;
+        }
+
+        EventFilter expr() {
+            expect("(");
+            String op = next();
+            switch (op) {
+                case "and", "or" -> {
+                    List<EventFilter> children = new ArrayList<>();
+                    while (!peek().equals(")"))
+                        children.add(expr());
+                    next();
+                    EventFilter[] array = children.toArray(EventFilter[]::new);
+                    return op.equals("and") ? (data, tick) -> {
+                        for (EventFilter child : array)
+                            if (!child.test(data, tick))
+                                return false;
+                        return true;
+                    } : (data, tick) -> {
+                        for (EventFilter child : array)
+                            if (child.test(data, tick))
+                                return true;
+                        return false;
+                    };
+                }
+                case "not" -> {
+                    EventFilter child = expr();
+                    expect(")");
+                    return (data, tick) -> !child.test(data, tick);
+                }
+                case "type" -> {
+                    Set<String> ids = Set.copyOf(atoms());
+                    return entity(entity -> ids.contains(Registries.ENTITY_TYPE.getId(entity.getType()).toString()));
+                }
+                case "box" -> {
+                    double[] v = numbers(6);
+                    Box box = new Box(v[0], v[1], v[2], v[3], v[4], v[5]);
+                    return entity(entity -> box.contains(entity.getPos()));
+                }
+                case "near" -> {
+                    double[] v = numbers(4);
+                    Vec3d center = new Vec3d(v[0], v[1], v[2]);
+                    double squared = v[3] * v[3];
+                    return entity(entity -> entity.squaredDistanceTo(center) <= squared);
+                }
+                case "every" -> {
+                    double[] v = numbers(2);
+                    int n = (int) v[0], offset = (int) v[1];
+                    if (n <= 0)
+                        throw new IllegalArgumentException("every: n must be positive");
+                    return (data, tick) -> Math.floorMod(tick, n) == offset;
+                }
+                case "sample" -> {
+                    double p = numbers(1)[0];
+                    return (data, tick) -> ThreadLocalRandom.current().nextDouble() < p;
+                }
+                case "tag" -> {
+                    String tag = single(atoms());
+                    return entity(entity -> entity.getCommandTags().contains(tag));
+                }
+                case "nbt" -> {
+                    String key = single(atoms());
+                    return entity(entity -> entity.writeNbt(new NbtCompound()).contains(key));
+                }
+                default -> throw new IllegalArgumentException("Unknown filter: " + op);
+            }
+        }
+
+        private static String single(List<String> atoms) {
+            if (atoms.size() != 1)
+                throw new IllegalArgumentException("Expected one argument but got " + atoms);
+            return atoms.get(0);
+        }
+    }
+
+    private interface EntityPredicate {
+        boolean test(Entity entity);
+    }
+
+    private static EventFilter entity(EntityPredicate predicate) {
+        return (data, tick) -> data instanceof Entity entity && predicate.test(entity);
+    }
+}
@@ -0,0 +1,159 @@
+package top.fish1000.pymcfabric;
+
+import java.io.IOException;
+import java.io.UncheckedIOException;
+import java.nio.ByteBuffer;
+import java.nio.charset.StandardCharsets;
+
+import net.minecraft.entity.Entity;
+import net.minecraft.nbt.NbtCompound;
+import net.minecraft.nbt.NbtElement;
+import py4j.Gateway;
+import py4j.reflection.MethodInvoker;
+
+/**
+ * 批量执行 Python 端写后缓冲记录的写入
+ *
+ * 数据为小端序，依次排列若干条操作：
+ * 操作码 (int8)、目标对象的 py4j id (字符串)、参数。
+ * 字符串为 int32 字节长度 + UTF-8。
+ * 每条操作的参数都会先完整读出再执行，单条失败不影响后续操作
+ */
+public class Mutations {
+    public static final byte SET_POS = 1;
+    public static final byte SET_VELOCITY = 2;
+    public static final byte SET_YAW = 3;
+    public static final byte SET_PITCH = 4;
+    /** 参数：键 (字符串)、值类型 (int8)、值 */
+    public static final byte NBT_PUT = 5;
+    /**
+     * 调用目标对象的方法并忽略返回值，方法按 py4j 的规则查找。
+     * 参数：方法名 (字符串)、参数个数 (int32)、各参数 (类型 (int8) + 值)
+     */
+    public static final byte INVOKE = 6;
+
+    /** 值为 int32 长度 + 二进制 NBT，详见 {@link PymcMngr#readNbtElement} */
+    public static final byte NBT_ENCODED = 1;
+    /** 值为另一个 py4j 对象的 id */
+    public static final byte NBT_REF = 2;
+
+    /** INVOKE 的参数类型 */
+    public static final byte ARG_NULL = 0;
+    public static final byte ARG_REF = 1;
+    public static final byte ARG_BOOL = 2;
+    public static final byte ARG_INT = 3;
+    public static final byte ARG_LONG = 4;
+    public static final byte ARG_DOUBLE = 5;
+    public static final byte ARG_STRING = 6;
+    public static final byte ARG_BYTES = 7;
+
+    /**
+     * 依次执行全部写入
+     *
+     * @return 失败操作的错误信息，以换行分隔；全部成功时为空字符串
+     */
+    public static String apply(Gateway gateway, ByteBuffer buffer) {
+        StringBuilder errors = new StringBuilder();
+        while (buffer.hasRemaining()) {
+            byte op = buffer.get();
+            String ref = getString(buffer);
+            Object target = gateway.getObject(ref);
+            switch (op) {
+                case SET_POS -> {
+                    double x = buffer.getDouble(), y = buffer.getDouble(), z = buffer.getDouble();
+                    run(errors, op, ref, () -> ((Entity) target).setPosition(x, y, z));
+                }
+                case SET_VELOCITY -> {
+                    double x = buffer.getDouble(), y = buffer.getDouble(), z = buffer.getDouble();
+                    run(errors, op, ref, () -> ((Entity) target).setVelocity(x, y, z));
+                }
+                case SET_YAW -> {
+                    float yaw = buffer.getFloat();
+                    run(errors, op, ref, () -> ((Entity) target).setYaw(yaw));
+                }
+                case SET_PITCH -> {
+                    float pitch = buffer.getFloat();
+                    run(errors, op, ref, () -> ((Entity) target).setPitch(pitch));
+                }
+                case NBT_PUT -> {
+                    String key = getString(buffer);
+                    byte type = buffer.get();
+                    if (type == NBT_ENCODED) {
+                        byte[] data = new byte[buffer.getInt()];
+                        buffer.get(data);
+                        run(errors, op, ref, () -> ((NbtCompound) target).put(key, decode(data)));
+                    } else if (type == NBT_REF) {
+                        Object value = gateway.getObject(getString(buffer));
+                        run(errors, op, ref, () -> ((NbtCompound) target).put(key, (NbtElement) value));
+                    } else {
+                        errors.append("Unknown nbt value type ").append(type).append(" on ").append(ref).append('\n');
+                        return errors.toString();
+                    }
+                }
+                case INVOKE -> {
+                    String method = getString(buffer);
+                    Object[] args = new Object[buffer.getInt()];
+                    for (int i = 0; i < args.length; i++) {
+                        byte type = buffer.get();
+                        switch (type) {
+                            case ARG_NULL -> args[i] = null;
+                            case ARG_REF -> args[i] = gateway.getObject(getString(buffer));
+                            case ARG_BOOL -> args[i] = buffer.get() != 0;
+                            case ARG_INT -> args[i] = buffer.getInt();
+                            case ARG_LONG -> args[i] = buffer.getLong();
+                            case ARG_DOUBLE -> args[i] = buffer.getDouble();
+                            case ARG_STRING -> args[i] = getString(buffer);
+                            case ARG_BYTES -> {
+                                byte[] bytes = new byte[buffer.getInt()];
+                                buffer.get(bytes);
+                                args[i] = bytes;
+                            }
+                            default -> {
+                                errors.append("Unknown argument type ").append(type).append(" on ").append(ref)
+                                        .append('\n');
+                                return errors.toString();
+                            }
+                        }
+                    }
+                    run(errors, op, ref, () -> invoke(gateway, target, method, args));
+                }
+                default -> {
+                    // 无法确定参数长度，剩余数据全部丢弃
+                    errors.append("Unknown op ").append(op).append(" on ").append(ref).append('\n');
+                    return errors.toString();
+                }
+            }
+        }
+        return errors.toString();
+    }
+
+    private static void run(StringBuilder errors, byte op, String ref, Runnable action) {
+        try {
+            action.run();
+        } catch (RuntimeException e) {
+            PymcMngr.LOGGER.error("Failed to apply op {} on {}", op, ref, e);
+            errors.append("op ").append(op).append(" on ").append(ref).append(": ").append(e).append('\n');
+        }
+    }
+
+    private static void invoke(Gateway gateway, Object target, String method, Object[] args) {
+        if (target == null)
+            throw new IllegalArgumentException("Target object not found");
+        MethodInvoker invoker = gateway.getReflectionEngine().getMethod(target, method, args);
+        invoker.invoke(target, args);
+    }
+
+    private static NbtElement decode(byte[] data) {
+        try {
+            return PymcMngr.readNbtElement(data);
+        } catch (IOException e) {
+            throw new UncheckedIOException(e);
+        }
+    }
+
+    static String getString(ByteBuffer buffer) {
+        byte[] bytes = new byte[buffer.getInt()];
+        buffer.get(bytes);
+        return new String(bytes, StandardCharsets.UTF_8);
+    }
+}
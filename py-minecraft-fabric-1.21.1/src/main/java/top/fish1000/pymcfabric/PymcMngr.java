@@ -1,11 +1,20 @@
 package top.fish1000.pymcfabric;
 
+import java.io.ByteArrayInputStream;
+import java.io.DataInputStream;
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.util.LinkedHashMap;
 import java.util.List;
+import java.util.Map;
+import java.util.function.Consumer;
 
 import org.jetbrains.annotations.Nullable;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 
+import com.mojang.brigadier.CommandDispatcher;
 import com.mojang.brigadier.StringReader;
 import com.mojang.brigadier.exceptions.CommandSyntaxException;
 
@@ -14,7 +23,10 @@ import net.minecraft.command.EntitySelectorReader;
 import net.minecraft.entity.Entity;
 import net.minecraft.entity.EntityType;
 import net.minecraft.nbt.NbtCompound;
+import net.minecraft.nbt.NbtElement;
+import net.minecraft.nbt.NbtIo;
 import net.minecraft.server.MinecraftServer;
+import net.minecraft.server.command.CommandManager;
 import net.minecraft.server.command.ServerCommandSource;
 import net.minecraft.server.world.ServerWorld;
 import net.minecraft.text.Text;
@@ -22,7 +34,9 @@ import net.minecraft.util.Identifier;
 import net.minecraft.util.math.Vec2f;
 import net.minecraft.util.math.Vec3d;
 import net.minecraft.world.World;
+import py4j.Gateway;
 import py4j.GatewayServer;
+import top.fish1000.pymcfabric.executor.CallbackMetrics;
 import top.fish1000.pymcfabric.executor.NamedAdvancedExecutor;
 
 public class PymcMngr {
@@ -33,8 +47,23 @@ public class PymcMngr {
     public static @Nullable GatewayServer gatewayServer;
     public static @Nullable MinecraftServer server;
 
+    public static @Nullable SharedBuffer sharedBuffer;
+
     public static boolean py4jStarted = false;
 
+    /** {@link #getEntityState} 的标志位 */
+    public static final int STATE_ALIVE = 1, STATE_REMOVED = 2, STATE_ON_GROUND = 4;
+
+    public static final int COMMAND_CACHE_SIZE = 256;
+    private static final LinkedHashMap<String, CompiledCommand> commandCache = new LinkedHashMap<>(16, 0.75f,
+            true) {
+        @Override
+        protected boolean removeEldestEntry(Map.Entry<String, CompiledCommand> eldest) {
+            return size() > COMMAND_CACHE_SIZE;
+        }
+    };
+    private static @Nullable CommandDispatcher<ServerCommandSource> commandCacheDispatcher;
+
     public static void tick(String name) {
         tick(name, server);
     }
@@ -55,6 +84,134 @@ public class PymcMngr {
         server.getCommandManager().executeWithPrefix(getCommandSource(name), command);
     }
 
+    /**
+     * 使用同一个命令源依次执行多条命令。
+     * 批量命令多为一次性的（如坐标各不相同的 tp），直接解析执行而不经过 {@link #compileCommand} 的缓存，
+     * 避免挤掉重复执行的命令；需要复用解析结果时请使用 compileCommand
+     *
+     * @param commands 以换行分隔的命令
+     * @param name     命令源名称
+     * @return 每条命令的返回值（小端 int32），失败或未返回时为 0
+     */
+    public static byte[] executeCommands(String commands, @Nullable String name) {
+        String[] lines = commands.split("\n", -1);
+        ByteBuffer results = ByteBuffer.allocate(lines.length * Integer.BYTES).order(ByteOrder.LITTLE_ENDIAN);
+        int[] result = new int[1];
+        ServerCommandSource source = getCommandSource(name)
+                .withReturnValueConsumer((successful, returnValue) -> result[0] = successful ? returnValue : 0);
+        CommandManager manager = server.getCommandManager();
+        CommandDispatcher<ServerCommandSource> dispatcher = manager.getDispatcher();
+        for (String line : lines) {
+            String command = line.startsWith("/") ? line.substring(1) : line;
+            result[0] = 0;
+            manager.execute(dispatcher.parse(command, source), command);
+            results.putInt(result[0]);
+        }
+        return results.array();
+    }
+
+    /**
+     * 获取预编译的命令，解析结果按 (命令源名称, 命令) 缓存
+     *
+     * @param command 命令
+     * @param name    命令源名称
+     */
+    public static synchronized CompiledCommand compileCommand(String command, @Nullable String name) {
+        String sourceName = name == null ? "PYMC" : name;
+        CommandDispatcher<ServerCommandSource> dispatcher = server.getCommandManager().getDispatcher();
+        if (dispatcher != commandCacheDispatcher) {
+            // 命令树已重新加载，旧的解析结果全部失效
+            commandCache.clear();
+            commandCacheDispatcher = dispatcher;
+        }
+        return commandCache.computeIfAbsent(sourceName + '\n' + command,
+                key -> new CompiledCommand(server, command, sourceName));
+    }
+
+    public static synchronized void invalidateCommandCache() {
+        commandCache.clear();
+    }
+
+    /**
+     * 执行 Python 端缓冲的写入，详见 {@link Mutations}
+     *
+     * @return 失败操作的错误信息，全部成功时为空字符串
+     */
+    public static String applyMutations(byte[] data) {
+        return Mutations.apply(gatewayServer.getGateway(), ByteBuffer.wrap(data).order(ByteOrder.LITTLE_ENDIAN));
+    }
+
+    /**
+     * 批量释放 Python 端不再使用的对象引用，对应的 Python 对象不会再逐个通知释放
+     *
+     * @param ids 以换行分隔的 py4j 对象 id
+     * @return 实际释放的数量
+     */
+    public static int releaseObjects(String ids) {
+        Gateway gateway = gatewayServer.getGateway();
+        int released = 0;
+        for (String id : ids.split("\n")) {
+            if (!id.isEmpty() && gateway.getObject(id) != null) {
+                gateway.deleteObject(id);
+                released++;
+            }
+        }
+        return released;
+    }
+
+    /** py4j 网关为 Python 端保留的对象引用数量 */
+    public static int countObjects() {
+        return gatewayServer.getGateway().getBindings().size();
+    }
+
+    /**
+     * 打包执行器中各回调的耗时统计，详见 {@link CallbackMetrics#pack}
+     *
+     * @param reset 打包后是否清空统计
+     */
+    public static byte[] packCallbackMetrics(boolean reset) {
+        if (executor == null)
+            return new CallbackMetrics().pack();
+        CallbackMetrics metrics = executor.getMetrics();
+        byte[] data = metrics.pack();
+        if (reset)
+            metrics.reset();
+        return data;
+    }
+
+    /**
+     * 映射 Python 端创建的共享内存文件，替换之前的共享内存
+     *
+     * @return 是否成功；Python 与服务器不在同一台机器上等情况会失败，此时 Python 端退回 py4j 传输
+     */
+    public static synchronized boolean openSharedBuffer(String path, int size) {
+        closeSharedBuffer();
+        try {
+            sharedBuffer = SharedBuffer.open(path, size);
+            return true;
+        } catch (IOException | RuntimeException e) {
+            LOGGER.warn("Failed to open shared buffer {}", path, e);
+            return false;
+        }
+    }
+
+    public static synchronized void closeSharedBuffer() {
+        if (sharedBuffer != null) {
+            sharedBuffer.close();
+            sharedBuffer = null;
+        }
+    }
+
+    /**
+     * 共享内存中从 offset 起 size 字节的视图
+     *
+     * @return 视图，未打开共享内存或空间不足时为 null
+     */
+    public static @Nullable ByteBuffer allocateShared(int offset, int size) {
+        SharedBuffer shared = sharedBuffer;
+        return shared == null ? null : shared.slice(offset, size);
+    }
+
     public static List<? extends Entity> getEntities(String selector) {
         try {
             EntitySelector entitySelector = new EntitySelectorReader(new StringReader(selector), true).read();
@@ -65,6 +222,111 @@ public class PymcMngr {
         }
     }
 
+    /**
+     * 按列打包选择器选中实体的字段，详见 {@link EntitySnapshot}
+     *
+     * @param selector 实体选择器
+     * @param fields   以逗号分隔的字段名
+     */
+    public static byte[] snapshotEntities(String selector, String fields) {
+        return EntitySnapshot.pack(getEntities(selector), fields.split(","));
+    }
+
+    /**
+     * 与 {@link #snapshotEntities} 相同，结果写入共享内存起始处
+     *
+     * @return 写入的字节数；空间不足时为所需字节数的相反数，未打开共享内存时为 {@link Integer#MIN_VALUE}
+     */
+    public static int snapshotEntitiesShared(String selector, String fields) {
+        if (sharedBuffer == null)
+            return Integer.MIN_VALUE;
+        int[] required = { 0 };
+        ByteBuffer buffer = EntitySnapshot.pack(getEntities(selector), fields.split(","), size -> {
+            required[0] = size;
+            return allocateShared(0, size);
+        });
+        return buffer == null ? -required[0] : buffer.position();
+    }
+
+    /** 实体位置，3 个小端 float64 */
+    public static byte[] getEntityPos(Entity entity) {
+        return packVec3d(entity.getPos());
+    }
+
+    /** 实体速度，3 个小端 float64 */
+    public static byte[] getEntityVelocity(Entity entity) {
+        return packVec3d(entity.getVelocity());
+    }
+
+    /**
+     * 一次取回实体的常用状态
+     *
+     * @return 标志位（小端 int32，见 {@link #STATE_ALIVE} 等）、位置与速度（各 3 个小端 float64）、
+     *         俯仰角与偏航角（小端 float32）
+     */
+    public static byte[] getEntityState(Entity entity) {
+        ByteBuffer buffer = ByteBuffer.allocate(Integer.BYTES + 6 * Double.BYTES + 2 * Float.BYTES)
+                .order(ByteOrder.LITTLE_ENDIAN);
+        int flags = (entity.isAlive() ? STATE_ALIVE : 0) | (entity.isRemoved() ? STATE_REMOVED : 0)
+                | (entity.isOnGround() ? STATE_ON_GROUND : 0);
+        buffer.putInt(flags);
+        EntitySnapshot.putVec3d(buffer, entity.getPos());
+        EntitySnapshot.putVec3d(buffer, entity.getVelocity());
+        buffer.putFloat(entity.getPitch());
+        buffer.putFloat(entity.getYaw());
+        return buffer.array();
+    }
+
+    private static byte[] packVec3d(Vec3d vec) {
+        ByteBuffer buffer = ByteBuffer.allocate(3 * Double.BYTES).order(ByteOrder.LITTLE_ENDIAN);
+        EntitySnapshot.putVec3d(buffer, vec);
+        return buffer.array();
+    }
+
+    /**
+     * 解码未压缩的二进制 NBT（根标签为 compound）
+     */
+    public static NbtCompound readNbt(byte[] data) throws IOException {
+        return NbtIo.read(new DataInputStream(new ByteArrayInputStream(data)));
+    }
+
+    /**
+     * 解码单个 NBT 元素，元素以空键包装在根 compound 中
+     */
+    public static NbtElement readNbtElement(byte[] data) throws IOException {
+        NbtElement element = readNbt(data).get("");
+        if (element == null)
+            throw new IOException("Missing root element");
+        return element;
+    }
+
+    /**
+     * 批量召唤实体，详见 {@link BulkSummon}
+     *
+     * @return 每个实体的 UUID 与 on removed 任务 id，格式见 {@link BulkSummon#summon}
+     */
+    public static byte[] summonMany(ServerWorld world, byte[] specs, @Nullable Consumer<Object> onRemoved) {
+        return BulkSummon.summon(world, ByteBuffer.wrap(specs).order(ByteOrder.LITTLE_ENDIAN), onRemoved);
+    }
+
+    /**
+     * 与 {@link #summonMany} 相同，参数从共享内存起始处读取，结果写入参数之后（按 8 字节对齐）
+     *
+     * @param length 参数的字节数
+     * @return 结果在共享内存中的偏移；未打开共享内存或空间不足时为 -1，此时没有召唤任何实体
+     */
+    public static int summonManyShared(ServerWorld world, int length, @Nullable Consumer<Object> onRemoved) {
+        ByteBuffer specs = allocateShared(0, length);
+        if (specs == null)
+            return -1;
+        int offset = (length + 7) & ~7;
+        ByteBuffer result = allocateShared(offset, BulkSummon.count(specs) * BulkSummon.RESULT_BYTES);
+        if (result == null)
+            return -1;
+        BulkSummon.summon(world, specs, result, onRemoved);
+        return offset;
+    }
+
     public static Entity loadEntity(String id, World world, @Nullable NbtCompound nbt,
             double x, double y, double z, float yaw, float pitch) {
         if (nbt == null)
@@ -0,0 +1,63 @@
+package top.fish1000.pymcfabric;
+
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.MappedByteBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.file.Path;
+import java.nio.file.StandardOpenOption;
+
+import org.jetbrains.annotations.Nullable;
+
+/**
+ * 与 Python 端共享的内存映射文件
+ *
+ * 批量接口通过它交换打包好的二进制数据，py4j 只传递长度与偏移。
+ * 文件由 Python 端创建并负责删除；同一时刻只有一个调用使用，由 Python 端加锁保证
+ */
+public class SharedBuffer {
+    private final FileChannel channel;
+    private final MappedByteBuffer buffer;
+
+    private SharedBuffer(FileChannel channel, MappedByteBuffer buffer) {
+        this.channel = channel;
+        this.buffer = buffer;
+    }
+
+    public static SharedBuffer open(String path, int size) throws IOException {
+        FileChannel channel = FileChannel.open(Path.of(path), StandardOpenOption.READ, StandardOpenOption.WRITE);
+        try {
+            if (channel.size() < size)
+                throw new IOException("Shared buffer file is smaller than " + size + " bytes: " + path);
+            MappedByteBuffer buffer = channel.map(FileChannel.MapMode.READ_WRITE, 0, size);
+            return new SharedBuffer(channel, buffer);
+        } catch (IOException | RuntimeException e) {
+            channel.close();
+            throw e;
+        }
+    }
+
+    public int capacity() {
+        return buffer.capacity();
+    }
+
+    /**
+     * 从 offset 起 length 字节的小端视图，读写位置从 0 开始
+     *
+     * @return 视图，超出容量时为 null
+     */
+    public @Nullable ByteBuffer slice(int offset, int length) {
+        if (offset < 0 || length < 0 || (long) offset + length > buffer.capacity())
+            return null;
+        return buffer.slice(offset, length).order(ByteOrder.LITTLE_ENDIAN);
+    }
+
+    public void close() {
+        try {
+            channel.close();
+        } catch (IOException e) {
+            PymcMngr.LOGGER.warn("Failed to close shared buffer", e);
+        }
+    }
+}
@@ -13,7 +13,8 @@ public class AutoDisconnectedNamedAdvancedExecutor<T> extends NamedAdvancedExecu
     @Override
     public void tick(T data, String name) {
         super.tick(data, name);
-        if (callbackOnceList.isEmpty() && callbackContinuousList.isEmpty() && callbackScheduled.isEmpty()) {
+        if (callbackOnce.isEmpty() && callbackContinuous.isEmpty() && callbackInterval.isEmpty()
+                && callbackScheduled.isEmpty()) {
             disconnectCallback.run();
         }
     }
@@ -0,0 +1,107 @@
+package top.fish1000.pymcfabric.executor;
+
+import java.util.Collection;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.function.ObjIntConsumer;
+
+import org.jetbrains.annotations.Nullable;
+
+/**
+ * 按名称与 id 双重索引的回调表
+ *
+ * 同名回调保持插入顺序；按名称查找、按 id 删除均为 O(1)，没有订阅者的名称不占用任何条目
+ */
+public class CallbackIndex<E extends NamedExecutorIdentifier<?>> {
+    private final HashMap<String, LinkedHashMap<Integer, E>> byName = new HashMap<>();
+    private final HashMap<Integer, E> byId = new HashMap<>();
+    private @Nullable ObjIntConsumer<String> listener;
+
+    /**
+     * 设置名称订阅数变化的监听器，每增删一个回调调用一次 (名称, +1/-1)
+     */
+    public void setListener(@Nullable ObjIntConsumer<String> listener) {
+        this.listener = listener;
+    }
+
+    private void notifyListener(String name, int delta) {
+        if (listener != null)
+            listener.accept(name, delta);
+    }
+
+    public void add(E entry) {
+        byName.computeIfAbsent(entry.name, k -> new LinkedHashMap<>()).put(entry.id, entry);
+        byId.put(entry.id, entry);
+        notifyListener(entry.name, 1);
+    }
+
+    /**
+     * 按 id 移除回调
+     *
+     * @return 被移除的回调，不存在时返回 null
+     */
+    public @Nullable E remove(int id) {
+        E entry = byId.remove(id);
+        if (entry == null)
+            return null;
+        LinkedHashMap<Integer, E> bucket = byName.get(entry.name);
+        bucket.remove(id);
+        if (bucket.isEmpty())
+            byName.remove(entry.name);
+        notifyListener(entry.name, -1);
+        return entry;
+    }
+
+    /**
+     * 获取指定名称的全部回调
+     *
+     * @return 回调集合，没有订阅者时返回 null
+     */
+    public @Nullable Collection<E> get(String name) {
+        LinkedHashMap<Integer, E> bucket = byName.get(name);
+        return bucket == null ? null : bucket.values();
+    }
+
+    /**
+     * 取出并移除指定名称的全部回调
+     *
+     * @return 回调集合，没有订阅者时返回 null
+     */
+    public @Nullable Collection<E> removeName(String name) {
+        LinkedHashMap<Integer, E> bucket = byName.remove(name);
+        if (bucket == null)
+            return null;
+        bucket.keySet().forEach(byId::remove);
+        bucket.values().forEach(entry -> notifyListener(name, -1));
+        return bucket.values();
+    }
+
+    /** 全部回调的 id */
+    public Collection<Integer> ids() {
+        return byId.keySet();
+    }
+
+    public boolean contains(String name) {
+        return byName.containsKey(name);
+    }
+
+    public void clear() {
+        byId.values().forEach(entry -> notifyListener(entry.name, -1));
+        byName.clear();
+        byId.clear();
+    }
+
+    public boolean isEmpty() {
+        return byId.isEmpty();
+    }
+
+    /** 已索引的回调数量 */
+    public int size() {
+        return byId.size();
+    }
+
+    /** 拥有订阅者的名称数量 */
+    public int nameCount() {
+        return byName.size();
+    }
+}
@@ -0,0 +1,125 @@
+package top.fish1000.pymcfabric.executor;
+
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * 按回调 id 统计的执行耗时直方图
+ *
+ * 耗时按对数分桶（每个 2 的幂再等分为 {@link #SUB_BUCKETS} 份），分位数误差不超过 25%；
+ * 最多保留 {@link #MAX_ENTRIES} 个最近执行过的回调
+ */
+public class CallbackMetrics {
+    public static final int MAX_ENTRIES = 4096;
+    public static final int SUB_BUCKETS = 4;
+    /** 2^40 ns 约 18 分钟，更长的耗时计入最后一个桶 */
+    private static final int MAX_EXPONENT = 40;
+
+    private final LinkedHashMap<Integer, Histogram> entries = new LinkedHashMap<>(16, 0.75f, true) {
+        @Override
+        protected boolean removeEldestEntry(Map.Entry<Integer, Histogram> eldest) {
+            return size() > MAX_ENTRIES;
+        }
+    };
+
+    private static class Histogram {
+        final String name;
+        final int[] buckets = new int[(MAX_EXPONENT + 1) * SUB_BUCKETS];
+        long count = 0L;
+        long total = 0L;
+        long max = 0L;
+        long deferred = 0L;
+
+        Histogram(String name) {
+            this.name = name;
+        }
+
+        void record(long nanos) {
+            count++;
+            total += nanos;
+            max = Math.max(max, nanos);
+            buckets[bucket(nanos)]++;
+        }
+
+        /** 分位数所在桶的上界，不超过最大值 */
+        long percentile(double q) {
+            long rank = Math.max(1L, (long) Math.ceil(q * count));
+            long seen = 0L;
+            for (int i = 0; i < buckets.length; i++) {
+                seen += buckets[i];
+                if (seen >= rank)
+                    return i == buckets.length - 1 ? max : Math.min(upperBound(i), max);
+            }
+            return max;
+        }
+    }
+
+    static int bucket(long nanos) {
+        if (nanos < SUB_BUCKETS)
+            return (int) Math.max(nanos, 0L);
+        int exponent = 63 - Long.numberOfLeadingZeros(nanos);
+        if (exponent > MAX_EXPONENT)
+            return (MAX_EXPONENT + 1) * SUB_BUCKETS - 1;
+        int sub = (int) (nanos >>> (exponent - 2)) & (SUB_BUCKETS - 1);
+        return (exponent - 1) * SUB_BUCKETS + sub;
+    }
+
+    static long upperBound(int bucket) {
+        if (bucket < SUB_BUCKETS)
+            return bucket;
+        int exponent = bucket / SUB_BUCKETS + 1;
+        int sub = bucket % SUB_BUCKETS;
+        return ((long) (SUB_BUCKETS + sub + 1) << (exponent - 2)) - 1;
+    }
+
+    public synchronized void record(int id, String name, long nanos) {
+        entries.computeIfAbsent(id, k -> new Histogram(name)).record(nanos);
+    }
+
+    /** 记录一次因超出 tick 预算而推迟 */
+    public synchronized void defer(int id, String name) {
+        entries.computeIfAbsent(id, k -> new Histogram(name)).deferred++;
+    }
+
+    public synchronized void reset() {
+        entries.clear();
+    }
+
+    /**
+     * 打包全部统计（小端序）
+     *
+     * int32 回调数量，之后每个回调依次为：id (int32)、名称 (int32 长度 + UTF-8)、
+     * 次数、总耗时、最大耗时、p50、p99、推迟次数 (均为 int64，耗时单位为纳秒)
+     */
+    public synchronized byte[] pack() {
+        List<byte[]> names = new ArrayList<>(entries.size());
+        int size = Integer.BYTES;
+        for (Histogram histogram : entries.values()) {
+            byte[] name = histogram.name.getBytes(StandardCharsets.UTF_8);
+            names.add(name);
+            size += 2 * Integer.BYTES + name.length + 6 * Long.BYTES;
+        }
+        ByteBuffer buffer = ByteBuffer.allocate(size).order(ByteOrder.LITTLE_ENDIAN);
+        buffer.putInt(entries.size());
+        int i = 0;
+        for (Map.Entry<Integer, Histogram> entry : entries.entrySet()) {
+            Histogram histogram = entry.getValue();
+            byte[] name = names.get(i++);
+            buffer.putInt(entry.getKey());
+            buffer.putInt(name.length);
+            buffer.put(name);
+            buffer.putLong(histogram.count);
+            buffer.putLong(histogram.total);
+            buffer.putLong(histogram.max);
+            buffer.putLong(histogram.percentile(0.5));
+            buffer.putLong(histogram.percentile(0.99));
+            buffer.putLong(histogram.deferred);
+        }
+        return buffer.array();
+    }
+}
@@ -0,0 +1,11 @@
+package top.fish1000.pymcfabric.executor;
+
+/**
+ * 回调的触发条件，在执行器分发前判断
+ *
+ * 不满足条件的事件不会调用回调（对 Python 回调而言即不会跨语言调用）
+ */
+@FunctionalInterface
+public interface EventFilter {
+    boolean test(Object data, int tick);
+}
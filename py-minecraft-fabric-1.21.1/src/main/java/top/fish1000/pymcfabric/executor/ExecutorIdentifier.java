@@ -1,12 +1,14 @@
 package top.fish1000.pymcfabric.executor;
 
+import java.util.concurrent.atomic.AtomicInteger;
 import java.util.function.Supplier;
 
 public class ExecutorIdentifier<T> implements Supplier<T> {
-    private static int id_suppllier = 0;
+    /** 任务可能由多个 py4j 线程同时创建 */
+    private static final AtomicInteger idSupplier = new AtomicInteger();
 
     protected int getId() {
-        return id_suppllier++;
+        return idSupplier.getAndIncrement();
     }
 
     public final T data;
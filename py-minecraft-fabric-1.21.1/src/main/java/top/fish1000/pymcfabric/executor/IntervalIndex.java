@@ -0,0 +1,121 @@
+package top.fish1000.pymcfabric.executor;
+
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.Comparator;
+import java.util.HashMap;
+import java.util.List;
+import java.util.PriorityQueue;
+import java.util.function.ObjIntConsumer;
+
+import org.jetbrains.annotations.Nullable;
+
+/**
+ * 按名称索引的周期任务表
+ *
+ * 每个名称一个按下次执行 tick 排序的优先队列（{@link IntervalValue#offset()} 即下次执行的 tick），
+ * 执行后由执行器自行排入下一周期，无需 Python 端重新注册。
+ * 未指定相位时，同一周期的任务依次分配相位，避免大量任务落在同一 tick。
+ * 与 {@link IntervalExecutor} 不同，任务按事件名称索引，可以按 id 移除，并带有触发条件与优先级
+ */
+public class IntervalIndex<E extends NamedExecutorIdentifier<?>> {
+    /** 自动分配相位 */
+    public static final int AUTO_OFFSET = -1;
+
+    private final HashMap<String, PriorityQueue<IntervalValue<E>>> byName = new HashMap<>();
+    private final HashMap<Integer, String> names = new HashMap<>();
+    private final HashMap<Integer, Integer> phaseCounters = new HashMap<>();
+    private @Nullable ObjIntConsumer<String> listener;
+
+    public void setListener(@Nullable ObjIntConsumer<String> listener) {
+        this.listener = listener;
+    }
+
+    private void notifyListener(String name, int delta) {
+        if (listener != null)
+            listener.accept(name, delta);
+    }
+
+    /**
+     * 添加周期任务
+     *
+     * @param interval    周期（tick）
+     * @param offset      相位，任务在 tick % interval == offset 时执行；{@link #AUTO_OFFSET} 表示自动分配
+     * @param entry       任务
+     * @param currentTick 当前 tick，任务最早在下一 tick 执行
+     */
+    public void add(int interval, int offset, E entry, int currentTick) {
+        if (interval <= 0)
+            throw new IllegalArgumentException("Interval must be positive: " + interval);
+        int phase = offset == AUTO_OFFSET ? phaseCounters.merge(interval, 1, Integer::sum) % interval
+                : Math.floorMod(offset, interval);
+        int next = currentTick + 1 + Math.floorMod(phase - (currentTick + 1), interval);
+        byName.computeIfAbsent(entry.name, k -> new PriorityQueue<>(Comparator.comparingInt(IntervalValue::offset)))
+                .add(new IntervalValue<>(interval, next, entry));
+        names.put(entry.id, entry.name);
+        notifyListener(entry.name, 1);
+    }
+
+    /**
+     * 按 id 移除周期任务
+     *
+     * @return 是否存在该任务
+     */
+    public boolean remove(int id) {
+        String name = names.remove(id);
+        if (name == null)
+            return false;
+        PriorityQueue<IntervalValue<E>> queue = byName.get(name);
+        queue.removeIf(value -> value.value().id == id);
+        if (queue.isEmpty())
+            byName.remove(name);
+        notifyListener(name, -1);
+        return true;
+    }
+
+    /**
+     * 取出指定名称中已到期的任务，并排入各自的下一周期
+     *
+     * @return 到期的任务，没有时返回 null
+     */
+    public @Nullable List<E> due(String name, int currentTick) {
+        PriorityQueue<IntervalValue<E>> queue = byName.get(name);
+        if (queue == null || queue.peek().offset() > currentTick)
+            return null;
+        List<E> due = new ArrayList<>();
+        List<IntervalValue<E>> next = new ArrayList<>();
+        while (!queue.isEmpty() && queue.peek().offset() <= currentTick) {
+            IntervalValue<E> value = queue.poll();
+            due.add(value.value());
+            // 错过的周期（该名称的事件没有发生）不补执行
+            int missed = (currentTick - value.offset()) / value.interval();
+            next.add(new IntervalValue<>(value.interval(), value.offset() + (missed + 1) * value.interval(),
+                    value.value()));
+        }
+        queue.addAll(next);
+        return due;
+    }
+
+    /** 全部周期任务的 id */
+    public Collection<Integer> ids() {
+        return names.keySet();
+    }
+
+    public void clear() {
+        byName.values().forEach(queue -> queue.forEach(value -> notifyListener(value.value().name, -1)));
+        byName.clear();
+        names.clear();
+    }
+
+    public boolean isEmpty() {
+        return names.isEmpty();
+    }
+
+    public int size() {
+        return names.size();
+    }
+
+    public int nameCount() {
+        return byName.size();
+    }
+}
@@ -1,86 +1,254 @@
 package top.fish1000.pymcfabric.executor;
 
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.util.ArrayList;
+import java.util.Collection;
 import java.util.HashMap;
-import java.util.LinkedList;
+import java.util.Queue;
+import java.util.concurrent.ConcurrentLinkedQueue;
 import java.util.function.Consumer;
 import java.util.function.IntSupplier;
+import java.util.function.ObjIntConsumer;
 
+import org.jetbrains.annotations.Nullable;
+
+import top.fish1000.pymcfabric.EventFilters;
 import top.fish1000.pymcfabric.PymcMngr;
 
 public class NamedAdvancedExecutor<T> extends NamedExecutor<T> {
 
-    protected final LinkedList<NamedExecutorIdentifier<Consumer<T>>> callbackContinuousList;
-    protected final LinkedList<NamedExecutorIdentifier<Consumer<T>>> callbackOnceList;
-    protected final LinkedList<Integer> toRemove;
-    protected final LinkedList<NamedExecutorIdentifier<Consumer<T>>> toAddContinuous;
-    protected final LinkedList<NamedExecutorIdentifier<Consumer<T>>> toAddOnce;
-    protected final LinkedList<Pair<Integer, NamedExecutorIdentifier<Consumer<T>>>> toAddScheduled;
-    protected Boolean removeAllContinuous = false;
-    protected Boolean removeAllOnce = false;
-    protected Boolean removeAllScheduled = false;
+    protected final CallbackIndex<NamedExecutorIdentifier<Consumer<T>>> callbackContinuous;
+    protected final CallbackIndex<NamedExecutorIdentifier<Consumer<T>>> callbackOnce;
+    protected final IntervalIndex<NamedExecutorIdentifier<Consumer<T>>> callbackInterval;
+    // 以下队列与标志由 py4j 线程写入、服务器线程在 tick 开始时取出，可能有多个线程同时添加任务
+    protected final Queue<Integer> toRemove;
+    protected final Queue<NamedExecutorIdentifier<Consumer<T>>> toAddContinuous;
+    protected final Queue<NamedExecutorIdentifier<Consumer<T>>> toAddOnce;
+    protected final Queue<Pair<Integer, NamedExecutorIdentifier<Consumer<T>>>> toAddScheduled;
+    protected final Queue<IntervalValue<NamedExecutorIdentifier<Consumer<T>>>> toAddInterval;
+    protected volatile boolean removeAllContinuous = false;
+    protected volatile boolean removeAllOnce = false;
+    protected volatile boolean removeAllScheduled = false;
 
     protected int tick = 0;
     protected Long tickTimeSum = 0L;
     protected HashMap<String, Long> tickTimes = new HashMap<>();
     protected Boolean printDebug = false;
+    /** 每个 tick 中回调的时间预算（纳秒） */
+    protected long tickBudget = 40_000_000L;
+    protected long dispatchStartTime = 0L;
+    protected long deferredCount = 0L;
+
+    protected long dispatchCount = 0L;
+    protected long dispatchHits = 0L;
+
+    protected @Nullable ObjIntConsumer<String> nameListener;
+    /** 已移出执行器的任务 id，供 Python 端释放对应的回调；为 null 时不记录 */
+    protected @Nullable ArrayList<Integer> retired;
 
     public NamedAdvancedExecutor(IntSupplier tickSupplier) {
         super(tickSupplier);
-        callbackContinuousList = new LinkedList<>();
-        callbackOnceList = new LinkedList<>();
-        toRemove = new LinkedList<>();
-        toAddContinuous = new LinkedList<>();
-        toAddOnce = new LinkedList<>();
-        toAddScheduled = new LinkedList<>();
+        callbackContinuous = new CallbackIndex<>();
+        callbackOnce = new CallbackIndex<>();
+        callbackInterval = new IntervalIndex<>();
+        toRemove = new ConcurrentLinkedQueue<>();
+        toAddContinuous = new ConcurrentLinkedQueue<>();
+        toAddOnce = new ConcurrentLinkedQueue<>();
+        toAddScheduled = new ConcurrentLinkedQueue<>();
+        toAddInterval = new ConcurrentLinkedQueue<>();
+    }
+
+    /**
+     * 依次取出并处理队列中的元素，处理期间其他线程新加入的元素也会被处理
+     */
+    private static <E> void drain(Queue<E> queue, Consumer<E> action) {
+        E element;
+        while ((element = queue.poll()) != null)
+            action.accept(element);
+    }
+
+    private record Pending<C>(NamedExecutorIdentifier<C> callback, boolean once) {
     }
 
     @Override
     public void tick(T data, String name) {
         // Utils.LOGGER.trace("Looking for callback: tick{} @ {}", tickSupplier.get(),
         // name);
-        toRemove.forEach(id -> {
-            callbackContinuousList.removeIf(callback -> callback.id == id);
-            callbackOnceList.removeIf(callback -> callback.id == id);
-            remove(id);
+        drain(toRemove, id -> {
+            if (callbackContinuous.remove(id) == null && callbackOnce.remove(id) == null
+                    && !callbackInterval.remove(id))
+                remove(id);
+            retire(id);
         });
-        toRemove.clear();
 
         if (removeAllScheduled) {
+            retireScheduled();
             removeAll();
             removeAllScheduled = false;
         }
         if (removeAllOnce) {
-            callbackOnceList.clear();
+            callbackOnce.ids().forEach(this::retire);
+            callbackOnce.clear();
             removeAllOnce = false;
         }
         if (removeAllContinuous) {
-            callbackContinuousList.clear();
+            callbackContinuous.ids().forEach(this::retire);
+            callbackInterval.ids().forEach(this::retire);
+            callbackContinuous.clear();
+            callbackInterval.clear();
             removeAllContinuous = false;
         }
 
-        callbackContinuousList.addAll(toAddContinuous);
-        toAddContinuous.clear();
-        callbackOnceList.addAll(toAddOnce);
-        toAddOnce.clear();
-        toAddScheduled.forEach(id -> {
+        drain(toAddContinuous, callbackContinuous::add);
+        drain(toAddOnce, callbackOnce::add);
+        drain(toAddScheduled, id -> {
             push(id.first(), id.second(), TickType.RELATIVE);
+            if (nameListener != null)
+                nameListener.accept(id.second().name, 1);
         });
-        toAddScheduled.clear();
+        int currentTick = tickSupplier.getAsInt();
+        // 周期任务在 push 时只记录了周期与相位，加入时才确定首次执行的 tick
+        drain(toAddInterval, value -> callbackInterval.add(value.interval(), value.offset(), value.value(),
+                currentTick));
 
         super.tick(data, name);
-        callbackContinuousList.forEach(callback -> {
-            if (callback.name.equals(name)) {
-                PymcMngr.LOGGER.trace("Found callback(continuous) tick{} @ {}", tickSupplier.getAsInt(), name);
-                callback.data.accept(data);
-            }
-        });
-        callbackOnceList.forEach(callback -> {
-            if (callback.name.equals(name)) {
-                callback.data.accept(data);
-                PymcMngr.LOGGER.trace("Found callback(once), removed tick{} @ {}", tickSupplier.getAsInt(), name);
+
+        dispatchCount++;
+        Collection<NamedExecutorIdentifier<Consumer<T>>> continuous = callbackContinuous.get(name);
+        Collection<NamedExecutorIdentifier<Consumer<T>>> once = callbackOnce.removeName(name);
+        Collection<NamedExecutorIdentifier<Consumer<T>>> interval = callbackInterval.due(name, currentTick);
+        if (continuous == null && once == null && interval == null)
+            return;
+        dispatchHits++;
+
+        // 同一事件的全部回调按优先级执行，优先级相同时保持连续、周期、一次性的顺序
+        ArrayList<Pending<Consumer<T>>> pending = new ArrayList<>();
+        if (continuous != null)
+            continuous.forEach(callback -> pending.add(new Pending<>(callback, false)));
+        if (interval != null)
+            interval.forEach(callback -> pending.add(new Pending<>(callback, false)));
+        if (once != null)
+            once.forEach(callback -> pending.add(new Pending<>(callback, true)));
+        if (pending.size() > 1)
+            pending.sort((a, b) -> BY_PRIORITY.compare(a.callback(), b.callback()));
+
+        for (Pending<Consumer<T>> entry : pending) {
+            NamedExecutorIdentifier<Consumer<T>> callback = entry.callback();
+            if (entry.once()) {
+                if (!accepts(callback, data, currentTick) || shouldDefer(callback)) {
+                    // 不满足条件或被推迟的一次性任务继续等待下一次事件
+                    callbackOnce.add(callback);
+                    continue;
+                }
+                retire(callback.id);
+                dispatch(callback, data);
+                PymcMngr.LOGGER.trace("Found callback(once), removed tick{} @ {}", currentTick, name);
+            } else {
+                if (callback.resumeTick > currentTick || !accepts(callback, data, currentTick))
+                    continue;
+                PymcMngr.LOGGER.trace("Found callback(continuous) tick{} @ {}", currentTick, name);
+                if (callback.data instanceof ResumableConsumer<T> resumable)
+                    resume(callback, resumable, data, currentTick);
+                else
+                    dispatch(callback, data);
             }
-        });
-        callbackOnceList.removeIf(nv -> nv.name.equals(name));
+        }
+    }
+
+    /**
+     * 执行可挂起的回调，并按返回值挂起或移除
+     */
+    protected void resume(NamedExecutorIdentifier<Consumer<T>> callback, ResumableConsumer<T> resumable, T data,
+            int currentTick) {
+        long startTime = System.nanoTime();
+        int sleep;
+        try {
+            sleep = resumable.resume(data, currentTick);
+        } finally {
+            metrics.record(callback.id, callback.name, System.nanoTime() - startTime);
+        }
+        if (sleep < 0) {
+            // 同一 tick 内可能还会分发同名事件，移除前不再执行
+            callback.resumeTick = Integer.MAX_VALUE;
+            toRemove.add(callback.id);
+        } else {
+            callback.resumeTick = currentTick + sleep;
+        }
+    }
+
+    /**
+     * 本 tick 中回调已用的时间是否超出预算
+     */
+    protected boolean overBudget() {
+        return tickTimeSum + System.nanoTime() - dispatchStartTime > tickBudget;
+    }
+
+    /**
+     * 超出预算时推迟优先级小于 0 的任务
+     */
+    @Override
+    protected boolean shouldDefer(NamedExecutorIdentifier<Consumer<T>> callback) {
+        if (callback.priority >= 0 || !overBudget())
+            return false;
+        deferredCount++;
+        metrics.defer(callback.id, callback.name);
+        return true;
+    }
+
+    @Override
+    protected void onRetired(NamedExecutorIdentifier<Consumer<T>> callback) {
+        retire(callback.id);
+        if (nameListener != null)
+            nameListener.accept(callback.name, -1);
+    }
+
+    /**
+     * 记录移出执行器的任务
+     */
+    protected synchronized void retire(int id) {
+        if (retired != null)
+            retired.add(id);
+    }
+
+    protected void retireScheduled() {
+        callbackScheduled.values().forEach(list -> list.forEach(callback -> retire(callback.get().id)));
+    }
+
+    /**
+     * 开始或停止记录移出执行器的任务 id，见 {@link #drainRetired}
+     */
+    public synchronized void setTrackRetired(boolean track) {
+        if (!track)
+            retired = null;
+        else if (retired == null)
+            retired = new ArrayList<>();
+    }
+
+    /**
+     * 取出并清空已移出执行器（执行完毕、被移除或被清空）的任务 id
+     *
+     * @return 任务 id（小端 int32），未开始记录时为空
+     */
+    public synchronized byte[] drainRetired() {
+        if (retired == null)
+            return new byte[0];
+        ByteBuffer buffer = ByteBuffer.allocate(retired.size() * Integer.BYTES).order(ByteOrder.LITTLE_ENDIAN);
+        retired.forEach(buffer::putInt);
+        retired.clear();
+        return buffer.array();
+    }
+
+    /**
+     * 设置订阅变化监听器，每当某名称增加或减少一个回调时调用 (名称, +1/-1)
+     *
+     * 被移除或清空的计划任务不会通知，监听器得到的是可能订阅的上界
+     */
+    public void setNameListener(@Nullable ObjIntConsumer<String> listener) {
+        nameListener = listener;
+        callbackContinuous.setListener(listener);
+        callbackOnce.setListener(listener);
+        callbackInterval.setListener(listener);
     }
 
     public void timedTick(T data, String name) {
@@ -91,17 +259,17 @@ public class NamedAdvancedExecutor<T> extends NamedExecutor<T> {
                 PymcMngr.LOGGER.info("+---------------------------------------------------------------->");
                 printDebug = false;
             }
-            if (tickTimeSum > 40e6) {
-                PymcMngr.LOGGER.warn("Tick time too long(shouldn't longer than 40ms): {}ms @ tick{}",
-                        tickTimeSum / 1e6d, tick);
+            if (tickTimeSum > tickBudget) {
+                PymcMngr.LOGGER.warn("Tick time too long(shouldn't longer than {}ms): {}ms @ tick{}",
+                        tickBudget / 1e6d, tickTimeSum / 1e6d, tick);
             }
             tick = tickSupplier.getAsInt();
             tickTimeSum = 0L;
             tickTimes.clear();
         }
-        long startTime = System.nanoTime();
+        dispatchStartTime = System.nanoTime();
         tick(data, name);
-        long tickTime = System.nanoTime() - startTime;
+        long tickTime = System.nanoTime() - dispatchStartTime;
         if (tickTime > 1e4) {
             tickTimes.put(name, tickTime);
         }
@@ -112,12 +280,64 @@ public class NamedAdvancedExecutor<T> extends NamedExecutor<T> {
         printDebug = true;
     }
 
+    /** 每个 tick 中回调的时间预算（毫秒） */
+    public double getTickBudget() {
+        return tickBudget / 1e6d;
+    }
+
+    /**
+     * 设置每个 tick 中回调的时间预算，超出后优先级小于 0 的一次性与计划任务推迟执行
+     *
+     * @param millis 预算（毫秒）
+     */
+    public void setTickBudget(double millis) {
+        if (millis <= 0)
+            throw new IllegalArgumentException("Tick budget must be positive: " + millis);
+        tickBudget = (long) (millis * 1e6d);
+    }
+
+    /** 因超出预算而推迟的次数 */
+    public long getDeferredCount() {
+        return deferredCount;
+    }
+
+    /** 已索引的连续与一次性回调数量 */
+    public int getIndexSize() {
+        return callbackContinuous.size() + callbackOnce.size() + callbackInterval.size();
+    }
+
+    /** 拥有订阅者的名称数量 */
+    public int getIndexedNames() {
+        return callbackContinuous.nameCount() + callbackOnce.nameCount() + callbackInterval.nameCount();
+    }
+
+    /** 分发的事件总数 */
+    public long getDispatchCount() {
+        return dispatchCount;
+    }
+
+    /** 命中至少一个回调的事件数 */
+    public long getDispatchHits() {
+        return dispatchHits;
+    }
+
+    public void resetDispatchStats() {
+        dispatchCount = 0L;
+        dispatchHits = 0L;
+        deferredCount = 0L;
+    }
+
     public void tryTick(T data, String name) {
         try {
             timedTick(data, name);
         } catch (Exception e) {
-            callbackContinuousList.clear();
-            callbackOnceList.clear();
+            callbackContinuous.ids().forEach(this::retire);
+            callbackOnce.ids().forEach(this::retire);
+            callbackInterval.ids().forEach(this::retire);
+            retireScheduled();
+            callbackContinuous.clear();
+            callbackOnce.clear();
+            callbackInterval.clear();
             callbackScheduled.clear();
             PymcMngr.LOGGER.error("Error in callback, skipped, callback list cleared: tick{} @ {}",
                     tickSupplier.getAsInt(), name);
@@ -132,6 +352,32 @@ public class NamedAdvancedExecutor<T> extends NamedExecutor<T> {
         return id.id;
     }
 
+    /**
+     * 添加带触发条件的计划任务，到期时不满足条件则跳过
+     *
+     * @param filter 触发条件，语法见 {@link EventFilters}
+     */
+    public int pushScheduled(int tick, Consumer<T> callback, String name, String filter) {
+        NamedExecutorIdentifier<Consumer<T>> id = new NamedExecutorIdentifier<>(callback, name);
+        id.filter = EventFilters.parse(filter);
+        toAddScheduled.add(Pair.of(tick, id));
+        return id.id;
+    }
+
+    /**
+     * 添加带优先级的计划任务
+     *
+     * @param filter   触发条件，为 null 时总是执行
+     * @param priority 优先级，见 {@link NamedExecutorIdentifier#priority}
+     */
+    public int pushScheduled(int tick, Consumer<T> callback, String name, @Nullable String filter, int priority) {
+        NamedExecutorIdentifier<Consumer<T>> id = new NamedExecutorIdentifier<>(callback, name);
+        id.filter = filter == null ? null : EventFilters.parse(filter);
+        id.priority = priority;
+        toAddScheduled.add(Pair.of(tick, id));
+        return id.id;
+    }
+
     public void removeScheduledAll() {
         PymcMngr.LOGGER.trace("Removing all callback(scheduled)");
         removeAllScheduled = true;
@@ -144,6 +390,32 @@ public class NamedAdvancedExecutor<T> extends NamedExecutor<T> {
         return id.id;
     }
 
+    /**
+     * 添加带触发条件的一次性任务，在第一次满足条件的事件执行后移除
+     *
+     * @param filter 触发条件，语法见 {@link EventFilters}
+     */
+    public int pushOnce(Consumer<T> callback, String name, String filter) {
+        NamedExecutorIdentifier<Consumer<T>> id = new NamedExecutorIdentifier<>(callback, name);
+        id.filter = EventFilters.parse(filter);
+        toAddOnce.add(id);
+        return id.id;
+    }
+
+    /**
+     * 添加带优先级的一次性任务
+     *
+     * @param filter   触发条件，为 null 时总是执行
+     * @param priority 优先级，见 {@link NamedExecutorIdentifier#priority}
+     */
+    public int pushOnce(Consumer<T> callback, String name, @Nullable String filter, int priority) {
+        NamedExecutorIdentifier<Consumer<T>> id = new NamedExecutorIdentifier<>(callback, name);
+        id.filter = filter == null ? null : EventFilters.parse(filter);
+        id.priority = priority;
+        toAddOnce.add(id);
+        return id.id;
+    }
+
     public void removeOnceAll() {
         PymcMngr.LOGGER.trace("Removing all callback(once)");
         removeAllOnce = true;
@@ -156,6 +428,95 @@ public class NamedAdvancedExecutor<T> extends NamedExecutor<T> {
         return id.id;
     }
 
+    /**
+     * 添加连续任务，在 delay 个 tick 之后才开始执行
+     *
+     * 与 {@link ResumableConsumer} 配合时，回调可以自行决定之后的挂起时间
+     */
+    public int pushContinuous(Consumer<T> callback, String name, int delay) {
+        PymcMngr.LOGGER.trace("Pushing callback(continuous, delay {}): tick{} @ {}", delay,
+                tickSupplier.getAsInt(), name);
+        NamedExecutorIdentifier<Consumer<T>> id = new NamedExecutorIdentifier<>(callback, name);
+        id.resumeTick = tickSupplier.getAsInt() + delay;
+        toAddContinuous.add(id);
+        return id.id;
+    }
+
+    /**
+     * 添加带触发条件的连续任务
+     *
+     * @param filter 触发条件，语法见 {@link EventFilters}
+     */
+    public int pushContinuous(Consumer<T> callback, String name, int delay, String filter) {
+        NamedExecutorIdentifier<Consumer<T>> id = new NamedExecutorIdentifier<>(callback, name);
+        id.resumeTick = tickSupplier.getAsInt() + delay;
+        id.filter = EventFilters.parse(filter);
+        toAddContinuous.add(id);
+        return id.id;
+    }
+
+    /**
+     * 添加带优先级的连续任务，连续任务不会被推迟，优先级只决定执行顺序
+     *
+     * @param filter   触发条件，为 null 时总是执行
+     * @param priority 优先级，见 {@link NamedExecutorIdentifier#priority}
+     */
+    public int pushContinuous(Consumer<T> callback, String name, int delay, @Nullable String filter, int priority) {
+        NamedExecutorIdentifier<Consumer<T>> id = new NamedExecutorIdentifier<>(callback, name);
+        id.resumeTick = tickSupplier.getAsInt() + delay;
+        id.filter = filter == null ? null : EventFilters.parse(filter);
+        id.priority = priority;
+        toAddContinuous.add(id);
+        return id.id;
+    }
+
+    /**
+     * 添加周期任务，由执行器自行排入下一周期
+     *
+     * @param interval 周期（tick）
+     * @param offset   相位，在 tick % interval == offset 时执行；-1 表示自动分配，使同周期的任务分散到不同 tick
+     */
+    public int pushInterval(int interval, int offset, Consumer<T> callback, String name) {
+        return pushInterval(interval, offset, new NamedExecutorIdentifier<>(callback, name));
+    }
+
+    /**
+     * 添加已设置好触发条件与优先级的周期任务
+     */
+    private int pushInterval(int interval, int offset, NamedExecutorIdentifier<Consumer<T>> id) {
+        PymcMngr.LOGGER.trace("Pushing callback(interval {}): tick{} @ {}", interval, tickSupplier.getAsInt(),
+                id.name);
+        if (interval <= 0)
+            throw new IllegalArgumentException("Interval must be positive: " + interval);
+        toAddInterval.add(new IntervalValue<>(interval, offset, id));
+        return id.id;
+    }
+
+    /**
+     * 添加带触发条件的周期任务，到期时不满足条件则跳过本周期
+     *
+     * @param filter 触发条件，语法见 {@link EventFilters}
+     */
+    public int pushInterval(int interval, int offset, Consumer<T> callback, String name, String filter) {
+        NamedExecutorIdentifier<Consumer<T>> id = new NamedExecutorIdentifier<>(callback, name);
+        id.filter = EventFilters.parse(filter);
+        return pushInterval(interval, offset, id);
+    }
+
+    /**
+     * 添加带优先级的周期任务，周期任务不会被推迟，优先级只决定执行顺序
+     *
+     * @param filter   触发条件，为 null 时总是执行
+     * @param priority 优先级，见 {@link NamedExecutorIdentifier#priority}
+     */
+    public int pushInterval(int interval, int offset, Consumer<T> callback, String name, @Nullable String filter,
+            int priority) {
+        NamedExecutorIdentifier<Consumer<T>> id = new NamedExecutorIdentifier<>(callback, name);
+        id.filter = filter == null ? null : EventFilters.parse(filter);
+        id.priority = priority;
+        return pushInterval(interval, offset, id);
+    }
+
     public void removeContinuousAll() {
         PymcMngr.LOGGER.trace("Removing all callback(continuous)");
         removeAllContinuous = true;
@@ -1,5 +1,6 @@
 package top.fish1000.pymcfabric.executor;
 
+import java.util.Comparator;
 import java.util.LinkedList;
 import java.util.function.Consumer;
 import java.util.function.IntSupplier;
@@ -7,6 +8,12 @@ import java.util.function.IntSupplier;
 public class NamedExecutor<T>
         extends
         TimedExecutor<T, NamedExecutorIdentifier<Consumer<T>>, LinkedList<ExecutorIdentifier<NamedExecutorIdentifier<Consumer<T>>>>> {
+    /** 按优先级从高到低 */
+    protected static final Comparator<NamedExecutorIdentifier<?>> BY_PRIORITY = Comparator
+            .comparingInt((NamedExecutorIdentifier<?> callback) -> callback.priority).reversed();
+
+    protected final CallbackMetrics metrics = new CallbackMetrics();
+
     public NamedExecutor(IntSupplier tickSupplier) {
         super(tickSupplier, LinkedList::new);
     }
@@ -16,13 +23,79 @@ public class NamedExecutor<T>
         LinkedList<ExecutorIdentifier<NamedExecutorIdentifier<Consumer<T>>>> exes = callbackScheduled
                 .remove(currentTick);
         if (exes != null) {
+            if (exes.size() > 1)
+                exes.sort((a, b) -> BY_PRIORITY.compare(a.get(), b.get()));
             exes.forEach(callback -> {
-                if (callback.get().name.equals(name))
-                    callback.get().get().accept(data);
+                if (callback.get().name.equals(name) && shouldDefer(callback.get())) {
+                    // 推迟到下一 tick，仍然是同一个任务，不通知移出
+                    push(1, callback.get(), TickType.RELATIVE);
+                    return;
+                }
+                onRetired(callback.get());
+                if (callback.get().name.equals(name) && accepts(callback.get(), data, currentTick))
+                    dispatch(callback.get(), data);
             });
         }
     }
 
+    /**
+     * 事件是否满足回调的触发条件
+     */
+    protected boolean accepts(NamedExecutorIdentifier<?> callback, T data, int tick) {
+        return callback.filter == null || callback.filter.test(data, tick);
+    }
+
+    /**
+     * 是否推迟可推迟的任务（一次性与计划任务），默认从不推迟
+     */
+    protected boolean shouldDefer(NamedExecutorIdentifier<Consumer<T>> callback) {
+        return false;
+    }
+
+    /**
+     * 执行回调并记录耗时
+     */
+    protected void dispatch(NamedExecutorIdentifier<Consumer<T>> callback, T data) {
+        long startTime = System.nanoTime();
+        try {
+            dispatch(callback.get(), data);
+        } finally {
+            metrics.record(callback.id, callback.name, System.nanoTime() - startTime);
+        }
+    }
+
+    /**
+     * 执行回调，{@link TickedConsumer} 会同时收到当前 tick
+     */
+    protected void dispatch(Consumer<T> callback, T data) {
+        if (callback instanceof TickedConsumer<T> ticked)
+            ticked.acceptTicked(data, tickSupplier.getAsInt());
+        else
+            callback.accept(data);
+    }
+
+    /** 各回调的执行耗时统计 */
+    public CallbackMetrics getMetrics() {
+        return metrics;
+    }
+
+    /**
+     * 计划任务被移出执行队列时调用
+     *
+     * @param callback 被移出的任务
+     */
+    protected void onRetired(NamedExecutorIdentifier<Consumer<T>> callback) {
+    }
+
+    /**
+     * 移除计划任务，同时匹配外层与内层（pushScheduled 返回的）id
+     */
+    @Override
+    public void remove(int id) {
+        callbackScheduled.values()
+                .forEach(list -> list.removeIf(callback -> callback.id == id || callback.get().id == id));
+    }
+
     public int push(int tick, Consumer<T> callback, String name, TickType tickType) {
         return super.push(tick, new NamedExecutorIdentifier<>(callback, name), tickType);
     }
@@ -1,7 +1,15 @@
 package top.fish1000.pymcfabric.executor;
 
+import org.jetbrains.annotations.Nullable;
+
 public class NamedExecutorIdentifier<T> extends ExecutorIdentifier<T> {
     public final String name;
+    /** 可挂起的回调在此 tick 之前不会执行 */
+    public int resumeTick = 0;
+    /** 触发条件，为 null 时总是执行 */
+    public @Nullable EventFilter filter;
+    /** 优先级，同一事件中数值大的先执行；小于 0 的一次性与计划任务在超出 tick 预算时推迟 */
+    public int priority = 0;
 
     public NamedExecutorIdentifier(T data, String name) {
         super(data);
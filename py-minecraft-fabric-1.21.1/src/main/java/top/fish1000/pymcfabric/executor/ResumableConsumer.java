@@ -0,0 +1,25 @@
+package top.fish1000.pymcfabric.executor;
+
+import java.util.function.Consumer;
+
+/**
+ * 可挂起的连续回调（对应 Python 端的生成器回调）
+ *
+ * 执行器调用 {@link #resume} 而不是 {@link #accept}，并按返回值决定下次执行的时间，
+ * 挂起期间不会跨语言调用
+ */
+public interface ResumableConsumer<T> extends Consumer<T> {
+    /**
+     * 继续执行
+     *
+     * @param data 事件对象
+     * @param tick 当前 tick
+     * @return 挂起的 tick 数，0 表示下一次事件即执行；小于 0 表示已结束，回调将被移除
+     */
+    int resume(T data, int tick);
+
+    @Override
+    default void accept(T data) {
+        resume(data, 0);
+    }
+}
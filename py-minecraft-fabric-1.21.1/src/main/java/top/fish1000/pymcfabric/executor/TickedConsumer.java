@@ -0,0 +1,12 @@
+package top.fish1000.pymcfabric.executor;
+
+import java.util.function.Consumer;
+
+/**
+ * 需要知道当前 tick 的回调
+ *
+ * 执行器会优先调用 {@link #acceptTicked}，使 Python 端无需额外往返即可得知 tick
+ */
+public interface TickedConsumer<T> extends Consumer<T> {
+    void acceptTicked(T data, int tick);
+}
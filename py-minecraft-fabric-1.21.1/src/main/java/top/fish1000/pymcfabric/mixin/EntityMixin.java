@@ -8,30 +8,40 @@ import org.spongepowered.asm.mixin.injection.At;
 
 import net.minecraft.entity.Entity;
 import net.minecraft.util.ActionResult;
+import top.fish1000.pymcfabric.EntitySubscriptions;
+import top.fish1000.pymcfabric.EntitySubscriptions.Action;
+import top.fish1000.pymcfabric.EntitySubscriptions.KeyKind;
 import top.fish1000.pymcfabric.PymcMngr;
 
 @Mixin(Entity.class)
 public abstract class EntityMixin {
 
-    private void tick(String action) {
-        PymcMngr.tick("entity " + action, ((Entity) (Object) this));
-        PymcMngr.tick("entity " + action + ' ' + ((Entity) (Object) this).getName().getString(),
-                ((Entity) (Object) this));
-        PymcMngr.tick("entity " + action + ' ' + ((Entity) (Object) this).getUuidAsString(), ((Entity) (Object) this));
+    private void tick(Action action) {
+        // 无人订阅时直接返回，避免为每个实体拼接名称
+        if (!EntitySubscriptions.any(action))
+            return;
+
+        Entity self = (Entity) (Object) this;
+        if (EntitySubscriptions.has(action, KeyKind.ALL))
+            PymcMngr.tick(action.eventName, self);
+        if (EntitySubscriptions.has(action, KeyKind.NAME))
+            PymcMngr.tick(action.eventName + ' ' + self.getName().getString(), self);
+        if (EntitySubscriptions.has(action, KeyKind.UUID))
+            PymcMngr.tick(action.eventName + ' ' + self.getUuidAsString(), self);
     }
 
     @Inject(method = "interact(Lnet/minecraft/entity/player/PlayerEntity;Lnet/minecraft/util/Hand;)Lnet/minecraft/util/ActionResult;", at = @At("HEAD"))
     private void entityInteract(CallbackInfoReturnable<ActionResult> info) {
-        tick("interact");
+        tick(Action.INTERACT);
     }
 
     @Inject(method = "tick()V", at = @At("HEAD"))
     private void entityTick(CallbackInfo info) {
-        tick("tick");
+        tick(Action.TICK);
     }
 
     @Inject(method = "setRemoved(Lnet/minecraft/entity/Entity$RemovalReason;)V", at = @At("HEAD"))
     private void entityRemoved(CallbackInfo info) {
-        tick("removed");
+        tick(Action.REMOVED);
     }
 }
@@ -3,8 +3,10 @@ package top.fish1000.pymcfabric.mixin;
 import net.minecraft.server.MinecraftServer;
 import net.minecraft.util.profiler.Profiler;
 
+import py4j.ClientServer;
 import py4j.GatewayServer;
 
+import top.fish1000.pymcfabric.EntitySubscriptions;
 import top.fish1000.pymcfabric.PymcMngr;
 import top.fish1000.pymcfabric.executor.NamedAdvancedExecutor;
 
@@ -21,6 +23,12 @@ public abstract class ServerMixin {
     public Profiler profiler;
 
     private GatewayServer startPy4j() {
+        // -Dpymc.clientServer=true 时使用 ClientServer：每个 Python 线程固定对应一个 Java 线程，
+        // 回调中的调用直接在触发回调的线程（如服务器主线程）中执行。Python 端需设置 Connection.client_server
+        if (Boolean.getBoolean("pymc.clientServer")) {
+            ClientServer clientServer = new ClientServer.ClientServerBuilder(new PymcMngr()).build();
+            return clientServer.getJavaServer();
+        }
         GatewayServer gatewayServer = new GatewayServer(new PymcMngr());
         gatewayServer.start();
         return gatewayServer;
@@ -34,6 +42,8 @@ public abstract class ServerMixin {
             PymcMngr.py4jStarted = true;
 
             PymcMngr.executor = new NamedAdvancedExecutor<>(PymcMngr.server::getTicks);
+            EntitySubscriptions.clear();
+            PymcMngr.executor.setNameListener(EntitySubscriptions::update);
         } catch (Exception e) {
             PymcMngr.LOGGER.error("Failed to start py4j server", e);
             return;
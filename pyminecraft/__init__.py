@@ -7,6 +7,15 @@ Link: https://github.com/PyMinecraft/PyMinecraft-Fabric
 from .at import *
 from .javaobj import *
 from .utils import *
+from .cache import *
+from .buffer import *
+from .vec import *
+from .nbt import *
+from .spawn import *
+from .filters import *
+from .metrics import *
+from .refs import *
+from .offload import *
 from .type_dict import AtDict
 
 # 还有些问题…
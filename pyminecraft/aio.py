@@ -0,0 +1,256 @@
+"""
+asyncio 接口
+
+协程在事件循环中运行，不占用服务器线程：执行器回调只负责唤醒等待中的协程，
+py4j 调用在独立的线程池中执行，多个协程的调用可以相互重叠。
+
+    async def main():
+        server = await aio.next_tick()
+        await aio.ticks(20 * 5)
+        await aio.call(server.cmd, "say 5 sec passed")
+
+    aio.run(main())
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+import asyncio
+import threading
+
+from .proxy import JavaObjectProxy
+from .executor import Middleman, NamedAdvancedExecutor
+from .javaobj import PymcMngr, Entity, Server
+from .type_dict import AtDict
+from .connection import get_gateway
+
+__all__ = (
+    "get_loop",
+    "call",
+    "spawn",
+    "run",
+    "next_tick",
+    "ticks",
+    "entity_event",
+    "events",
+)
+
+IO_WORKERS = 8
+"""执行 py4j 调用的线程数"""
+
+
+class _Runtime:
+    """后台事件循环与 py4j 线程池，首次使用时创建"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._io: ThreadPoolExecutor | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """后台事件循环，在守护线程中运行"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="pymc-aio", daemon=True
+                ).start()
+            return self._loop
+
+    @property
+    def io(self) -> ThreadPoolExecutor:
+        """执行 py4j 调用的线程池"""
+        with self._lock:
+            if self._io is None:
+                self._io = ThreadPoolExecutor(IO_WORKERS, thread_name_prefix="pymc-io")
+            return self._io
+
+
+_RUNTIME = _Runtime()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """获取后台事件循环，首次调用时在守护线程中启动"""
+    return _RUNTIME.loop
+
+
+async def call[T](func: Callable[..., T], *args: Any) -> T:
+    """
+    在 py4j 线程池中执行一次同步调用
+
+    Args:
+        func: 要调用的函数，通常为代理对象的方法
+        *args: 参数
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _RUNTIME.io, partial(func, *args)
+    )
+
+
+def spawn[T](coro: Coroutine[Any, Any, T]) -> Future[T]:
+    """在后台事件循环中运行协程，立即返回"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run[T](coro: Coroutine[Any, Any, T]) -> T:
+    """在后台事件循环中运行协程，并阻塞等待其结果"""
+    return spawn(coro).result()
+
+
+def _executor() -> NamedAdvancedExecutor:
+    return PymcMngr.from_gateway(get_gateway()).executor
+
+
+def _middleman[T: JavaObjectProxy](
+    func: Callable[[T, AtDict], None], arg_type: type[T]
+) -> Middleman[T]:
+    gateway = get_gateway()
+    return Middleman(func, lambda obj: arg_type.wrap(obj, gateway), AtDict())
+
+
+def _resolve(fut: asyncio.Future, value: Any) -> None:
+    if not fut.done():
+        fut.set_result(value)
+
+
+def _fail(fut: asyncio.Future, exc: BaseException) -> None:
+    if not fut.done():
+        fut.set_exception(exc)
+
+
+def _wake(loop: asyncio.AbstractEventLoop, fut: asyncio.Future, value: Any) -> None:
+    """从回调线程唤醒等待者，事件循环已关闭时忽略"""
+    try:
+        loop.call_soon_threadsafe(_resolve, fut, value)
+    except RuntimeError:
+        pass
+
+
+async def _wait_once[T: JavaObjectProxy](
+    register: Callable[[Middleman[T]], int], arg_type: type[T]
+) -> T:
+    """注册一个只触发一次的任务并等待，被取消时同时移除任务"""
+    loop = asyncio.get_running_loop()
+    fut: asyncio.Future[T] = loop.create_future()
+    middleman = _middleman(lambda obj, _data: _wake(loop, fut, obj), arg_type)
+    task_id = await call(register, middleman)
+    try:
+        return await fut
+    except asyncio.CancelledError:
+        _RUNTIME.io.submit(lambda: _executor().remove(task_id))
+        raise
+
+
+class _TickWaiters:
+    """
+    共享的下一 tick 等待队列
+
+    有等待者时只在 Java 端保留一个一次性任务，触发后唤醒全部等待者
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._armed = False
+
+    async def wait(self) -> Server:
+        """等待下一个 tick"""
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[Server] = loop.create_future()
+        with self._lock:
+            self._waiters.append((loop, fut))
+            arm = not self._armed
+            self._armed = True
+        if arm:
+            try:
+                await call(
+                    lambda: _executor().push_once(_middleman(self.fire, Server), "tick")
+                )
+            except Exception as e:
+                for waiter_loop, waiter in self._take():
+                    waiter_loop.call_soon_threadsafe(_fail, waiter, e)
+                raise
+        return await fut
+
+    def _take(self) -> list[tuple[asyncio.AbstractEventLoop, asyncio.Future]]:
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+            self._armed = False
+        return waiters
+
+    def fire(self, server: Server, _data: AtDict) -> None:
+        """唤醒全部等待者，由 Java 端的一次性任务在 tick 时调用"""
+        for loop, fut in self._take():
+            _wake(loop, fut, server)
+
+
+_TICK_WAITERS = _TickWaiters()
+
+
+def next_tick() -> Awaitable[Server]:
+    """等待下一个 tick，返回服务器对象"""
+    return _TICK_WAITERS.wait()
+
+
+async def ticks(n: int) -> Server:
+    """
+    等待 n 个 tick
+
+    Args:
+        n (int): tick 数，小于 1 时等同于 next_tick()
+    """
+    if n < 1:
+        return await next_tick()
+    return await _wait_once(lambda m: _executor().push_scheduled(n, m, "tick"), Server)
+
+
+async def entity_event(entity: Entity | str, action: str = "interact") -> Entity:
+    """
+    等待实体事件
+
+    Args:
+        entity: 实体或实体名称
+        action (str): 事件类型，如 "interact"、"tick"、"removed"
+    """
+    key = entity if isinstance(entity, str) else await call(lambda: entity.uuid)
+    name = f"entity {action} {key}"
+    return await _wait_once(lambda m: _executor().push_once(m, name), Entity)
+
+
+async def events[T: JavaObjectProxy](
+    name: str, arg_type: type[T] = JavaObjectProxy, maxsize: int = 0
+) -> AsyncIterator[T]:
+    """
+    持续接收事件
+
+    迭代期间在 Java 端保留一个连续任务，迭代结束（break 或 aclose()）时移除。
+
+    Args:
+        name (str): 事件名称，如 "tick"、"entity tick Creeper"
+        arg_type: 事件对象的代理类型
+        maxsize (int): 队列长度上限，队列满时丢弃最旧的事件；0 表示不限
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[T] = asyncio.Queue(maxsize)
+
+    def offer(obj: T) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(obj)
+
+    def put(obj: T, _data: AtDict) -> None:
+        try:
+            loop.call_soon_threadsafe(offer, obj)
+        except RuntimeError:
+            pass
+
+    middleman = _middleman(put, arg_type)
+    task_id = await call(lambda: _executor().push_continuous(middleman, name))
+    try:
+        while True:
+            yield await queue.get()
+    finally:
+        _RUNTIME.io.submit(lambda: _executor().remove(task_id))
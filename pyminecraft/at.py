@@ -2,21 +2,22 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Self, override
+from typing import Any, Callable, Generator, Self, override
 from functools import wraps
-from abc import ABC
+from abc import ABC, abstractmethod
 from enum import Enum
+import inspect
+import uuid
 
 from .utils import LOGGER
-from .javaobj import (
-    JavaObjectProxy,
+from .proxy import JavaObjectProxy
+from .executor import (
     NamedAdvancedExecutor,
     Middleman,
-    Entity,
-    Server,
-    PymcMngr,
+    ResumableMiddleman,
     CallbackFunction,
 )
+from .javaobj import Entity, Server, PymcMngr
 from .type_dict import AtDict
 from .connection import get_gateway
 
@@ -28,8 +29,14 @@ __all__ = (
     "AtEntityTick",
     "Running",
     "After",
+    "Every",
     "MaxTimes",
+    "Priority",
     "Data",
+    "Filter",
+    "AllOf",
+    "AnyOf",
+    "Not",
 )
 
 
@@ -60,6 +67,11 @@ class DecoratorBase[T: JavaObjectProxy](ABC):
 
         return self.wrapped
 
+    @property
+    def generator(self) -> bool:
+        """被装饰的函数是否为生成器函数"""
+        return inspect.isgeneratorfunction(self.func)
+
     def _get_wrapper(self) -> CallbackFunction[T]:
         """
         创建包装函数，处理函数调用逻辑。
@@ -67,6 +79,8 @@ class DecoratorBase[T: JavaObjectProxy](ABC):
         Returns:
             CallbackFunctionBase: 包装后的函数
         """
+        if self.generator:
+            return self._get_generator_wrapper()
 
         @wraps(self.func)
         def wrapper(obj: T, data: AtDict) -> None:
@@ -76,6 +90,46 @@ class DecoratorBase[T: JavaObjectProxy](ABC):
 
         return wrapper
 
+    def _get_generator_wrapper(self) -> Callable[[T, AtDict], int]:
+        """
+        为生成器函数创建包装函数。
+
+        生成器中 yield n 挂起 n 个tick（不带值时为1），恢复时 yield 表达式的值为新的事件对象。
+        包装函数返回挂起的tick数，由Java端等待；生成器结束时返回 _generator_done() 的结果。
+        同一时间只有一个生成器，因此只能用于来自单个对象的事件，见 At.single_source
+
+        Returns:
+            包装后的函数
+        """
+        gen: Generator[int | None, T, None] | None = None
+
+        @wraps(self.func)
+        def wrapper(obj: T, data: AtDict) -> int:
+            nonlocal gen
+            try:
+                if gen is not None:
+                    sleep = gen.send(obj)
+                elif self._modify_before_run(obj):
+                    gen = self.func(obj, data)
+                    sleep = next(gen)
+                else:
+                    return self._generator_done()
+            except StopIteration:
+                gen = None
+                self._modify_after_run(obj)
+                return self._generator_done()
+            return 1 if sleep is None else sleep
+
+        return wrapper
+
+    def _generator_done(self) -> int:
+        """
+        生成器结束后挂起的tick数，小于0表示移除任务。
+
+        可以被子类重写以实现特定逻辑。
+        """
+        return -1
+
     def _modify_when_def(self) -> None:
         """
         在装饰器定义时执行的修改操作。
@@ -106,7 +160,6 @@ class At[T: JavaObjectProxy](DecoratorBase[T]):
 
     at: str
     data: AtDict
-    executor: NamedAdvancedExecutor
     arg_type: type[T]
     running: Running
 
@@ -133,9 +186,13 @@ class At[T: JavaObjectProxy](DecoratorBase[T]):
             _ = self & Running.once()
 
         self.data[type(self)] = self
-        self.executor = PymcMngr.from_gateway(get_gateway()).executor
         self.arg_type = arg_type
 
+    @property
+    def executor(self) -> NamedAdvancedExecutor:
+        """执行器，第一次使用时才连接"""
+        return PymcMngr.from_gateway(get_gateway()).executor
+
     def __and__(self, other: AtFlag) -> Self:
         """
         支持 & 操作符，用于添加标志到装饰器。
@@ -146,6 +203,17 @@ class At[T: JavaObjectProxy](DecoratorBase[T]):
         Returns:
             AbstractAt: 返回自身
         """
+        if isinstance(other, Filter):
+            # 过滤标志统一存放在 Filter 键下，多个过滤标志需全部满足
+            existing = self.data.get(Filter)
+            if existing is None:
+                self.data[Filter] = other
+            elif isinstance(existing, AllOf):
+                self.data[Filter] = AllOf(*existing.filters, other)
+            else:
+                self.data[Filter] = AllOf(existing, other)
+            return self
+
         self.data[type(other)] = other
 
         if isinstance(other, Running):
@@ -166,15 +234,54 @@ class At[T: JavaObjectProxy](DecoratorBase[T]):
         self(other)
         return self
 
+    @property
+    def event_filter(self) -> str | None:
+        """
+        全部过滤标志合并后的触发条件，在注册时交给Java端执行器。
+
+        Returns:
+            str | None: 编译后的条件，没有过滤标志时为None
+        """
+        flag = self.data.get(Filter)
+        return None if flag is None else flag.compile()
+
+    @property
+    def priority(self) -> int:
+        """
+        Priority标志指定的优先级，没有时为0。
+
+        Returns:
+            int: 优先级
+        """
+        flag = self.data.get(Priority)
+        return 0 if flag is None else flag.priority
+
+    @property
+    def single_source(self) -> bool:
+        """
+        事件是否只来自一个对象
+
+        实体事件只有指定 UUID 时来自单个实体，不指定实体或按名称指定时来自多个实体
+        """
+        kind, _, rest = self.at.partition(" ")
+        if kind != "entity":
+            return True
+        try:
+            uuid.UUID(rest.partition(" ")[2])
+        except ValueError:
+            return False
+        return True
+
     def get_middleman(self) -> Middleman:
         """
         创建Middleman实例用于Java回调。
 
         Returns:
-            Middleman: 中间人实例
+            Middleman: 中间人实例，生成器函数使用可挂起的中间人
         """
-        return Middleman(
-            self.wrapped, lambda obj: self.arg_type(obj, get_gateway()), self.data
+        middleman = ResumableMiddleman if self.generator else Middleman
+        return middleman(
+            self.wrapped, lambda obj: self.arg_type.wrap(obj, get_gateway()), self.data
         )
 
     def cancel(self) -> None:
@@ -182,6 +289,12 @@ class At[T: JavaObjectProxy](DecoratorBase[T]):
         self.running.on_cancel(self)
 
     def _modify_when_def(self) -> None:
+        if self.generator and not self.single_source:
+            # 所有事件共用一个生成器，另一个实体的事件会恢复前一个实体开始的生成器
+            raise TypeError(
+                f"Generator functions need events from a single source, "
+                f"but {self.at!r} is fired by several entities"
+            )
         for flag_type in self.data:
             if issubclass(flag_type, AtFlag):
                 self.data[flag_type].on_define(self)
@@ -193,6 +306,9 @@ class At[T: JavaObjectProxy](DecoratorBase[T]):
                 self.data[flag_type].on_after_run(self)
         self.running.on_after_run_running(self)
 
+    def _generator_done(self) -> int:
+        return self.running.on_generator_done(self)
+
     def _modify_before_run(self, obj: T) -> bool:
         run = True
         for flag_type in self.data:
@@ -323,6 +439,70 @@ class AtFlag(ABC):
         decorator.data[Running].status = RunningStatus.NEVER
 
 
+class Filter(AtFlag):
+    """
+    过滤标志基类，在Java端判断是否触发回调。
+
+    不满足条件的事件不会调用Python，与 on_before_run 相比省去了一次跨语言调用。
+    过滤标志之间可以用 &、|、~ 组合；同一装饰器上的多个过滤标志需全部满足。
+    """
+
+    @abstractmethod
+    def compile(self) -> str:
+        """编译为Java端 EventFilters 解析的S表达式"""
+
+    def __and__(self, other: Filter) -> Filter:
+        return AllOf(self, other)
+
+    def __or__(self, other: Filter) -> Filter:
+        return AnyOf(self, other)
+
+    def __invert__(self) -> Filter:
+        return Not(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.compile()})"
+
+
+class AllOf(Filter):
+    """全部条件都满足"""
+
+    filters: tuple[Filter, ...]
+
+    def __init__(self, *filters: Filter) -> None:
+        self.filters = filters
+
+    @override
+    def compile(self) -> str:
+        return f"(and {' '.join(f.compile() for f in self.filters)})"
+
+
+class AnyOf(Filter):
+    """任一条件满足"""
+
+    filters: tuple[Filter, ...]
+
+    def __init__(self, *filters: Filter) -> None:
+        self.filters = filters
+
+    @override
+    def compile(self) -> str:
+        return f"(or {' '.join(f.compile() for f in self.filters)})"
+
+
+class Not(Filter):
+    """条件不满足"""
+
+    filter: Filter
+
+    def __init__(self, inner: Filter) -> None:
+        self.filter = inner
+
+    @override
+    def compile(self) -> str:
+        return f"(not {self.filter.compile()})"
+
+
 class Running(AtFlag):
     """运行标志，控制装饰器的执行行为。"""
 
@@ -348,17 +528,45 @@ class Running(AtFlag):
         self.status = status
         self._id = None
 
+    def push_generator(self, decorator: At, delay: int = 0) -> None:
+        """
+        生成器函数只注册一个连续任务，挂起与恢复都由执行器处理
+
+        Args:
+            delay (int): 首次执行前等待的tick数
+        """
+        LOGGER.info("push_continuous(generator) %s", decorator.wrapped.__name__)
+        self._id = decorator.executor.push_continuous(
+            decorator.get_middleman(),
+            decorator.at,
+            delay,
+            event_filter=decorator.event_filter,
+            priority=decorator.priority,
+        )
+
+    def on_generator_done(self, _decorator: At) -> int:
+        """生成器结束后挂起的tick数，ALWAYS 时在下一次事件重新开始，否则移除任务"""
+        return 0 if self.status == RunningStatus.ALWAYS else -1
+
     def on_define_running(self, decorator: At) -> None:
         """在定义时的运行"""
-        if self.status == RunningStatus.ALWAYS:
+        if decorator.generator and self.status != RunningStatus.NEVER:
+            self.push_generator(decorator)
+        elif self.status == RunningStatus.ALWAYS:
             LOGGER.info("push_continuous %s", decorator.wrapped.__name__)
             self._id = decorator.executor.push_continuous(
-                decorator.get_middleman(), decorator.at
+                decorator.get_middleman(),
+                decorator.at,
+                event_filter=decorator.event_filter,
+                priority=decorator.priority,
             )
         elif self.status == RunningStatus.ONCE:
             LOGGER.info("push_once %s", decorator.wrapped.__name__)
             self._id = decorator.executor.push_once(
-                decorator.get_middleman(), decorator.at
+                decorator.get_middleman(),
+                decorator.at,
+                event_filter=decorator.event_filter,
+                priority=decorator.priority,
             )
         elif self.status == RunningStatus.NEVER:
             pass
@@ -402,17 +610,27 @@ class After(Running):
 
     @override
     def on_define_running(self, decorator: At) -> None:
-        if self.status == RunningStatus.ALWAYS:
+        if decorator.generator and self.status != RunningStatus.NEVER:
+            self.push_generator(decorator, self.after)
+        elif self.status == RunningStatus.ALWAYS:
             LOGGER.info(
                 "push_scheduled(Ready to repeat) %s", decorator.wrapped.__name__
             )
-            decorator.executor.push_scheduled(
-                self.after, decorator.get_middleman(), decorator.at
+            self._id = decorator.executor.push_scheduled(
+                self.after,
+                decorator.get_middleman(),
+                decorator.at,
+                event_filter=decorator.event_filter,
+                priority=decorator.priority,
             )
         elif self.status == RunningStatus.ONCE:
             LOGGER.info("push_scheduled(Just once) %s", decorator.wrapped.__name__)
-            decorator.executor.push_scheduled(
-                self.after, decorator.get_middleman(), decorator.at
+            self._id = decorator.executor.push_scheduled(
+                self.after,
+                decorator.get_middleman(),
+                decorator.at,
+                event_filter=decorator.event_filter,
+                priority=decorator.priority,
             )
         elif self.status == RunningStatus.NEVER:
             pass
@@ -423,11 +641,67 @@ class After(Running):
 
     @override
     def on_after_run_running(self, decorator: At) -> None:
-        if self.status == RunningStatus.ALWAYS:
-            decorator.executor.push_scheduled(
-                self.after, decorator.get_middleman(), decorator.at
+        if self.status == RunningStatus.ALWAYS and not decorator.generator:
+            self._id = decorator.executor.push_scheduled(
+                self.after,
+                decorator.get_middleman(),
+                decorator.at,
+                event_filter=decorator.event_filter,
+                priority=decorator.priority,
             )
 
+    @override
+    def on_generator_done(self, _decorator: At) -> int:
+        return self.after if self.status == RunningStatus.ALWAYS else -1
+
+
+class Every(Running):
+    """
+    Every标志，每 n 个tick执行一次。
+
+    只注册一次，由Java端在每次执行后自行排入下一周期。
+    未指定 offset 时，同周期的任务依次分配不同的相位，避免集中在同一tick执行。
+
+    Attributes:
+        n (int): 周期（tick）
+        offset (int | None): 相位，在 tick % n == offset 时执行
+    """
+
+    n: int
+    offset: int | None
+
+    def __init__(self, n: int, offset: int | None = None) -> None:
+        """
+        初始化Every标志。
+
+        Args:
+            n (int): 周期（tick）
+            offset (int | None, optional): 相位。默认为None，自动分配
+        """
+        if n <= 0:
+            raise ValueError(f"n must be positive: {n}")
+        super().__init__(RunningStatus.ALWAYS)
+        self.n = n
+        self.offset = offset
+
+    @override
+    def on_define_running(self, decorator: At) -> None:
+        if decorator.generator:
+            self.push_generator(decorator)
+            return
+        LOGGER.info("push_interval(%d) %s", self.n, decorator.wrapped.__name__)
+        self._id = decorator.executor.push_interval(
+            self.n if self.offset is None else (self.n, self.offset),
+            decorator.get_middleman(),
+            decorator.at,
+            event_filter=decorator.event_filter,
+            priority=decorator.priority,
+        )
+
+    @override
+    def on_generator_done(self, _decorator: At) -> int:
+        return self.n
+
 
 class MaxTimes(AtFlag):
     """
@@ -466,6 +740,12 @@ class MaxTimes(AtFlag):
     def on_before_run(self, _decorator: At, _obj: JavaObjectProxy) -> bool:
         return self.step()
 
+    @override
+    def on_after_run(self, decorator: At) -> None:
+        # 次数用尽后取消任务，Java端不再调用，回调随即释放
+        if self.stopped:
+            decorator.cancel()
+
     @property
     def stopped(self) -> bool:
         """任务是否已停止"""
@@ -482,6 +762,29 @@ class MaxTimes(AtFlag):
         return self.times_left == self.times_all
 
 
+class Priority(AtFlag):
+    """
+    优先级标志。
+
+    同一事件的任务按优先级从高到低执行；优先级小于0的一次性与计划任务
+    在本tick的时间预算（NamedAdvancedExecutor.tick_budget）用尽时推迟执行。
+
+    Attributes:
+        priority (int): 优先级，默认任务为0
+    """
+
+    priority: int
+
+    def __init__(self, priority: int) -> None:
+        """
+        初始化优先级标志。
+
+        Args:
+            priority (int): 优先级
+        """
+        self.priority = priority
+
+
 class Data(AtFlag):
     """直接向 data 添加数据"""
 
@@ -0,0 +1,278 @@
+"""写后缓冲"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Protocol, TYPE_CHECKING
+import struct
+import threading
+
+from .cache import READ_CACHE
+from .metrics import CALL_METRICS
+from .nbt import dumps
+from .utils import LOGGER
+
+if TYPE_CHECKING:
+    from py4j.java_gateway import JavaGateway
+
+__all__ = ("WriteBuffer", "WRITE_BUFFER", "flush")
+
+# 操作码，与 Java 端 top.fish1000.pymcfabric.Mutations 保持一致
+OP_SET_POS = 1
+OP_SET_VELOCITY = 2
+OP_SET_YAW = 3
+OP_SET_PITCH = 4
+OP_NBT_PUT = 5
+OP_INVOKE = 6
+
+# NBT_PUT 的值类型
+NBT_ENCODED = 1
+NBT_REF = 2
+
+# INVOKE 的参数类型
+ARG_NULL = 0
+ARG_REF = 1
+ARG_BOOL = 2
+ARG_INT = 3
+ARG_LONG = 4
+ARG_DOUBLE = 5
+ARG_STRING = 6
+ARG_BYTES = 7
+
+INT_MIN = -(2**31)
+INT_MAX = 2**31 - 1
+
+
+class BufferTarget(Protocol):
+    """可以被缓冲写入的 Java 对象代理"""
+
+    @property
+    def target_id(self) -> str:
+        """py4j 中Java对象的id"""
+
+    @property
+    def gateway(self) -> JavaGateway:
+        """Java对象对应的JavaGateway"""
+
+
+def pack_string(value: str) -> bytes:
+    """小端 int32 长度 + UTF-8"""
+    data = value.encode("utf-8")
+    return struct.pack("<i", len(data)) + data
+
+
+def pack_nbt_value(value: Any) -> bytes:
+    """
+    编码 NBT_PUT 的值：Java 端 NBT 对象按 id 引用，其余编码为二进制 NBT
+
+    Raises:
+        TypeError: 值无法编码为 NBT
+    """
+    target_id = getattr(value, "target_id", "")
+    if target_id:
+        return struct.pack("<b", NBT_REF) + pack_string(target_id)
+    data = dumps({"": value})
+    return struct.pack("<bi", NBT_ENCODED, len(data)) + data
+
+
+def pack_arg(arg: Any) -> bytes | None:
+    """
+    编码 INVOKE 的一个参数，类型转换与 py4j 一致（int 超出 int32 时为 long）
+
+    Returns:
+        bytes | None: 编码结果，无法编码（需要同步调用）时为None
+    """
+    if arg is None:
+        packed = struct.pack("<b", ARG_NULL)
+    elif isinstance(arg, bool):
+        packed = struct.pack("<b?", ARG_BOOL, arg)
+    elif isinstance(arg, int):
+        if INT_MIN <= arg <= INT_MAX:
+            packed = struct.pack("<bi", ARG_INT, arg)
+        else:
+            packed = struct.pack("<bq", ARG_LONG, arg)
+    elif isinstance(arg, float):
+        packed = struct.pack("<bd", ARG_DOUBLE, arg)
+    elif isinstance(arg, str):
+        packed = struct.pack("<b", ARG_STRING) + pack_string(arg)
+    elif isinstance(arg, (bytes, bytearray)):
+        packed = struct.pack("<bi", ARG_BYTES, len(arg)) + bytes(arg)
+    else:
+        # JavaObject 直接带有 _target_id，JavaObjectProxy 通过 target_id 属性获取
+        target_id = getattr(arg, "_target_id", None) or getattr(arg, "target_id", None)
+        if not isinstance(target_id, str) or not target_id:
+            return None
+        packed = struct.pack("<b", ARG_REF) + pack_string(target_id)
+    return packed
+
+
+def pack_invoke(method: str, args: Iterable[Any]) -> bytes | None:
+    """
+    编码 INVOKE 的参数：方法名、参数个数 (int32)、各参数
+
+    Returns:
+        bytes | None: 编码结果，有参数无法编码时为None
+    """
+    args = tuple(args)
+    out = bytearray(pack_string(method))
+    out += struct.pack("<i", len(args))
+    for arg in args:
+        packed = pack_arg(arg)
+        if packed is None:
+            return None
+        out += packed
+    return bytes(out)
+
+
+class WriteBuffer:
+    """
+    写后缓冲
+
+    启用后，回调期间实体的位置、速度、朝向 setter 与 NbtCompound.put
+    只在本地记录，回调返回时经由 PymcMngr.applyMutations 一次提交。
+    在有待提交写入的对象上（或以其为参数）进行同步调用前会先提交，
+    因此单个对象上的操作顺序不变；跨对象的先写后读（如写实体后执行命令）
+    需要手动调用 flush()。缓冲按线程隔离，默认关闭。
+
+    另外启用 enable_calls() 后，回调期间无返回值的调用（ret=None，如 send_command、
+    日志）也以 INVOKE 操作缓冲，直到下一次同步调用（任意对象）或回调返回时一并提交，
+    连续 N 次无返回值的调用只需一次往返。其错误在提交时抛出或在回调返回时记录。
+    """
+
+    enabled: bool
+    calls_enabled: bool
+    _local: threading.local
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.calls_enabled = False
+        self._local = threading.local()
+
+    def enable(self, enabled: bool = True) -> None:
+        """启用或关闭缓冲，关闭前请先 flush()"""
+        self.enabled = enabled
+
+    def enable_calls(self, enabled: bool = True) -> None:
+        """启用或关闭无返回值调用的缓冲，关闭前请先 flush()"""
+        self.calls_enabled = enabled
+
+    def enter(self) -> None:
+        """进入回调"""
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+
+    def exit(self) -> None:
+        """离开回调，最外层回调返回时提交缓冲区"""
+        self._local.depth -= 1
+        if self._local.depth == 0 and self.pending:
+            try:
+                self.flush()
+            except RuntimeError as e:
+                LOGGER.error(e)
+
+    @property
+    def active(self) -> bool:
+        """当前线程的写入是否会被缓冲"""
+        return self.enabled and getattr(self._local, "depth", 0) > 0
+
+    @property
+    def pipelined(self) -> bool:
+        """当前线程无返回值的调用是否会被缓冲"""
+        return self.calls_enabled and getattr(self._local, "depth", 0) > 0
+
+    @property
+    def pending(self) -> bool:
+        """当前线程是否有待提交的写入"""
+        return bool(getattr(self._local, "data", None))
+
+    def has(self, target_id: str) -> bool:
+        """某个对象是否有待提交的写入"""
+        targets: set[str] | None = getattr(self._local, "targets", None)
+        return bool(targets) and target_id in targets
+
+    def sync(self, target_id: str) -> None:
+        """
+        同步调用前调用：对象有待提交的写入，或有任何待提交的 INVOKE 时先提交
+
+        Raises:
+            RuntimeError: 之前缓冲的写入或调用执行失败
+        """
+        if getattr(self._local, "invokes", False) or self.has(target_id):
+            self.flush()
+
+    def record_call(
+        self, target: BufferTarget, method: str, args: Iterable[Any]
+    ) -> bool:
+        """
+        缓冲一次无返回值的调用
+
+        Returns:
+            bool: 是否已缓冲，参数无法编码时返回False，需要同步调用
+        """
+        args = tuple(args)
+        payload = pack_invoke(method, args)
+        if payload is None:
+            return False
+        # 参数中的 JavaObject 与代理对象按 id 引用，一并保持引用直到提交
+        self.record(target, OP_INVOKE, payload, args)
+        self._local.invokes = True
+        return True
+
+    def record(
+        self, target: BufferTarget, op: int, payload: bytes, refs: Iterable[Any] = ()
+    ) -> None:
+        """
+        记录一次写入
+
+        被写入的对象与 refs 在提交前保持引用，避免其被回收后 py4j 通知Java端释放，
+        提交时按 id 找不到对象。
+
+        Args:
+            target: 被写入的对象
+            op (int): 操作码
+            payload (bytes): 已编码的参数
+            refs: 参数中按 id 引用的对象
+        """
+        local = self._local
+        if not getattr(local, "data", None):
+            local.data = bytearray()
+            local.targets = set()
+            local.keep = []
+        local.keep.append(target)
+        local.keep.extend(refs)
+        target_id = target.target_id
+        local.gateway = target.gateway
+        local.data.append(op)
+        local.data += pack_string(target_id)
+        local.data += payload
+        local.targets.add(target_id)
+        READ_CACHE.invalidate(target_id)
+
+    def flush(self) -> None:
+        """
+        提交当前线程缓冲的全部写入
+
+        Raises:
+            RuntimeError: 部分写入在 Java 端执行失败，其余写入仍然生效
+        """
+        local = self._local
+        data: bytearray | None = getattr(local, "data", None)
+        if not data:
+            return
+        # 先清空，避免提交过程中的调用再次触发提交；引用的对象保留到提交完成
+        keep: list[Any] = local.keep
+        local.data = bytearray()
+        local.targets = set()
+        local.keep = []
+        local.invokes = False
+        CALL_METRICS.count()
+        errors: str = local.gateway.entry_point.applyMutations(bytes(data))
+        del keep
+        if errors:
+            raise RuntimeError(f"Failed to apply buffered writes:\n{errors}")
+
+
+WRITE_BUFFER = WriteBuffer()
+
+
+def flush() -> None:
+    """提交当前线程缓冲的全部写入"""
+    WRITE_BUFFER.flush()
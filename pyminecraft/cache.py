@@ -0,0 +1,226 @@
+"""读缓存"""
+
+from typing import Any, Callable
+import threading
+import weakref
+
+__all__ = (
+    "ReadCache",
+    "READ_CACHE",
+    "MemberCache",
+    "MEMBER_CACHE",
+    "ProxyTable",
+    "PROXY_TABLE",
+)
+
+
+class ReadCache:
+    """
+    按 tick 失效的读缓存
+
+    启用后，回调内对同一 Java 对象同一属性的重复读取只访问一次 JVM。
+    缓存键为 (py4j 对象 id, 读取路径)；执行器进入新的 tick 时全部失效，
+    通过同一对象调用无返回值的方法（setter）时该对象的缓存失效。
+    只在 Middleman 执行回调期间生效，默认关闭。可以在多个回调线程中同时使用。
+    """
+
+    enabled: bool
+    tick: int | None
+    _entries: dict[str, dict[str, Any]]
+    # 每次清空或失效时加一，读取期间发生过失效的值不写入缓存
+    _generation: int
+    _lock: threading.Lock
+    _local: threading.local
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.tick = None
+        self._entries = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, enabled: bool = True) -> None:
+        """启用或关闭缓存"""
+        self.enabled = enabled
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def enter(self, tick: int) -> None:
+        """进入回调，tick 变化时清空缓存"""
+        with self._lock:
+            if tick != self.tick:
+                self.tick = tick
+                self._entries.clear()
+                self._generation += 1
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+
+    def exit(self) -> None:
+        """离开回调"""
+        self._local.depth -= 1
+
+    @property
+    def active(self) -> bool:
+        """当前线程是否正在使用缓存"""
+        return self.enabled and getattr(self._local, "depth", 0) > 0
+
+    def get[T](self, target: str, key: str, compute: Callable[[], T]) -> T:
+        """读取缓存，未命中时调用 compute 并写入；compute 在锁外执行"""
+        with self._lock:
+            entries = self._entries.get(target)
+            if entries is not None and key in entries:
+                return entries[key]
+            generation = self._generation
+        value = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._entries.setdefault(target, {})[key] = value
+        return value
+
+    def put(self, target: str, key: str, value: Any) -> None:
+        """写入缓存，未在使用缓存时忽略"""
+        if self.active:
+            with self._lock:
+                self._entries.setdefault(target, {})[key] = value
+
+    def invalidate(self, target: str) -> None:
+        """使某个对象的缓存失效"""
+        with self._lock:
+            self._entries.pop(target, None)
+            self._generation += 1
+
+
+READ_CACHE = ReadCache()
+
+
+class MemberCache:
+    """
+    Java 成员查找缓存
+
+    py4j 开启 auto_field 时，每个新的 Java 对象第一次访问某个名称都要先询问 JVM
+    该名称是否为字段；gateway.jvm 按类名查找类也需要一次反射往返。
+    启用后按 (代理类, 方法名) 记录已确认的方法，新对象直接创建方法而不再询问；
+    按类名缓存静态方法、构造函数与类引用。
+    两类缓存均有大小上限，方法记录按写入顺序淘汰，静态成员按最近最少使用淘汰；
+    网关变化（重新连接）时全部失效。可以在多个线程中同时使用。
+    """
+
+    MAX_SIZE = 1024
+
+    enabled: bool
+    _gateway: Any
+    _methods: dict[tuple[type, str], bool]
+    _statics: dict[str, Any]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self._gateway = None
+        self._methods = {}
+        self._statics = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True) -> None:
+        """启用或关闭缓存"""
+        self.enabled = enabled
+        self.clear()
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._methods.clear()
+            self._statics.clear()
+
+    def bind(self, gateway: Any) -> bool:
+        """
+        切换到 gateway，与之前的网关不同时清空缓存
+
+        Returns:
+            bool: 缓存是否可用
+        """
+        if gateway is not self._gateway:
+            self.clear()
+            self._gateway = gateway
+        return self.enabled
+
+    def is_method(self, gateway: Any, key: tuple[type, str]) -> bool:
+        """key 是否已确认为方法"""
+        return self.bind(gateway) and key in self._methods
+
+    def add_method(self, key: tuple[type, str]) -> None:
+        """记录 key 为方法"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._methods[key] = True
+            if len(self._methods) > self.MAX_SIZE:
+                del self._methods[next(iter(self._methods))]
+
+    def static(self, gateway: Any, name: str, compute: Callable[[], Any]) -> Any:
+        """读取类名对应的静态成员或类引用，未命中时调用 compute 并写入"""
+        if not self.bind(gateway):
+            return compute()
+        with self._lock:
+            value = self._statics.pop(name, None)
+            if value is not None:
+                self._statics[name] = value
+                return value
+        # 查找需要与 JVM 往返，不持有锁；并发未命中时各自查找，结果相同
+        value = compute()
+        with self._lock:
+            self._statics.pop(name, None)
+            if len(self._statics) >= self.MAX_SIZE:
+                del self._statics[next(iter(self._statics))]
+            self._statics[name] = value
+        return value
+
+    def stats(self) -> dict[str, int]:
+        """缓存条目数"""
+        return {"methods": len(self._methods), "statics": len(self._statics)}
+
+
+MEMBER_CACHE = MemberCache()
+
+
+class ProxyTable:
+    """
+    代理对象驻留表
+
+    启用后，同一 py4j 对象（相同 target id）以同一代理类包装时返回同一个代理，
+    代理只被弱引用，不再使用时自动移除。py4j 每次返回Java对象都会分配新的 target id，
+    因此只合并对同一 py4j 对象的重复包装。网关变化（重新连接）时清空。默认关闭。
+    """
+
+    enabled: bool
+    _gateway: Any
+    _proxies: weakref.WeakValueDictionary[tuple[type, str], Any]
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._gateway = None
+        self._proxies = weakref.WeakValueDictionary()
+
+    def enable(self, enabled: bool = True) -> None:
+        """启用或关闭驻留"""
+        self.enabled = enabled
+        self._proxies.clear()
+
+    def intern[T](
+        self, gateway: Any, cls: type[T], target_id: str, create: Callable[[], T]
+    ) -> T:
+        """读取 (cls, target_id) 对应的代理，不存在时调用 create 并写入"""
+        if gateway is not self._gateway:
+            self._proxies.clear()
+            self._gateway = gateway
+        key = (cls, target_id)
+        proxy = self._proxies.get(key)
+        if proxy is None:
+            proxy = self._proxies[key] = create()
+        return proxy
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+
+PROXY_TABLE = ProxyTable()
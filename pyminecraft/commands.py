@@ -0,0 +1,74 @@
+"""预编译命令与命令批处理"""
+
+from __future__ import annotations
+
+from typing import Self, TYPE_CHECKING
+
+from .proxy import JavaObjectProxy
+
+if TYPE_CHECKING:
+    from .javaobj import Server
+
+__all__ = ("CompiledCommand", "CommandBatch")
+
+
+class CompiledCommand(JavaObjectProxy):
+    """top.fish1000.pymcfabric.CompiledCommand"""
+
+    __slots__ = ()
+
+    @property
+    def command(self) -> str:
+        """命令文本"""
+        return self.get("command", str)
+
+    def run(self) -> int:
+        """执行命令，返回命令的返回值，失败时为0"""
+        return self.call("run", (), int)
+
+
+class CommandBatch:
+    """
+    命令批处理
+
+    在 Python 端缓存命令，flush 时通过一次调用交由 Java 端使用同一个命令源执行
+    """
+
+    server: Server
+    name: str
+    commands: list[str]
+    results: list[int]
+
+    def __init__(self, server: Server, name: str = "PYMC") -> None:
+        self.server = server
+        self.name = name
+        self.commands = []
+        self.results = []
+
+    def cmd(self, command: str) -> Self:
+        """添加一条命令"""
+        if "\n" in command:
+            raise ValueError(f"Command must not contain line breaks: {command!r}")
+        self.commands.append(command)
+        return self
+
+    def say(self, message: str) -> Self:
+        """CommandBatch.cmd("say <message>")"""
+        return self.cmd(f"say {message}")
+
+    def flush(self) -> list[int]:
+        """执行已缓存的命令，返回本次执行的各命令返回值"""
+        results = self.server.mngr.execute_commands(self.commands, self.name)
+        self.commands.clear()
+        self.results.extend(results)
+        return results
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """正常退出时执行全部命令；发生异常时丢弃未执行的命令"""
+        if exc_type is None:
+            self.flush()
+        else:
+            self.commands.clear()
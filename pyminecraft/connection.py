@@ -4,19 +4,77 @@ PyMinecraft Fabric 模块的连接管理模块
 该模块负责管理与Java端的Py4J网关连接，提供连接建立、获取网关实例、
 执行器和工具类等功能。
 同时只有一个网关连接实例存在。
+导入本模块不会连接，第一次调用 get_gateway() 时才导入 py4j 并建立连接。
+
+Connection.client_server 为 True 时使用 py4j 的 ClientServer 线程模型（Java 端需以
+-Dpymc.clientServer=true 启动）：每个 Python 线程固定使用一个连接，Java 端回调在
+发起调用的线程中执行，回调中的调用也直接在触发回调的 Java 线程（如服务器主线程）中执行。
 """
 
+from __future__ import annotations
+
+from typing import Any, TYPE_CHECKING
 import threading
 import time
-from py4j.java_gateway import (
-    JavaGateway,
-    CallbackServerParameters,
-    GatewayParameters,
-    Py4JNetworkError,
-    Py4JJavaError,
-)
 
-from .utils import LOGGER
+from .shm import SharedBuffer
+from .utils import LOGGER, py4j_names
+
+if TYPE_CHECKING:
+    from py4j.java_gateway import JavaGateway, GatewayParameters
+
+
+class CallGate:
+    """
+    限制同时进行的 Python→Java 调用数量
+
+    install 后替换网关客户端的 send_command。同一线程中嵌套的调用（ClientServer 模式下
+    回调在发起调用的线程中执行）与处理Java端回调的线程中的调用不受限制，
+    避免Java端等待回调时互相阻塞。
+    """
+
+    size: int
+    _send_command: Any
+    _client: Any
+    _semaphore: threading.BoundedSemaphore
+    _local: threading.local
+
+    def __init__(self, client: Any, size: int) -> None:
+        """
+        Args:
+            client (GatewayClient): 网关客户端
+            size (int): 同时进行的调用数量上限
+        """
+        self.size = size
+        self._send_command = client.send_command
+        self._client = client
+        self._semaphore = threading.BoundedSemaphore(size)
+        self._local = threading.local()
+
+    def install(self) -> None:
+        """替换网关客户端的 send_command，之后经由该客户端的调用都受限制"""
+        self._client.send_command = self.send_command
+
+    def _serving_java(self) -> bool:
+        """当前线程是否在处理Java端发起的回调"""
+        if isinstance(threading.current_thread(), py4j_names().CallbackConnection):
+            return True
+        get_thread_connection = getattr(self._client, "get_thread_connection", None)
+        if get_thread_connection is None:
+            return False
+        connection = get_thread_connection()
+        return connection is not None and not connection.initiated_from_client
+
+    def send_command(self, *args, **kwargs) -> Any:
+        """获取许可后发送命令"""
+        if getattr(self._local, "held", False) or self._serving_java():
+            return self._send_command(*args, **kwargs)
+        with self._semaphore:
+            self._local.held = True
+            try:
+                return self._send_command(*args, **kwargs)
+            finally:
+                self._local.held = False
 
 
 class Connection:
@@ -25,15 +83,23 @@ class Connection:
 
     使用单例模式确保整个应用中只存在一个连接实例。提供连接、断开连接、
     获取网关实例、执行器和工具类等功能的统一管理。
+    连接状态的修改均持有 _lock，可以在多个线程中同时使用。
     """
 
     _instance: "Connection | None" = None
-    _lock = threading.Lock()
+    _lock = threading.RLock()
     _connected: bool
     _gateway: JavaGateway | None
+    _shared_buffer: SharedBuffer | None
 
     # 全局网关参数配置
     gateway_params: GatewayParameters | None = None
+    # 共享内存大小（字节），为 0 时不启用，批量数据全部经由 py4j 传输
+    shared_buffer_size: int = 0
+    # 是否使用 ClientServer 线程模型，需与Java端一致
+    client_server: bool = False
+    # 同时进行的 Python→Java 调用数量上限（即使用中的连接数），为 0 时不限制
+    pool_size: int = 0
 
     def __new__(cls):
         """确保类的单例实例"""
@@ -44,6 +110,7 @@ class Connection:
                     # 初始化实例变量
                     cls._instance._connected = False
                     cls._instance._gateway = None
+                    cls._instance._shared_buffer = None
         return cls._instance
 
     def connect(self) -> JavaGateway:
@@ -60,19 +127,90 @@ class Connection:
             Py4JNetworkError: 当无法连接到Java网关时抛出
             Py4JJavaError: 当Java端发生错误时抛出
         """
-        if self._connected and self._gateway is not None:
-            LOGGER.warning("Gateway already exists. Returning existing gateway.")
-            return self._gateway
+        with self._lock:
+            if self._connected and self._gateway is not None:
+                LOGGER.warning("Gateway already exists. Returning existing gateway.")
+                return self._gateway
+
+            gateway = (
+                self._create_client_server()
+                if self.client_server
+                else self._create_gateway()
+            )
+            if self.pool_size > 0:
+                # py4j 没有公开网关客户端，回调服务器与网关共用同一个客户端
+                client = gateway.get_callback_server().gateway_client
+                CallGate(client, self.pool_size).install()
+            self._gateway = gateway
+            self._connected = True
+            if self.shared_buffer_size > 0:
+                self.open_shared_buffer(self.shared_buffer_size)
+
+        LOGGER.info("PyMinecraft connected successfully w")
+        return gateway
 
-        self._gateway = JavaGateway(
-            callback_server_parameters=CallbackServerParameters(),
+    def _create_gateway(self) -> JavaGateway:
+        """创建 JavaGateway，Java端回调由回调服务器的线程执行"""
+        names = py4j_names()
+        return names.JavaGateway(
+            callback_server_parameters=names.CallbackServerParameters(),
             auto_field=True,
             gateway_parameters=self.gateway_params,
         )
-        self._connected = True
 
-        LOGGER.info("PyMinecraft connected successfully w")
-        return self._gateway
+    def _create_client_server(self) -> JavaGateway:
+        """创建 ClientServer，每个线程固定使用一个连接，回调在发起调用的线程中执行"""
+        names = py4j_names()
+        params = self.gateway_params
+        if isinstance(params, names.JavaParameters):
+            java_params = params
+        elif params is not None:
+            java_params = names.JavaParameters(
+                address=params.address,
+                port=params.port,
+                auto_field=True,
+                auto_close=params.auto_close,
+                auto_convert=params.auto_convert,
+                ssl_context=params.ssl_context,
+                read_timeout=params.read_timeout,
+                auth_token=params.auth_token,
+            )
+        else:
+            java_params = names.JavaParameters(auto_field=True)
+        # 与 CallbackServerParameters 的默认值一致，未断开的连接不阻止进程退出
+        return names.ClientServer(
+            java_parameters=java_params,
+            python_parameters=names.PythonParameters(daemonize=True),
+        )
+
+    def open_shared_buffer(self, size: int) -> bool:
+        """
+        创建共享内存并让Java端映射，替换之前的共享内存
+
+        Args:
+            size (int): 共享内存大小（字节）
+
+        Returns:
+            bool: 是否成功，失败时批量接口退回 py4j 传输
+        """
+        with self._lock:
+            gateway = self.get_gateway()
+            shared = SharedBuffer.create(size)
+            try:
+                opened = gateway.entry_point.openSharedBuffer(shared.path, size)
+            except py4j_names().Py4JJavaError as e:
+                LOGGER.warning("Java side does not support shared buffer: %s", e)
+                opened = False
+            if self._shared_buffer is not None:
+                with self._shared_buffer.lock:
+                    self._shared_buffer.close()
+                self._shared_buffer = None
+            if not opened:
+                shared.close()
+                return False
+            self._shared_buffer = shared
+        LOGGER.info("Shared buffer opened: %s (%d bytes)", shared.path, size)
+        return True
 
     def disconnect(self) -> None:
         """
@@ -84,18 +222,26 @@ class Connection:
 
             def delayed_disconnect():
                 time.sleep(0.1)  # 延迟0.1秒
-                try:
-                    if self._gateway is not None:
-                        self._gateway.close()
-                        LOGGER.info("Successfully disconnected from Java gateway")
-                    else:
-                        LOGGER.error("Cannot disconnect. Have not connected")
-                except Py4JNetworkError as e:
-                    LOGGER.error("Error while disconnecting from Java gateway: %s", e)
-                finally:
-                    # 在连接关闭后清理全局变量引用
-                    del self._gateway
-                    self._connected = False
+                with self._lock:
+                    try:
+                        if self._gateway is not None:
+                            if self._shared_buffer is not None:
+                                self._gateway.entry_point.closeSharedBuffer()
+                            self._gateway.close()
+                            LOGGER.info("Successfully disconnected from Java gateway")
+                        else:
+                            LOGGER.error("Cannot disconnect. Have not connected")
+                    except py4j_names().Py4JNetworkError as e:
+                        LOGGER.error(
+                            "Error while disconnecting from Java gateway: %s", e
+                        )
+                    finally:
+                        # 在连接关闭后清理全局变量引用
+                        self._gateway = None
+                        self._connected = False
+                        if self._shared_buffer is not None:
+                            self._shared_buffer.close()
+                            self._shared_buffer = None
 
             # 在新线程中执行延迟断开连接
             disconnect_thread = threading.Thread(target=delayed_disconnect, daemon=True)
@@ -122,15 +268,16 @@ class Connection:
             Py4JNetworkError: 当无法连接到Java网关且should_raise=True时抛出
             Py4JJavaError: 当Java端发生错误时抛出
         """
+        names = py4j_names()
         try:
             return self.connect()
-        except Py4JNetworkError:
+        except names.Py4JNetworkError:
             if should_raise:
                 LOGGER.error("Network error: %s", msg)
                 raise
             LOGGER.info(msg)
             return None
-        except Py4JJavaError:
+        except names.Py4JJavaError:
             LOGGER.error(
                 "Something wrong happened in java side while connecting. "
                 "Check whether you are using the the mod in the correct version"
@@ -141,16 +288,19 @@ class Connection:
         """
         获取网关实例（全局访问点）
 
-        如果网关已存在则直接返回，否则尝试建立新连接
+        如果网关已存在则直接返回，否则尝试建立新连接（多个线程同时调用时只连接一次）
 
         Returns:
             JavaGateway: Py4J网关实例
         """
-        if self._gateway is not None:
-            return self._gateway
-        self.try_connect()
-        if self._gateway is not None:
-            return self._gateway
+        gateway = self._gateway
+        if gateway is not None:
+            return gateway
+        with self._lock:
+            if self._gateway is None:
+                self.try_connect()
+            if self._gateway is not None:
+                return self._gateway
         raise RuntimeError("Cannnot connect to the gateway. This should never happen.")
 
     @property
@@ -163,6 +313,16 @@ class Connection:
         """
         return self._connected
 
+    @property
+    def shared_buffer(self) -> SharedBuffer | None:
+        """
+        获取共享内存
+
+        Returns:
+            SharedBuffer | None: 共享内存，未启用时为None
+        """
+        return self._shared_buffer
+
     @property
     def gateway(self) -> JavaGateway | None:
         """
@@ -174,9 +334,8 @@ class Connection:
         return self._gateway
 
 
-# 创建单例实例并尝试连接
+# 创建单例实例，第一次使用时才连接
 _connection = Connection()
-_connection.try_connect(msg="", should_raise=False)
 
 
 def get_gateway() -> JavaGateway:
@@ -189,6 +348,26 @@ def get_gateway() -> JavaGateway:
     return _connection.get_gateway()
 
 
+def open_shared_buffer(size: int) -> bool:
+    """
+    在当前连接上启用共享内存，详见 Connection.open_shared_buffer
+
+    Args:
+        size (int): 共享内存大小（字节）
+    """
+    return _connection.open_shared_buffer(size)
+
+
+def get_shared_buffer() -> SharedBuffer | None:
+    """
+    获取共享内存的全局函数接口
+
+    Returns:
+        SharedBuffer | None: 共享内存，未启用时为None
+    """
+    return _connection.shared_buffer
+
+
 def disconnect() -> None:
     """断开与Java端的连接"""
     _connection.disconnect()
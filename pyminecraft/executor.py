@@ -0,0 +1,355 @@
+"""回调中间人与Java端命名执行器"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, TypeAlias, TypeVar, TYPE_CHECKING
+import time
+
+from .type_dict import AtDict
+from .cache import READ_CACHE
+from .metrics import CALL_METRICS
+from .refs import REFERENCES
+from .buffer import WRITE_BUFFER
+from .proxy import JavaObjectProxy
+
+if TYPE_CHECKING:
+    from py4j.java_gateway import JavaObject
+
+__all__ = ("Middleman", "ResumableMiddleman", "NamedAdvancedExecutor")
+
+V = TypeVar("V", bound=JavaObjectProxy)
+CallbackFunction: TypeAlias = Callable[[V, AtDict], None]
+
+
+def _released(*_args: Any) -> Any:
+    """已释放的 Middleman 的回调函数与包装函数，返回-1使可挂起的任务结束"""
+    return -1
+
+
+class Middleman[T: JavaObjectProxy]:
+    """
+    中间人类，用于在Java和Python之间传递回调函数。
+
+    这个类实现了Java的Consumer接口，作为Java调用Python函数的桥梁。
+    py4j 在Java端回收代理之前一直保留 Middleman，任务移出执行器后由 REFERENCES
+    调用 release 释放回调函数与附加数据，只留下空壳。
+    """
+
+    task_id: int | None = None
+    once: bool = False
+    released: bool = False
+    # 登记在 REFERENCES 中且尚未移出执行器的任务数量，多个任务共用时全部移出后才释放
+    tasks: int = 0
+
+    def __init__(
+        self,
+        func: CallbackFunction[T],
+        handler: Callable[[JavaObject], T],
+        data: AtDict,
+    ) -> None:
+        """
+        初始化Middleman实例。
+
+        Args:
+            func (CallbackFunction): 要被调用的Python回调函数
+            data (TypeDict): 传递给回调函数的额外信息字典
+        """
+        self.func: CallbackFunction[T] = func
+        self.data = data
+        self.handler = handler
+
+    def accept(self, obj: JavaObject) -> None:
+        """
+        Java端调用的方法，用于执行Python回调函数。
+
+        Args:
+            server: Java端传入的服务器对象
+        """
+        self.invoke(obj)
+
+    def invoke(self, obj: JavaObject) -> Any:
+        """
+        执行回调函数并返回其返回值，期间的缓冲写入在返回时提交
+
+        执行耗时与其间的 py4j 调用次数计入 CALL_METRICS
+        """
+        if self.released:
+            return -1
+        token = CALL_METRICS.enter(self.func)
+        start = time.perf_counter_ns()
+        WRITE_BUFFER.enter()
+        try:
+            return self.func(self.handle(obj), self.data)
+        finally:
+            WRITE_BUFFER.exit()
+            CALL_METRICS.exit(token, start)
+            if self.once:
+                REFERENCES.release(self.task_id)
+
+    def release(self) -> None:
+        """释放回调函数、包装函数与附加数据，之后Java端再调用时直接返回"""
+        self.released = True
+        self.func = _released
+        self.handler = _released
+        self.data = AtDict()
+
+    def acceptTicked(  # pylint: disable=invalid-name
+        self, obj: JavaObject, tick: int
+    ) -> None:
+        """
+        Java端调用的方法，同时传入当前tick，用于推进读缓存。
+
+        Args:
+            obj: Java端传入的对象
+            tick (int): 当前服务器tick
+        """
+        READ_CACHE.enter(tick)
+        try:
+            self.accept(obj)
+        finally:
+            READ_CACHE.exit()
+
+    def handle(self, java_object: JavaObject) -> T:
+        """包装JavaObject"""
+        return self.handler(java_object)
+
+    class Java:
+        """标记为实现Java接口"""
+
+        implements = ["top.fish1000.pymcfabric.executor.TickedConsumer"]
+
+
+class ResumableMiddleman[T: JavaObjectProxy](Middleman[T]):
+    """
+    可挂起的中间人，对应Java的ResumableConsumer接口。
+
+    回调函数返回挂起的tick数（小于0表示结束），由Java端执行器负责等待，
+    挂起期间不会调用Python。
+    """
+
+    def resume(self, obj: JavaObject, tick: int) -> int:
+        """
+        Java端调用的方法，执行回调函数并返回挂起的tick数。
+
+        Args:
+            obj: Java端传入的对象
+            tick (int): 当前服务器tick
+        """
+        READ_CACHE.enter(tick)
+        try:
+            sleep = int(self.invoke(obj))
+        finally:
+            READ_CACHE.exit()
+        if sleep < 0:
+            REFERENCES.release(self.task_id)
+        return sleep
+
+    class Java:
+        """标记为实现Java接口"""
+
+        implements = ["top.fish1000.pymcfabric.executor.ResumableConsumer"]
+
+
+class NamedAdvancedExecutor(JavaObjectProxy):
+    """
+    Java高级命名执行器包装类
+
+    对应Java端NamedAdvancedExecutor类，提供更丰富的任务调度功能，
+    包括计划任务、连续任务和一次性任务
+    """
+
+    __slots__ = ()
+
+    def _bind(self, callback: Middleman, task_id: int, once: bool = False) -> int:
+        """
+        记录任务 id 对应的回调函数，用于 metrics() 的统计与任务结束后释放回调
+
+        Args:
+            once (bool): 任务是否执行一次后即移出执行器
+        """
+        CALL_METRICS.bind(task_id, callback.func)
+        callback.task_id = task_id
+        callback.once = once
+        REFERENCES.bind(self, task_id, callback)
+        return task_id
+
+    def bind_shared(self, callback: Middleman, task_ids: Iterable[int]) -> None:
+        """
+        记录Java端为同一回调创建的多个任务（如 World.summon_many 的 on_removed），
+        全部任务移出执行器后释放回调
+        """
+        for task_id in task_ids:
+            CALL_METRICS.bind(task_id, callback.func)
+            REFERENCES.bind(self, task_id, callback)
+
+    def push_scheduled(
+        self,
+        tick: int,
+        callback: Middleman,
+        name: str,
+        event_filter: str | None = None,
+        priority: int = 0,
+    ) -> int:
+        """
+        添加一个计划任务，在指定tick执行一次
+
+        Args:
+            tick (int): 执行的tick时间点（相对当前tick）
+            callback (Middleman): 回调函数
+            name (str): 任务名称
+            event_filter (str | None): 触发条件，到期时不满足则跳过
+            priority (int): 优先级，数值大的先执行；小于0时超出tick预算会推迟到下一tick
+        """
+        args: tuple[Any, ...] = (tick, callback, name)
+        if priority:
+            args = (*args, event_filter, priority)
+        elif event_filter is not None:
+            args = (*args, event_filter)
+        return self._bind(callback, self.call("pushScheduled", args, int), True)
+
+    def push_continuous(
+        self,
+        callback: Middleman,
+        name: str,
+        delay: int = 0,
+        event_filter: str | None = None,
+        priority: int = 0,
+    ) -> int:
+        """
+        添加一个连续任务，每个tick都会执行
+
+        Args:
+            callback (JavaConsumer): 回调函数
+            name (str): 任务名称
+            delay (int): 延迟开始的tick数
+            event_filter (str | None): 触发条件，不满足的事件不会调用回调
+            priority (int): 优先级，数值大的先执行
+        """
+        args: tuple[Any, ...] = (callback, name)
+        if priority:
+            args = (*args, delay, event_filter, priority)
+        elif event_filter is not None:
+            args = (*args, delay, event_filter)
+        elif delay:
+            args = (*args, delay)
+        return self._bind(callback, self.call("pushContinuous", args, int))
+
+    def push_once(
+        self,
+        callback: Middleman,
+        name: str,
+        event_filter: str | None = None,
+        priority: int = 0,
+    ) -> int:
+        """
+        添加一个一次性任务，在下一个匹配的tick执行后自动移除
+
+        Args:
+            callback (JavaConsumer): 回调函数
+            name (str): 任务名称
+            event_filter (str | None): 触发条件，在第一次满足条件的事件执行
+            priority (int): 优先级，数值大的先执行；小于0时超出tick预算会推迟到下一次事件
+        """
+        args: tuple[Any, ...] = (callback, name)
+        if priority:
+            args = (*args, event_filter, priority)
+        elif event_filter is not None:
+            args = (*args, event_filter)
+        return self._bind(callback, self.call("pushOnce", args, int), True)
+
+    def push_interval(
+        self,
+        interval: int | tuple[int, int],
+        callback: Middleman,
+        name: str,
+        event_filter: str | None = None,
+        priority: int = 0,
+    ) -> int:
+        """
+        添加一个周期任务，由Java端自行排入下一周期，无需每次重新注册
+
+        Args:
+            interval (int | tuple[int, int]): 周期（tick），或 (周期, 相位)：
+                在 tick % 周期 == 相位 时执行；只给出周期时自动分配相位，
+                使同周期的任务分散到不同 tick
+            callback (JavaConsumer): 回调函数
+            name (str): 任务名称
+            event_filter (str | None): 触发条件，到期时不满足则跳过本周期
+            priority (int): 优先级，数值大的先执行
+        """
+        period, offset = interval if isinstance(interval, tuple) else (interval, None)
+        if period <= 0:
+            raise ValueError(f"interval must be positive: {period}")
+        args: tuple[Any, ...] = (
+            period,
+            -1 if offset is None else offset % period,
+            callback,
+            name,
+        )
+        if priority:
+            args = (*args, event_filter, priority)
+        elif event_filter is not None:
+            args = (*args, event_filter)
+        return self._bind(callback, self.call("pushInterval", args, int))
+
+    def remove(self, identity: int) -> None:
+        """移除一个任务，对应的回调随即释放，不会再执行"""
+        self.call("ezRemove", (identity,), None)
+        REFERENCES.release(identity)
+
+    def remove_all(self) -> None:
+        """移除所有任务"""
+        self.call("ezRemoveAll", (), None)
+        REFERENCES.release_all()
+
+    def print_debug(self) -> None:
+        """打印调试信息"""
+        self.call("printDebug", (), None)
+
+    @property
+    def index_size(self) -> int:
+        """已索引的连续与一次性任务数量"""
+        return self.call("getIndexSize", (), int)
+
+    @property
+    def indexed_names(self) -> int:
+        """拥有订阅者的事件名称数量"""
+        return self.call("getIndexedNames", (), int)
+
+    @property
+    def dispatch_count(self) -> int:
+        """分发的事件总数"""
+        return self.call("getDispatchCount", (), int)
+
+    @property
+    def dispatch_hits(self) -> int:
+        """命中至少一个任务的事件数"""
+        return self.call("getDispatchHits", (), int)
+
+    @property
+    def deferred_count(self) -> int:
+        """因超出tick预算而推迟的任务次数"""
+        return self.call("getDeferredCount", (), int)
+
+    @property
+    def tick_budget(self) -> float:
+        """每个tick中回调的时间预算（毫秒）"""
+        return self.call("getTickBudget", (), float)
+
+    @tick_budget.setter
+    def tick_budget(self, millis: float) -> None:
+        self.call("setTickBudget", (float(millis),), None)
+
+    def index_stats(self) -> dict[str, int]:
+        """索引与分发计数，用于在负载下确认分发开销"""
+        return {
+            "index_size": self.index_size,
+            "indexed_names": self.indexed_names,
+            "dispatch_count": self.dispatch_count,
+            "dispatch_hits": self.dispatch_hits,
+            "deferred_count": self.deferred_count,
+        }
+
+    def reset_dispatch_stats(self) -> None:
+        """清零分发计数"""
+        self.call("resetDispatchStats", (), None)
@@ -0,0 +1,141 @@
+"""
+过滤标志
+
+在Java端判断事件是否触发回调，不满足条件的事件不会离开JVM：
+
+    @ pymc.AtEntityTick("Creeper", pymc.ALWAYS) & pymc.Near((0, 64, 0), 16) & pymc.EveryNth(20)
+    def near_spawn(entity, data): ...
+
+实体条件（EntityType、WithinBox、Near、HasTag、HasNbt）在事件对象不是实体时不满足。
+"""
+
+from __future__ import annotations
+
+from typing import override
+
+from .at import Filter
+from .vec import Vec3, Vec3Like
+
+__all__ = (
+    "EntityType",
+    "WithinBox",
+    "Near",
+    "EveryNth",
+    "Sample",
+    "HasTag",
+    "HasNbt",
+)
+
+
+def _atom(value: str) -> str:
+    """检查S表达式中的原子参数"""
+    if not value or any(c.isspace() or c in "()" for c in value):
+        raise ValueError(f"Invalid filter argument: {value!r}")
+    return value
+
+
+def _numbers(*values: float) -> str:
+    return " ".join(repr(float(v)) for v in values)
+
+
+class EntityType(Filter):
+    """实体类型为其中之一，如 EntityType("creeper", "minecraft:zombie")"""
+
+    ids: tuple[str, ...]
+
+    def __init__(self, *ids: str) -> None:
+        if not ids:
+            raise ValueError("EntityType requires at least one id")
+        self.ids = tuple(_atom(i if ":" in i else f"minecraft:{i}") for i in ids)
+
+    @override
+    def compile(self) -> str:
+        return f"(type {' '.join(self.ids)})"
+
+
+class WithinBox(Filter):
+    """实体位于两个角点围成的长方体内"""
+
+    corner1: Vec3
+    corner2: Vec3
+
+    def __init__(self, corner1: Vec3Like, corner2: Vec3Like) -> None:
+        self.corner1 = Vec3.of(corner1)
+        self.corner2 = Vec3.of(corner2)
+
+    @override
+    def compile(self) -> str:
+        return f"(box {_numbers(*self.corner1, *self.corner2)})"
+
+
+class Near(Filter):
+    """实体与某点的距离不超过 radius"""
+
+    center: Vec3
+    radius: float
+
+    def __init__(self, center: Vec3Like, radius: float) -> None:
+        self.center = Vec3.of(center)
+        self.radius = radius
+
+    @override
+    def compile(self) -> str:
+        return f"(near {_numbers(*self.center, self.radius)})"
+
+
+class EveryNth(Filter):
+    """只在 tick % n == offset 的 tick 触发"""
+
+    n: int
+    offset: int
+
+    def __init__(self, n: int, offset: int = 0) -> None:
+        if n <= 0:
+            raise ValueError(f"n must be positive: {n}")
+        self.n = n
+        self.offset = offset % n
+
+    @override
+    def compile(self) -> str:
+        return f"(every {self.n} {self.offset})"
+
+
+class Sample(Filter):
+    """以 rate 的概率触发"""
+
+    rate: float
+
+    def __init__(self, rate: float) -> None:
+        if not 0 <= rate <= 1:
+            raise ValueError(f"rate must be within [0, 1]: {rate}")
+        self.rate = rate
+
+    @override
+    def compile(self) -> str:
+        return f"(sample {_numbers(self.rate)})"
+
+
+class HasTag(Filter):
+    """实体带有命令标签（/tag 添加的标签）"""
+
+    tag: str
+
+    def __init__(self, tag: str) -> None:
+        self.tag = _atom(tag)
+
+    @override
+    def compile(self) -> str:
+        return f"(tag {self.tag})"
+
+
+class HasNbt(Filter):
+    """实体 NBT 中存在某个键，每次判断都会序列化实体 NBT，开销较大"""
+
+    key: str
+
+    def __init__(self, key: str) -> None:
+        self.key = _atom(key)
+
+    @override
+    def compile(self) -> str:
+        return f"(nbt {self.key})"
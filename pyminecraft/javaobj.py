@@ -2,332 +2,51 @@
 
 from __future__ import annotations
 
-from typing import Callable, overload, Any, TypeAlias, TypeVar, Literal, Iterable, Self
-from collections.abc import Sequence
+from typing import (
+    Any,
+    TypeAlias,
+    Iterable,
+    ClassVar,
+    Self,
+    TYPE_CHECKING,
+)
+from collections.abc import Mapping, Sequence
+import struct
 
-from py4j.java_gateway import JavaObject, JavaGateway, get_field
-from py4j.java_collections import JavaList
 
 from .type_dict import AtDict
+from .cache import READ_CACHE
+from .refs import REFERENCES
+from .buffer import (
+    WRITE_BUFFER,
+    OP_SET_POS,
+    OP_SET_VELOCITY,
+    OP_SET_YAW,
+    OP_SET_PITCH,
+    OP_NBT_PUT,
+    pack_string,
+    pack_nbt_value,
+)
+from .vec import Vec3
+from .nbt import NbtTag, dumps as nbt_dumps
+from .spawn import (
+    SummonSpecs,
+    RESULT_SIZE as SUMMON_RESULT_SIZE,
+    pack_summon_specs,
+    unpack_summon_results,
+)
+from .connection import get_shared_buffer
+from .proxy import JavaObjectProxy, JavaListProxy
+from .snapshot import SnapshotField, SNAPSHOT_FIELDS, EntityState, _decode_snapshot
+from .executor import CallbackFunction, Middleman, NamedAdvancedExecutor
+from .commands import CompiledCommand, CommandBatch
 
-__all__ = ("Server", "NamedAdvancedExecutor", "Entity")
-
-
-class JavaObjectProxy:
-    """
-    Java对象代理基类
-
-    用于包装Java对象，提供统一的访问接口
-    """
-
-    _obj: JavaObject
-    _gateway: JavaGateway
-
-    def __init__(self, java_object: JavaObject, java_gateway: JavaGateway):
-        """初始化Java对象代理"""
-        self._obj = java_object
-        self._gateway = java_gateway
-
-    @property
-    def mngr(self) -> PymcMngr:
-        """获取pymc管理器"""
-        if isinstance(self, PymcMngr):
-            return self
-
-        return PymcMngr.from_gateway(self._gateway)
-
-    @property
-    def class_factory(self) -> JavaClassFactory:
-        """获取JavaGateway实例"""
-        if isinstance(self, JavaClassFactory):
-            return self
-
-        return JavaClassFactory(self._obj, self._gateway)
-
-    @property
-    def obj(self) -> JavaObject:
-        """获取Java对象"""
-        return self._obj
-
-    @property
-    def gateway(self) -> JavaGateway:
-        """获取Java对象对应的JavaGateway"""
-        return self._gateway
-
-    @overload
-    def proxy(self, obj: JavaObject) -> JavaObjectProxy: ...
-
-    @overload
-    def proxy[T](self, obj: Any, cls: type[T]) -> T: ...
-    @overload
-    def proxy[T](self, obj: Any, cls: type[T] | None) -> T | JavaObjectProxy: ...
-    def proxy[T](self, obj: Any, cls: type[T] | None = None) -> T | JavaObjectProxy:
-        """
-        代理对象
-
-        Args:
-            obj: Java对象
-            cls: 代理对象类型
-        """
-        if cls is None:
-            return JavaObjectProxy(obj, self._gateway)
-
-        if isinstance(obj, cls):
-            return obj
-
-        if not issubclass(cls, JavaObjectProxy):
-            raise TypeError(f"{cls} is not a JavaObjectProxy and {obj} is not a {cls}")
-
-        return cls(obj, self._gateway)  # 元素是 JavaObject ，使用cls包装
-
-    def proxy_list[T](self, obj: Any, cls: type[T]) -> JavaListProxy[T]:
-        """列表代理"""
-        return JavaListProxy(obj, self._gateway, cls)
-
-    @overload
-    def call[T](self, path: str, args: Iterable[Any], ret: type[T]) -> T: ...
-    @overload
-    def call(self, path: str, args: Iterable[Any], ret: None) -> None: ...
-    @overload
-    def call(self, path: str, args: Iterable[Any] = ()) -> JavaObjectProxy: ...
-
-    def call[T](
-        self,
-        path: str,
-        args: Iterable[Any] = (),
-        ret: type[T] | None | Literal["JavaObjectProxy"] = "JavaObjectProxy",
-    ) -> T | JavaObjectProxy | None:
-        """
-        调用指定路径的方法
-
-        Args:
-            path: 方法路径
-            cls: 返回值类型
-            args: 方法参数
-
-        Returns:
-            返回值
-        """
-        func: Callable = getattr(self._obj, path)
-        if not callable(func):
-            raise TypeError(f"{path} is not a function")
-
-        obj: Any = func(
-            *(arg.obj if isinstance(arg, JavaObjectProxy) else arg for arg in args)
-        )  # 如果是包装后的，则使用本身
-
-        if obj is None and ret is None:
-            return None
-
-        if ret is None or obj is None:
-            raise TypeError(f"{path} not return type {ret} but {type(obj)}")
-
-        return self.proxy(obj, JavaObjectProxy if ret == "JavaObjectProxy" else ret)
-
-    @overload
-    def call_list[T](
-        self, path: str, args: Iterable[Any], ret: type[T]
-    ) -> JavaListProxy[T]: ...
-
-    @overload
-    def call_list(
-        self, path: str, args: Iterable[Any] = ()
-    ) -> JavaListProxy[JavaObjectProxy]: ...
-    def call_list[T](
-        self, path: str, args: Iterable[Any] = (), ret: type[T] | None = None
-    ) -> JavaListProxy[T] | JavaListProxy[JavaObjectProxy]:
-        """
-        调用指定路径的方法（返回列表）
-
-        Args:
-            path: 方法路径
-            cls: 返回值类型
-            args: 方法参数
-
-        Returns:
-            列表返回值
-        """
-        if ret is None:
-            return self.new_list(self.call(path, args, JavaList))
-        return self.new_list(self.call(path, args, JavaList), ret)
-
-    @overload
-    def get(self, path: str) -> JavaObjectProxy: ...
-
-    @overload
-    def get[T](self, path: str, cls: type[T]) -> T: ...
-
-    @overload
-    def get[T](self, path: str, cls: type[T] | None = None) -> T | JavaObjectProxy: ...
-
-    def get[T](self, path: str, cls: type[T] | None = None) -> T | JavaObjectProxy:
-        """
-        从Java对象中获取指定路径的值
-
-        Args:
-            cls (type[T]): 如果是java对象代理类，就返回对应的Java对象代理；否则判断并直接返回值
-            path (str): 要获取的值
-
-        Returns:
-            T: 生成的Java对象代理
-        """
-        return self.proxy(get_field(self._obj, path), cls)
-
-    def get_list[T](self, path: str, cls: type[T]) -> JavaListProxy[T]:
-        """从Java对象中获取指定路径的列表
-
-        Args:
-            cls (type[T]): 列表中元素的类型
-            path (str): 要获取的列表
-
-        Returns:
-            JavaListProxy[T]: 生成的Java列表代理
-        """
-        return self.proxy_list(get_field(self._obj, path), cls)
-
-    @overload
-    def new_list[T](self, java_list: JavaList, cls: type[T]) -> JavaListProxy[T]: ...
-
-    @overload
-    def new_list(self, java_list: JavaList) -> JavaListProxy[JavaObjectProxy]: ...
-
-    def new_list[T](
-        self, java_list: JavaList, cls: type[T] | None = None
-    ) -> JavaListProxy[T] | JavaListProxy[JavaObjectProxy]:
-        """
-        生成Java对象列表代理
-
-        Args:
-            cls (type[T]): 要生成的Java对象列表代理类
-            java_list (JavaList): 要包装的Java对象列表
-
-        Returns:
-            T: 生成的Java对象列表代理
-        """
-        if cls is None:
-            return JavaListProxy(java_list, self._gateway, JavaObjectProxy)
-        return JavaListProxy(java_list, self._gateway, cls)
-
-    def __bool__(self) -> bool:
-        """判断Java对象是否存在"""
-        return not self.is_null()
-
-    def __str__(self) -> str:
-        """将Java对象转换为字符串"""
-        return str(self._obj)
-
-    def is_null(self) -> bool:
-        """检查对象是否为null"""
-        if self._obj is None:
-            return True
-        return self.class_factory.call_static("java.util.Objects.isNull", (self,), bool)
-
-
-class JavaListProxy[T](JavaObjectProxy, Sequence[T]):
-    """Java列表包装类"""
-
-    _list: JavaList
-    _item_handler_type: type[T]
-
-    def __init__(
-        self,
-        java_list: JavaList,
-        java_gateway: JavaGateway,
-        item_handler_type: type[T],
-    ):
-        """
-        初始化Java列表代理
-
-        Args:
-            java_list (JavaList): 要包装的Java列表
-            item_handler_type (type[T]): 列表项代理的类型
-        """
-        super().__init__(java_list, java_gateway)
-        self._list = java_list
-        self._item_handler_type = item_handler_type
-
-    @overload
-    def __getitem__(self, index: int) -> T: ...
-
-    @overload
-    def __getitem__(self, index: slice) -> Sequence[T]: ...
-
-    def __getitem__(self, index: int | slice) -> T | Sequence[T]:
-        """获取指定索引处的元素"""
-        if isinstance(index, slice):
-            # 处理切片
-            sliced_list = self._list[index]
-            return JavaListProxy(sliced_list, self._gateway, self._item_handler_type)
-        return (
-            self._item_handler_type(self._list[index], self._gateway)
-            if issubclass(self._item_handler_type, JavaObjectProxy)
-            else self._list[index]
-        )
-
-    def __len__(self) -> int:
-        """返回列表长度"""
-        return len(self._list)
-
-
-class JavaClassFactory(JavaObjectProxy):
-    """提供java类实例化方法 此类内的路径为绝对路径"""
+if TYPE_CHECKING:
+    from py4j.java_gateway import JavaGateway
 
-    @staticmethod
-    def __phrase(clazz: str):
-        return clazz.rpartition(".")
-
-    @overload
-    def new(self, clazz: str, args: Iterable[Any] = ()) -> JavaObjectProxy: ...
-    @overload
-    def new[T](self, clazz: str, args: Iterable[Any], cls: type[T]) -> T: ...
-    @overload
-    def new[T](
-        self, clazz: str, args: Iterable[Any], cls: type[T] | None = None
-    ) -> T | JavaObjectProxy: ...
-    def new[T](
-        self, clazz: str, args: Iterable[Any] = (), cls: type[T] | None = None
-    ) -> T | JavaObjectProxy:
-        """根据类名实例化java类"""
-        return self.call_static(clazz, args, cls)
-
-    @overload
-    def get_static(self, clazz: str) -> JavaObjectProxy: ...
-    @overload
-    def get_static[T](self, clazz: str, cls: type[T]) -> T: ...
-    @overload
-    def get_static[T](
-        self, clazz: str, cls: type[T] | None = None
-    ) -> T | JavaObjectProxy: ...
-    def get_static[T](
-        self, clazz: str, cls: type[T] | None = None
-    ) -> T | JavaObjectProxy:
-        """获取静态类实例"""
-        path, _, field = self.__phrase(clazz)
-        return self.proxy(getattr(getattr(self._gateway.jvm, path), field), cls)
-
-    @overload
-    def call_static(self, clazz: str, args: Iterable[Any]) -> JavaObjectProxy: ...
-    @overload
-    def call_static[T](self, clazz: str, args: Iterable[Any], cls: type[T]) -> T: ...
-    @overload
-    def call_static[T](
-        self, clazz: str, args: Iterable[Any], cls: type[T] | None = None
-    ) -> T | JavaObjectProxy: ...
-    def call_static[T](
-        self, clazz: str, args: Iterable[Any], cls: type[T] | None = None
-    ) -> T | JavaObjectProxy:
-        """调用静态方法"""
-        path, _, method = self.__phrase(clazz)
-        return self.proxy(
-            getattr(getattr(self._gateway.jvm, path), method)(
-                *(arg.obj if isinstance(arg, JavaObjectProxy) else arg for arg in args)
-            ),
-            cls,
-        )
+__all__ = ("Server", "NamedAdvancedExecutor", "Entity", "EntityState")
 
 
-V = TypeVar("V", bound=JavaObjectProxy)
-CallbackFunction: TypeAlias = Callable[[V, AtDict], None]
 V3dTup: TypeAlias = tuple[float, float, float]
 V3iTup: TypeAlias = tuple[int, int, int]
 RotTup: TypeAlias = tuple[float, float]
@@ -337,10 +56,17 @@ PosRotTup: TypeAlias = tuple[float, float, float, float, float]
 class PymcMngr(JavaObjectProxy):
     """top.fish1000.pymcfabric.PymcMngr"""
 
+    __slots__ = ()
+
+    _instance: ClassVar[PymcMngr | None] = None
+
     @staticmethod
     def from_gateway(gateway: JavaGateway) -> PymcMngr:
-        """从gateway中获取PymcMngr实例"""
-        return PymcMngr(gateway.entry_point, gateway)
+        """从gateway中获取PymcMngr实例，同一gateway复用同一实例"""
+        mngr = PymcMngr._instance
+        if mngr is None or mngr.gateway is not gateway:
+            mngr = PymcMngr._instance = PymcMngr(gateway.entry_point, gateway)
+        return mngr
 
     @property
     def mod_id(self) -> str:
@@ -360,9 +86,15 @@ class PymcMngr(JavaObjectProxy):
 
     @property
     def executor(self) -> NamedAdvancedExecutor:
-        """获取执行器对象"""
+        """获取执行器对象，同一连接只获取一次"""
+
+        return self.cached("executor", self._load_executor, True)
 
-        return self.get("executor", NamedAdvancedExecutor)
+    def _load_executor(self) -> NamedAdvancedExecutor:
+        executor = self.get("executor", NamedAdvancedExecutor)
+        # 执行器在整个连接期间复用，即使在 scope 中第一次获取也不能在离开时释放
+        REFERENCES.untrack(executor.obj)
+        return executor
 
     def get_command_source(self, name: str = "PYMC") -> JavaObjectProxy:
         """获取命令源对象"""
@@ -374,11 +106,74 @@ class PymcMngr(JavaObjectProxy):
 
         self.call("sendCommand", (command, name), None)
 
+    def execute_commands(
+        self, commands: Sequence[str], name: str = "PYMC"
+    ) -> list[int]:
+        """
+        使用同一个命令源一次性执行多条命令
+
+        Args:
+            commands: 命令列表
+            name (str): 命令源名称
+
+        Returns:
+            list[int]: 每条命令的返回值，失败时为0
+        """
+        if not commands:
+            return []
+        for command in commands:
+            if "\n" in command:
+                raise ValueError(f"Command must not contain line breaks: {command!r}")
+        data = self.call("executeCommands", ("\n".join(commands), name), bytes)
+        return list(struct.unpack(f"<{len(commands)}i", data))
+
+    def compile_command(self, command: str, name: str = "PYMC") -> CompiledCommand:
+        """获取预编译的命令，Java 端按 (命令源名称, 命令) 缓存解析结果"""
+        return self.call("compileCommand", (command, name), CompiledCommand)
+
+    def invalidate_command_cache(self) -> None:
+        """清空预编译命令缓存"""
+        self.call("invalidateCommandCache", (), None)
+
     def get_entities(self, selector: str) -> JavaListProxy[Entity]:
         """获取实体对象"""
 
         return self.call_list("getEntities", (selector,), Entity)
 
+    def snapshot_entities(
+        self,
+        selector: str,
+        fields: Iterable[SnapshotField] = SNAPSHOT_FIELDS,
+        copy: bool = True,
+    ) -> dict[str, Any]:
+        """
+        一次调用获取选中实体的列式快照
+
+        启用共享内存时数据经由共享内存传输，py4j 只传递长度。
+
+        Args:
+            selector (str): 实体选择器
+            fields: 需要的字段，可选 uuid、pos、vel、rot、type
+            copy (bool): 为 False 时，经由共享内存传输的 NumPy 数值列直接引用共享内存（零拷贝），
+                只在下一次使用共享内存的调用之前有效
+
+        Returns:
+            dict[str, Any]: 字段名到列的映射。uuid 与 type 为字符串列表；
+            pos、vel 为形状 (n, 3) 的 float64 数组，rot 为形状 (n, 2) 的 float32 数组
+            （俯仰角、偏航角）。未安装 NumPy 时数值列为按行展开的 array.array
+        """
+        fields = tuple(dict.fromkeys(fields))
+        shared = get_shared_buffer()
+        if shared is not None:
+            with shared.lock:
+                length = self.call(
+                    "snapshotEntitiesShared", (selector, ",".join(fields)), int
+                )
+                if length >= 0:
+                    return _decode_snapshot(shared.view[:length], fields, copy)
+        data = self.call("snapshotEntities", (selector, ",".join(fields)), bytes)
+        return _decode_snapshot(data, fields)
+
     def load_entity(
         self,
         name: str,
@@ -389,7 +184,10 @@ class PymcMngr(JavaObjectProxy):
     ) -> Entity:
         """加载实体对象"""
         if where is None:
-            where = world.spawn_pos.to_v3d().xyz
+            where = world.spawn_pos.to_vec3()
+
+        if isinstance(where, Vec3):
+            where = where.xyz
 
         if isinstance(where, V3d):
             return self.call(
@@ -412,9 +210,14 @@ class PymcMngr(JavaObjectProxy):
         self.logger.info(msg)
 
 
+JavaObjectProxy.mngr_type = PymcMngr
+
+
 class JavaLogger(JavaObjectProxy):
     """Java日志记录器包装类"""
 
+    __slots__ = ()
+
     def debug(self, message: str) -> None:
         """记录调试级别日志"""
         self.call("debug", (message,), None)
@@ -435,20 +238,22 @@ class JavaLogger(JavaObjectProxy):
 class V3i(JavaObjectProxy):
     """net.minecraft.util.math.Vec3i"""
 
+    __slots__ = ()
+
     @property
     def x(self) -> int:
         """x"""
-        return self.call("getX", (), int)
+        return self.cached("getX", lambda: self.call("getX", (), int))
 
     @property
     def y(self) -> int:
         """y"""
-        return self.call("getY", (), int)
+        return self.cached("getY", lambda: self.call("getY", (), int))
 
     @property
     def z(self) -> int:
         """z"""
-        return self.call("getZ", (), int)
+        return self.cached("getZ", lambda: self.call("getZ", (), int))
 
     @property
     def xyz(self) -> V3iTup:
@@ -472,24 +277,30 @@ class V3i(JavaObjectProxy):
         """转为V3d对象"""
         return V3d.create(self, (self.x, self.y, self.z))
 
+    def to_vec3(self) -> Vec3:
+        """转为本地的Vec3对象"""
+        return Vec3(self.x, self.y, self.z)
+
 
 class V3d(JavaObjectProxy):
     """net.minecraft.util.math.Vec3d"""
 
+    __slots__ = ()
+
     @property
     def x(self) -> float:
         """x"""
-        return self.call("getX", (), float)
+        return self.cached("getX", lambda: self.call("getX", (), float), True)
 
     @property
     def y(self) -> float:
         """y"""
-        return self.call("getY", (), float)
+        return self.cached("getY", lambda: self.call("getY", (), float), True)
 
     @property
     def z(self) -> float:
         """z"""
-        return self.call("getZ", (), float)
+        return self.cached("getZ", lambda: self.call("getZ", (), float), True)
 
     @property
     def xyz(self) -> V3dTup:
@@ -501,8 +312,14 @@ class V3d(JavaObjectProxy):
         """将v3d转为参数类型"""
         if isinstance(v3d, tuple):
             return v3d
+        if isinstance(v3d, Vec3):
+            return v3d.xyz
         return (v3d,)
 
+    def to_vec3(self) -> Vec3:
+        """转为本地的Vec3对象"""
+        return Vec3(self.x, self.y, self.z)
+
     def __iter__(self):
         """允许将 V3d 解包为 (x, y, z)"""
         yield self.x
@@ -525,176 +342,112 @@ class V3d(JavaObjectProxy):
     def create(cls, source: JavaObjectProxy, vec: V3dTup) -> V3d:
         """新建一个V3d对象"""
         return source.class_factory.new(
-            "net.minecraft.util.math.Vec3d", (int(w) for w in vec), V3d
+            "net.minecraft.util.math.Vec3d", (float(w) for w in vec), V3d
         )
 
 
 class BlockPos(V3i):
     """net.minecraft.util.math.BlockPos"""
 
+    __slots__ = ()
 
-V3dLike: TypeAlias = V3dTup | V3d
-V3iLike: TypeAlias = V3iTup | V3i
-
-
-class Middleman[T: JavaObjectProxy]:
-    """
-    中间人类，用于在Java和Python之间传递回调函数。
-
-    这个类实现了Java的Consumer接口，作为Java调用Python函数的桥梁。
-    """
-
-    def __init__(
-        self,
-        func: CallbackFunction[T],
-        handler: Callable[[JavaObject], T],
-        data: AtDict,
-    ) -> None:
-        """
-        初始化Middleman实例。
-
-        Args:
-            func (CallbackFunction): 要被调用的Python回调函数
-            data (TypeDict): 传递给回调函数的额外信息字典
-        """
-        self.func: CallbackFunction[T] = func
-        self.data = data
-        self.handler = handler
-
-    def accept(self, obj: JavaObject) -> None:
-        """
-        Java端调用的方法，用于执行Python回调函数。
-
-        Args:
-            server: Java端传入的服务器对象
-        """
-        self.func(self.handle(obj), self.data)
-
-    def handle(self, java_object: JavaObject) -> T:
-        """包装JavaObject"""
-        return self.handler(java_object)
-
-    class Java:
-        """标记为实现Java接口"""
-
-        implements = ["java.util.function.Consumer"]
-
-
-class NamedAdvancedExecutor(JavaObjectProxy):
-    """
-    Java高级命名执行器包装类
-
-    对应Java端NamedAdvancedExecutor类，提供更丰富的任务调度功能，
-    包括计划任务、连续任务和一次性任务
-    """
-
-    def push_scheduled(self, tick: int, callback: Middleman, name: str) -> int:
-        """
-        添加一个计划任务，在指定tick执行一次
-
-        Args:
-            tick (int): 执行的tick时间点（相对当前tick）
-            callback (Middleman): 回调函数
-            name (str): 任务名称
-        """
-        return self.call("pushScheduled", (tick, callback, name), int)
-
-    def push_continuous(self, callback: Middleman, name: str) -> int:
-        """
-        添加一个连续任务，每个tick都会执行
-
-        Args:
-            callback (JavaConsumer): 回调函数
-            name (str): 任务名称
-        """
-        return self.call("pushContinuous", (callback, name), int)
-
-    def push_once(self, callback: Middleman, name: str) -> int:
-        """
-        添加一个一次性任务，在下一个匹配的tick执行后自动移除
-
-        Args:
-            callback (JavaConsumer): 回调函数
-            name (str): 任务名称
-        """
-        return self.call("pushOnce", (callback, name), int)
 
-    def remove(self, identity: int) -> None:
-        """移除一个任务"""
-        self.call("ezRemove", (identity,), int)
+V3dLike: TypeAlias = V3dTup | V3d | Vec3
+V3iLike: TypeAlias = V3iTup | V3i
 
-    def remove_all(self) -> None:
-        """移除所有任务"""
-        self.call("ezRemoveAll", (), None)
 
-    def print_debug(self) -> None:
-        """打印调试信息"""
-        self.call("printDebug", (), None)
+def _has_nbt_value(value: Any) -> bool:
+    """NBT 树中是否含有Java端的 NbtValue，含有时无法在 Python 端整体编码"""
+    if isinstance(value, NbtValue):
+        return True
+    if isinstance(value, Mapping):
+        return any(_has_nbt_value(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_nbt_value(v) for v in value)
+    return False
 
 
 class NbtValue(JavaObjectProxy):
     """nbt基类"""
 
-    BASE = "net.minecraft.nbt.%s.of"
-    TYPE_MAP: dict[type, str] = {
-        bool: BASE % "NbtByte",
-        int: BASE % "NbtLong",
-        float: BASE % "NbtDouble",
-        str: BASE % "NbtString",
-    }
+    __slots__ = ()
 
     @staticmethod
-    def of(source: JavaObjectProxy, value: NbtType):
-        """将Python对象转为NbtValue"""
+    def of(source: JavaObjectProxy, value: NbtType) -> NbtValue:
+        """
+        将Python对象转为NbtValue，整棵树编码为二进制后一次调用完成
+
+        树中含有 NbtValue 时，逐个元素构造含有 NbtValue 的 compound 与列表
+        """
         if isinstance(value, NbtValue):
             return value
-        return source.class_factory.call_static(
-            NbtValue.TYPE_MAP[type(value)], (value,), NbtValue
-        )
+        if _has_nbt_value(value):
+            if isinstance(value, Mapping):
+                return NbtCompound.create(source, **value)
+            return NbtList.create(source, *value)
+        return source.mngr.call("readNbtElement", (nbt_dumps({"": value}),), NbtValue)
 
 
 class NbtCompound(NbtValue):
     """对应net.minecraft.nbt.NbtCompound"""
 
+    __slots__ = ()
+
     @staticmethod
     def create(source: JavaObjectProxy, **kwargs: NbtType) -> NbtCompound:
-        """生成一个NbtCompound"""
-        return source.class_factory.call_static(
-            "net.minecraft.nbt.StringNbtReader.parse", (str(kwargs),), NbtCompound
-        )
+        """
+        生成一个NbtCompound，整棵树编码为二进制后一次调用完成
+
+        含有 NbtValue 的元素在其余元素编码后逐个添加
+        """
+        plain = {k: v for k, v in kwargs.items() if not _has_nbt_value(v)}
+        nbt = source.mngr.call("readNbt", (nbt_dumps(plain),), NbtCompound)
+        for key, value in kwargs.items():
+            if key not in plain:
+                nbt.put(key, value)
+        return nbt
 
     def put(self, key: str, value: NbtType) -> Self:
         """向 compound 中添加一个元素"""
-        if isinstance(value, list):
-            self.call("put", (key, NbtList.create(self, *value)), None)
-        elif isinstance(value, dict):
-            self.call("put", (key, NbtCompound.create(self, **value)), None)
+        # 顶层的 NbtValue 按 id 引用，嵌套的 NbtValue 只能同步调用
+        if WRITE_BUFFER.active and (
+            isinstance(value, NbtValue) or not _has_nbt_value(value)
+        ):
+            WRITE_BUFFER.record(
+                self, OP_NBT_PUT, pack_string(key) + pack_nbt_value(value), (value,)
+            )
         else:
-            self.call("put", (key, self.of(self, value)), None)
+            self.call("put", (key, NbtValue.of(self, value)), None)
         return self
 
 
 class NbtList[T: NbtType](NbtValue):
     """对应net.minecraft.nbt.NbtList"""
 
+    __slots__ = ()
+
     @staticmethod
     def create(source: JavaObjectProxy, *values: T) -> NbtList[T]:
-        """生成一个NbtList"""
-        nbt = source.class_factory.new("net.minecraft.nbt.NbtList", (), NbtList)
+        """
+        生成一个NbtList，整个列表编码为二进制后一次调用完成
+
+        含有 NbtValue 时逐个元素添加
+        """
+        if not _has_nbt_value(values):
+            return source.mngr.call(
+                "readNbtElement", (nbt_dumps({"": list(values)}),), NbtList
+            )
+        nbt = source.mngr.call("readNbtElement", (nbt_dumps({"": []}),), NbtList)
         for value in values:
             nbt.add(value)
         return nbt
 
     def add(self, value: T, ind: int | None = None) -> Self:
         """向列表中添加一个元素"""
-        args: list[Any] = [] if ind is None else [ind]
-        if isinstance(value, list):
-            args.append(NbtList.create(self, *value))
-        elif isinstance(value, dict):
-            args.append(NbtCompound.create(self, **value))
-        else:
-            args.append(self.of(self, value))
-        if not self.call("add", args, bool):
+        element = NbtValue.of(self, value)
+        if ind is not None:
+            self.call("add", (ind, element), None)
+        elif not self.call("add", (element,), bool):
             raise ValueError(f"Cannot add value {value} to nbt")
         return self
 
@@ -702,14 +455,16 @@ class NbtList[T: NbtType](NbtValue):
         return self.call("size", (), int)
 
 
-NbtType: TypeAlias = (
-    "int | str | float | bool | dict[str, NbtType] | list[NbtType] | NbtValue"
+type NbtType = (
+    int | str | float | bool | NbtTag | dict[str, NbtType] | list[NbtType] | NbtValue
 )
 
 
 class Entity(JavaObjectProxy):
     """对应net.minecraft.entity.Entity"""
 
+    __slots__ = ()
+
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, Entity):
             return False
@@ -718,40 +473,51 @@ class Entity(JavaObjectProxy):
     @property
     def name(self) -> str:
         """获取实体名称"""
-        return self.call("getName").call("getString", (), str)
+        return self.cached(
+            "getName", lambda: self.call("getName").call("getString", (), str)
+        )
 
     @property
     def uuid(self) -> str:
         """获取实体UUID"""
-        return self.call("getUuidAsString", (), str)
+        return self.cached(
+            "getUuidAsString", lambda: self.call("getUuidAsString", (), str), True
+        )
 
     @property
     def x(self) -> float:
         """获取实体的X坐标"""
-        return self.call("getX", (), float)
+        return self.cached("getX", lambda: self.call("getX", (), float))
 
     @property
     def y(self) -> float:
         """获取实体的Y坐标"""
-        return self.call("getY", (), float)
+        return self.cached("getY", lambda: self.call("getY", (), float))
 
     @property
     def z(self) -> float:
         """获取实体的Z坐标"""
-        return self.call("getZ", (), float)
+        return self.cached("getZ", lambda: self.call("getZ", (), float))
 
     @property
-    def pos(self) -> V3d:
-        """获取实体的位置"""
-        return self.call("getPos", (), V3d)
+    def pos(self) -> Vec3:
+        """获取实体的位置（一次调用取回三个分量）"""
+        return self.cached(
+            "getPos",
+            lambda: Vec3(
+                *struct.unpack("<3d", self.mngr.call("getEntityPos", (self,), bytes))
+            ),
+        )
 
     @pos.setter
     def pos(self, pos: V3dLike) -> None:
         """设置实体的位置"""
-        if isinstance(pos, tuple):
-            self.call("setPosition", (*pos,), None)
-        else:
+        if isinstance(pos, V3d):
             self.call("setPosition", (pos,), None)
+        elif WRITE_BUFFER.active:
+            WRITE_BUFFER.record(self, OP_SET_POS, struct.pack("<3d", *Vec3.of(pos)))
+        else:
+            self.call("setPosition", Vec3.of(pos).xyz, None)
 
     @property
     def rotation(self) -> RotTup:
@@ -761,45 +527,89 @@ class Entity(JavaObjectProxy):
     @rotation.setter
     def rotation(self, rot: RotTup) -> None:
         """设置实体的旋转角度（俯仰角、偏航角）"""
-        self.call("setRotation", (*rot,), None)
+        self.pitch, self.yaw = rot
 
     @property
     def pitch(self) -> float:
         """获取实体的俯仰角度"""
-        return self.call("getPitch", (), float)
+        return self.cached("getPitch", lambda: self.call("getPitch", (), float))
 
     @pitch.setter
     def pitch(self, pitch: float) -> None:
         """设置实体的俯仰角度"""
-        self.call("setPitch", (pitch,), None)
+        if WRITE_BUFFER.active:
+            WRITE_BUFFER.record(self, OP_SET_PITCH, struct.pack("<f", pitch))
+        else:
+            self.call("setPitch", (pitch,), None)
 
     @property
     def yaw(self) -> float:
         """获取实体的偏航角度"""
-        return self.call("getYaw", (), float)
+        return self.cached("getYaw", lambda: self.call("getYaw", (), float))
 
     @yaw.setter
     def yaw(self, yaw: float) -> None:
         """设置实体的偏航角度"""
-        self.call("setYaw", (yaw,), None)
+        if WRITE_BUFFER.active:
+            WRITE_BUFFER.record(self, OP_SET_YAW, struct.pack("<f", yaw))
+        else:
+            self.call("setYaw", (yaw,), None)
 
     @property
-    def velocity(self) -> V3d:
-        """获取实体的移动速度"""
-        return self.call("getVelocity", (), V3d)
+    def velocity(self) -> Vec3:
+        """获取实体的移动速度（一次调用取回三个分量）"""
+        return self.cached(
+            "getVelocity",
+            lambda: Vec3(
+                *struct.unpack(
+                    "<3d", self.mngr.call("getEntityVelocity", (self,), bytes)
+                )
+            ),
+        )
 
     @velocity.setter
     def velocity(self, velocity: V3dLike) -> None:
         """设置实体的移动速度"""
-        if isinstance(velocity, tuple):
-            self.call("setVelocity", (*velocity,), None)
-        else:
+        if isinstance(velocity, V3d):
             self.call("setVelocity", (velocity,), None)
+        elif WRITE_BUFFER.active:
+            WRITE_BUFFER.record(
+                self, OP_SET_VELOCITY, struct.pack("<3d", *Vec3.of(velocity))
+            )
+        else:
+            self.call("setVelocity", Vec3.of(velocity).xyz, None)
 
     @property
     def removed(self) -> bool:
         """判断实体是否被移除"""
-        return self.call("isRemoved", (), bool)
+        return self.cached("isRemoved", lambda: self.call("isRemoved", (), bool))
+
+    def state(self) -> EntityState:
+        """
+        一次调用取回实体的存活状态、位置、速度与朝向
+
+        读缓存启用时同时填充 pos、velocity、pitch、yaw、removed 的缓存，
+        之后在同一 tick 内读取这些属性不再访问JVM
+        """
+        return self.cached("getEntityState", self._load_state)
+
+    def _load_state(self) -> EntityState:
+        state = EntityState.unpack(self.mngr.call("getEntityState", (self,), bytes))
+        target = self.target_id
+        READ_CACHE.put(target, "isRemoved", state.removed)
+        READ_CACHE.put(target, "getPos", state.pos)
+        READ_CACHE.put(target, "getVelocity", state.velocity)
+        READ_CACHE.put(target, "getPitch", state.pitch)
+        READ_CACHE.put(target, "getYaw", state.yaw)
+        return state
+
+    def is_alive(self) -> bool:
+        """
+        实体是否存在于世界中且未死亡（Entity.isAlive）
+
+        与 bool(entity) 不同，该方法会访问JVM，读取方式见 state
+        """
+        return self._obj is not None and self.state().alive
 
     def refresh_position_and_angles(self, pos_rot: PosRotTup) -> None:
         """刷新实体的位置和角度"""
@@ -834,17 +644,42 @@ class Server(JavaObjectProxy):
     提供对Minecraft服务器实例的访问接口，包括命令执行和日志记录功能
     """
 
+    __slots__ = ()
+
     def cmd(self, command: str, name: str = "PYMC"):
         """执行 Minecraft 命令"""
-        source = self.mngr.get_command_source(name)
-        self.call("getCommandManager").call(
-            "executeWithPrefix", (source, command), None
-        )
+        self.mngr.send_command(command, name)
 
     def say(self, message: str, name: str = "PYMC"):
         """Server.cmd("say <message>")"""
         self.cmd(f"say {message}", name)
 
+    def compile_cmd(self, command: str, name: str = "PYMC") -> CompiledCommand:
+        """
+        预编译命令，重复执行时跳过解析
+
+        示例:
+        ```
+        give = server.compile_cmd("give @a diamond")
+        give.run()
+        ```
+        """
+        return self.mngr.compile_command(command, name)
+
+    def batch(self, name: str = "PYMC") -> CommandBatch:
+        """
+        创建命令批处理，离开 with 语句时一次性执行全部命令
+
+        示例:
+        ```
+        with server.batch() as b:
+            b.cmd("say hello")
+            b.cmd("give @a diamond")
+        print(b.results)
+        ```
+        """
+        return CommandBatch(self, name)
+
     def get_entities(self, selector: str = "@e") -> JavaListProxy[Entity]:
         """
         获取指定实体
@@ -854,6 +689,22 @@ class Server(JavaObjectProxy):
         """
         return self.mngr.get_entities(selector)
 
+    def snapshot_entities(
+        self,
+        selector: str = "@e",
+        fields: Iterable[SnapshotField] = SNAPSHOT_FIELDS,
+        copy: bool = True,
+    ) -> dict[str, Any]:
+        """
+        获取指定实体的列式快照，详见 PymcMngr.snapshot_entities
+
+        Args:
+            selector (str): 命令方块中的实体选择器
+            fields: 需要的字段
+            copy (bool): 为 False 时经由共享内存传输的数值列不复制
+        """
+        return self.mngr.snapshot_entities(selector, fields, copy)
+
     @property
     def overworld(self) -> World:
         """获取主世界"""
@@ -863,6 +714,8 @@ class Server(JavaObjectProxy):
 class World(JavaObjectProxy):
     """世界对象"""
 
+    __slots__ = ()
+
     @property
     def spawn_pos(self) -> BlockPos:
         """世界出生点"""
@@ -890,3 +743,53 @@ class World(JavaObjectProxy):
         )
         self.call("spawnNewEntityAndPassengers", (entity,), bool)
         return entity
+
+    def summon_many(
+        self,
+        specs: SummonSpecs,
+        on_removed: CallbackFunction[Entity] | None = None,
+    ) -> list[str | None]:
+        """
+        一次调用召唤多个实体
+
+        Args:
+            specs: SummonSpec（或同样顺序的元组）的列表，
+                或字段名（id、pos、velocity、rotation、nbt）到列的映射
+            on_removed: 不为 None 时，为所有实体共同注册一个 "entity removed" 回调，
+                每个实体被移除时各执行一次
+
+        Returns:
+            list[str | None]: 实体 UUID，召唤失败的实体为 None
+        """
+        middleman = None
+        if on_removed is not None:
+            gateway = self._gateway
+            middleman = Middleman(
+                on_removed, lambda obj: Entity.wrap(obj, gateway), AtDict()
+            )
+        payload = pack_summon_specs(specs)
+        results = None
+        shared = get_shared_buffer()
+        if shared is not None:
+            with shared.lock:
+                if shared.write(payload):
+                    offset = self.mngr.call(
+                        "summonManyShared", (self, len(payload), middleman), int
+                    )
+                    if offset >= 0:
+                        (count,) = struct.unpack_from("<i", payload)
+                        size = count * SUMMON_RESULT_SIZE
+                        results = unpack_summon_results(
+                            shared.view[offset : offset + size]
+                        )
+        if results is None:
+            results = unpack_summon_results(
+                self.mngr.call("summonMany", (self, payload, middleman), bytes)
+            )
+        uuids, task_ids = results
+        if middleman is not None:
+            # 各实体的任务共用同一个回调，全部移出执行器后才释放
+            self.mngr.executor.bind_shared(
+                middleman, [task_id for task_id in task_ids if task_id >= 0]
+            )
+        return uuids
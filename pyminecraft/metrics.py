@@ -0,0 +1,218 @@
+"""
+运行统计
+
+Java 端按回调 id 统计每次执行的耗时（次数、p50/p99、最大值），
+Python 端按回调函数统计执行次数、耗时与其间的 py4j 调用次数。
+pymc.metrics() 汇总两者，各列表的元素都是扁平的字典，可以直接交给 pandas：
+
+    df = pandas.DataFrame(pymc.metrics()["tasks"])
+    print(df.sort_values("total_ms", ascending=False).head())
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+import struct
+import threading
+import time
+
+from .connection import get_gateway
+
+__all__ = ("CallMetrics", "CALL_METRICS", "metrics")
+
+
+def label_of(func: Callable[..., Any]) -> str:
+    """回调函数的统计名称，模块名.限定名"""
+    module = getattr(func, "__module__", None) or "?"
+    return f"{module}.{getattr(func, '__qualname__', repr(func))}"
+
+
+class CallbackStats:
+    """单个回调函数的 Python 端统计"""
+
+    __slots__ = ("label", "calls", "py4j_calls", "total_ns", "max_ns")
+
+    label: str
+    calls: int
+    py4j_calls: int
+    total_ns: int
+    max_ns: int
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.calls = 0
+        self.py4j_calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, spent_ns: int) -> None:
+        """记录一次回调的耗时，调用方需持有 CallMetrics 的锁"""
+        self.calls += 1
+        self.total_ns += spent_ns
+        self.max_ns = max(self.max_ns, spent_ns)
+
+    def as_dict(self) -> dict[str, Any]:
+        """转为扁平字典，耗时单位为毫秒"""
+        return {
+            "label": self.label,
+            "calls": self.calls,
+            "py4j_calls": self.py4j_calls,
+            "py4j_per_call": self.py4j_calls / self.calls if self.calls else 0.0,
+            "total_ms": self.total_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+class CallMetrics:
+    """
+    Python 端调用统计
+
+    Middleman 执行回调期间，经由 JavaObjectProxy 发起的 py4j 调用计入该回调函数；
+    回调之外的调用计入 outside_calls。执行器返回的任务 id 与回调函数的对应关系
+    用于在 metrics() 中标注 Java 端的统计。可以在多个回调线程中同时使用。
+    """
+
+    MAX_TASKS = 4096
+
+    enabled: bool
+    outside_calls: int
+    _stats: dict[str, CallbackStats]
+    _tasks: dict[int, str]
+    _lock: threading.Lock
+    _local: threading.local
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self.outside_calls = 0
+        self._stats = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, enabled: bool = True) -> None:
+        """启用或关闭统计"""
+        self.enabled = enabled
+
+    def bind(self, task_id: int, func: Callable[..., Any]) -> None:
+        """记录任务 id 对应的回调函数，最多保留最近的 MAX_TASKS 个"""
+        label = label_of(func)
+        with self._lock:
+            self._tasks[task_id] = label
+            if len(self._tasks) > self.MAX_TASKS:
+                del self._tasks[next(iter(self._tasks))]
+
+    def enter(
+        self, func: Callable[..., Any]
+    ) -> tuple[CallbackStats, CallbackStats | None] | None:
+        """
+        进入回调
+
+        Returns:
+            交给 exit 的标记：该回调的统计与外层（嵌套时）正在统计的回调，未启用时为None
+        """
+        if not self.enabled:
+            return None
+        label = label_of(func)
+        with self._lock:
+            stats = self._stats.get(label)
+            if stats is None:
+                stats = self._stats[label] = CallbackStats(label)
+        previous: CallbackStats | None = getattr(self._local, "current", None)
+        self._local.current = stats
+        return stats, previous
+
+    def exit(
+        self, token: tuple[CallbackStats, CallbackStats | None] | None, start_ns: int
+    ) -> None:
+        """离开回调，记录耗时"""
+        if token is None:
+            return
+        stats, previous = token
+        spent = time.perf_counter_ns() - start_ns
+        with self._lock:
+            stats.record(spent)
+        self._local.current = previous
+
+    def count(self) -> None:
+        """记录一次 py4j 调用"""
+        if not self.enabled:
+            return
+        stats: CallbackStats | None = getattr(self._local, "current", None)
+        with self._lock:
+            if stats is None:
+                self.outside_calls += 1
+            else:
+                stats.py4j_calls += 1
+
+    def label(self, task_id: int) -> str | None:
+        """任务 id 对应的回调函数"""
+        return self._tasks.get(task_id)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """全部回调函数的统计"""
+        with self._lock:
+            return [stats.as_dict() for stats in self._stats.values()]
+
+    def reset(self) -> None:
+        """清空统计，保留任务 id 的对应关系"""
+        with self._lock:
+            self.outside_calls = 0
+            self._stats.clear()
+
+
+CALL_METRICS = CallMetrics()
+
+
+def unpack_callback_metrics(data: bytes) -> list[dict[str, Any]]:
+    """解码 PymcMngr.packCallbackMetrics 返回的数据，耗时单位为毫秒"""
+    view = memoryview(data)
+    (count,) = struct.unpack_from("<i", view)
+    offset = 4
+    rows: list[dict[str, Any]] = []
+    for _ in range(count):
+        task_id, length = struct.unpack_from("<ii", view, offset)
+        offset += 8
+        name = str(view[offset : offset + length], "utf-8")
+        offset += length
+        calls, total, max_ns, p50, p99, deferred = struct.unpack_from(
+            "<6q", view, offset
+        )
+        offset += 48
+        rows.append(
+            {
+                "id": task_id,
+                "event": name,
+                "label": CALL_METRICS.label(task_id),
+                "count": calls,
+                "total_ms": total / 1e6,
+                "mean_ms": total / calls / 1e6 if calls else 0.0,
+                "p50_ms": p50 / 1e6,
+                "p99_ms": p99 / 1e6,
+                "max_ms": max_ns / 1e6,
+                "deferred": deferred,
+            }
+        )
+    return rows
+
+
+def metrics(reset: bool = False) -> dict[str, Any]:
+    """
+    获取运行统计
+
+    Args:
+        reset (bool): 获取后是否清空 Java 端与 Python 端的统计
+
+    Returns:
+        dict: tasks 为 Java 端各任务的耗时与因超出 tick 预算推迟的次数（按执行器任务 id），
+            callbacks 为 Python 端各回调函数的耗时与 py4j 调用次数，
+            outside_py4j_calls 为回调之外的 py4j 调用次数
+    """
+    data: bytes = get_gateway().entry_point.packCallbackMetrics(reset)
+    result = {
+        "tasks": unpack_callback_metrics(data),
+        "callbacks": CALL_METRICS.snapshot(),
+        "outside_py4j_calls": CALL_METRICS.outside_calls,
+    }
+    if reset:
+        CALL_METRICS.reset()
+    return result
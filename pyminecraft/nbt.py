@@ -0,0 +1,293 @@
+"""
+NBT 标签类型与二进制编码
+
+整棵 NBT 树在 Python 端编码为二进制 NBT（与 Java 端 NbtIo 的格式一致），
+一次调用即可在 Java 端还原，无需逐个元素跨语言调用。
+
+未标注类型的值按以下规则推断：
+bool -> Byte，int -> Int（超出范围时为 Long），float -> Double，str -> String，
+list/tuple -> List，dict -> Compound。
+"""
+
+from __future__ import annotations
+
+from typing import Any, ClassVar, Iterable, Mapping, SupportsFloat, SupportsInt
+import struct
+
+__all__ = (
+    "NbtTag",
+    "NbtByte",
+    "NbtShort",
+    "NbtInt",
+    "NbtLong",
+    "NbtFloat",
+    "NbtDouble",
+    "NbtByteArray",
+    "NbtIntArray",
+    "NbtLongArray",
+    "dumps",
+)
+
+# 标签类型 id，与 net.minecraft.nbt.NbtElement 中的常量一致
+END = 0
+BYTE = 1
+SHORT = 2
+INT = 3
+LONG = 4
+FLOAT = 5
+DOUBLE = 6
+BYTE_ARRAY = 7
+STRING = 8
+LIST = 9
+COMPOUND = 10
+INT_ARRAY = 11
+LONG_ARRAY = 12
+
+INT_MIN, INT_MAX = -(2**31), 2**31 - 1
+
+
+class NbtTag:
+    """带显式类型的 NBT 值"""
+
+    __slots__ = ("value",)
+
+    TYPE: ClassVar[int]
+    FORMAT: ClassVar[str]
+
+    value: Any
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.value!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.value))
+
+    def pack(self) -> bytes:
+        """标签内容（不含类型与名称）"""
+        return struct.pack(self.FORMAT, self.value)
+
+    def write(self, out: bytearray) -> None:
+        """写入标签内容（不含类型与名称）"""
+        out += self.pack()
+
+
+class NbtByte(NbtTag):
+    """8 位整数，bool 会被编码为 0/1"""
+
+    __slots__ = ()
+    TYPE = BYTE
+    FORMAT = ">b"
+
+    def __init__(self, value: SupportsInt) -> None:
+        super().__init__(int(value))
+
+
+class NbtShort(NbtTag):
+    """16 位整数"""
+
+    __slots__ = ()
+    TYPE = SHORT
+    FORMAT = ">h"
+
+    def __init__(self, value: SupportsInt) -> None:
+        super().__init__(int(value))
+
+
+class NbtInt(NbtTag):
+    """32 位整数"""
+
+    __slots__ = ()
+    TYPE = INT
+    FORMAT = ">i"
+
+    def __init__(self, value: SupportsInt) -> None:
+        super().__init__(int(value))
+
+
+class NbtLong(NbtTag):
+    """64 位整数"""
+
+    __slots__ = ()
+    TYPE = LONG
+    FORMAT = ">q"
+
+    def __init__(self, value: SupportsInt) -> None:
+        super().__init__(int(value))
+
+
+class NbtFloat(NbtTag):
+    """32 位浮点数"""
+
+    __slots__ = ()
+    TYPE = FLOAT
+    FORMAT = ">f"
+
+    def __init__(self, value: SupportsFloat) -> None:
+        super().__init__(float(value))
+
+
+class NbtDouble(NbtTag):
+    """64 位浮点数"""
+
+    __slots__ = ()
+    TYPE = DOUBLE
+    FORMAT = ">d"
+
+    def __init__(self, value: SupportsFloat) -> None:
+        super().__init__(float(value))
+
+
+class NbtArray(NbtTag):
+    """定长整数数组基类，FORMAT 为单个元素的格式字符"""
+
+    __slots__ = ()
+
+    def __init__(self, values: Iterable[SupportsInt]) -> None:
+        super().__init__(tuple(int(v) for v in values))
+
+    def pack(self) -> bytes:
+        return struct.pack(
+            f">i{len(self.value)}{self.FORMAT}", len(self.value), *self.value
+        )
+
+
+class NbtByteArray(NbtArray):
+    """8 位整数数组"""
+
+    __slots__ = ()
+    TYPE = BYTE_ARRAY
+    FORMAT = "b"
+
+
+class NbtIntArray(NbtArray):
+    """32 位整数数组"""
+
+    __slots__ = ()
+    TYPE = INT_ARRAY
+    FORMAT = "i"
+
+
+class NbtLongArray(NbtArray):
+    """64 位整数数组"""
+
+    __slots__ = ()
+    TYPE = LONG_ARRAY
+    FORMAT = "q"
+
+
+def write_string(out: bytearray, value: str) -> None:
+    """写入 Java 的 modified UTF-8 字符串（DataOutput.writeUTF）"""
+    if value.isascii() and "\0" not in value:
+        data = value.encode("ascii")
+    else:
+        data = b"".join(
+            (
+                b"\xc0\x80"
+                if c == "\0"
+                else (
+                    _surrogates(c)
+                    if ord(c) > 0xFFFF
+                    else c.encode("utf-8", "surrogatepass")
+                )
+            )
+            for c in value
+        )
+    if len(data) > 0xFFFF:
+        raise ValueError(f"String too long for NBT: {len(data)} bytes")
+    out += struct.pack(">H", len(data))
+    out += data
+
+
+def _surrogates(char: str) -> bytes:
+    """补充平面字符拆分为两个代理项，各自按 3 字节编码"""
+    code = ord(char) - 0x10000
+    high, low = 0xD800 + (code >> 10), 0xDC00 + (code & 0x3FF)
+    return (chr(high) + chr(low)).encode("utf-8", "surrogatepass")
+
+
+_INFERRED_TYPES: tuple[tuple[type | tuple[type, ...], int], ...] = (
+    (bool, BYTE),
+    (float, DOUBLE),
+    (str, STRING),
+    ((list, tuple), LIST),
+    (Mapping, COMPOUND),
+)
+
+
+def tag_type(value: Any) -> int:
+    """推断值的标签类型"""
+    if isinstance(value, NbtTag):
+        return value.TYPE
+    if isinstance(value, int) and not isinstance(value, bool):
+        return INT if INT_MIN <= value <= INT_MAX else LONG
+    for types, kind in _INFERRED_TYPES:
+        if isinstance(value, types):
+            return kind
+    raise TypeError(f"Cannot encode {type(value).__name__} as NBT: {value!r}")
+
+
+def write_value(out: bytearray, value: Any, kind: int) -> None:
+    """按指定的标签类型写入值的内容"""
+    if isinstance(value, NbtTag):
+        value.write(out)
+    elif kind == BYTE:
+        out += struct.pack(">b", value)
+    elif kind == INT:
+        out += struct.pack(">i", value)
+    elif kind == LONG:
+        out += struct.pack(">q", value)
+    elif kind == DOUBLE:
+        out += struct.pack(">d", value)
+    elif kind == STRING:
+        write_string(out, value)
+    elif kind == LIST:
+        write_list(out, value)
+    elif kind == COMPOUND:
+        write_compound(out, value)
+    else:
+        raise TypeError(f"Cannot encode {value!r} as NBT type {kind}")
+
+
+def write_list(out: bytearray, values: Iterable[Any]) -> None:
+    """写入列表，元素类型必须一致；Int 与 Long 混合时统一为 Long"""
+    values = list(values)
+    kinds = {tag_type(value) for value in values}
+    if kinds == {INT, LONG} and not any(isinstance(v, NbtTag) for v in values):
+        kinds = {LONG}
+    if len(kinds) > 1:
+        raise TypeError(f"NBT list elements must share one type: {values!r}")
+    kind = kinds.pop() if kinds else END
+    out += struct.pack(">bi", kind, len(values))
+    for value in values:
+        write_value(out, value, kind)
+
+
+def write_compound(out: bytearray, values: Mapping[str, Any]) -> None:
+    """写入 compound，以 End 标签结尾"""
+    for key, value in values.items():
+        kind = tag_type(value)
+        out.append(kind)
+        write_string(out, key)
+        write_value(out, value, kind)
+    out.append(END)
+
+
+def dumps(compound: Mapping[str, Any]) -> bytes:
+    """
+    将 compound 编码为二进制 NBT（根标签名称为空，未压缩）
+
+    Raises:
+        TypeError: 存在无法编码的值，或列表元素类型不一致
+    """
+    out = bytearray((COMPOUND,))
+    write_string(out, "")
+    write_compound(out, compound)
+    return bytes(out)
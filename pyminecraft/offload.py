@@ -0,0 +1,302 @@
+"""
+进程池卸载
+
+回调在服务器线程等待时同步执行，耗 CPU 的计算（寻路、地形生成等）会直接拉长 tick。
+Offload.submit 在回调中立即序列化输入（快照），在进程池中执行纯 Python 函数，
+函数返回的修改（命令、方块、实体写入）在之后某个 tick 开始时一次执行：
+
+    def plan(uuids, pos):  # 模块级函数，在子进程中执行，不能使用 py4j 对象
+        return [pymc.MoveEntity(u, p + (0, 1, 0)) for u, p in zip(uuids, pos)]
+
+    @pymc.At("tick", pymc.Every(20))
+    def tick(server, _):
+        snap = server.snapshot_entities("@e[type=zombie]", ("uuid", "pos"))
+        pymc.offload(plan, snap["uuid"], snap["pos"])
+
+- 结果按提交顺序执行：较早提交的任务完成前，之后完成的结果不会执行
+- 同时未执行的任务数达到 max_pending 时不再提交，submit 返回None并计入 rejected，
+  服务器线程不会因此等待
+- 子进程默认以 forkserver 启动（不支持时为 spawn），不会复制已有 py4j 线程的进程；
+  子进程会导入被调用函数所在的模块，脚本中注册回调的代码需放在
+  if __name__ == "__main__": 中
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import BrokenExecutor, Future
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    NamedTuple,
+    Sequence,
+    TYPE_CHECKING,
+)
+import importlib
+import pickle
+import threading
+import time
+
+from .at import At, Running, Priority
+from .javaobj import Server
+from .utils import LOGGER
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# multiprocessing 与 concurrent.futures.process 导入较慢，第一次提交任务时才导入
+
+__all__ = (
+    "Mutation",
+    "Command",
+    "SetBlock",
+    "MoveEntity",
+    "SetVelocity",
+    "Offload",
+    "OFFLOAD",
+    "offload",
+)
+
+
+def _coord(value: float) -> str:
+    """命令中的坐标，Minecraft 不接受科学计数法"""
+    return format(float(value), "f")
+
+
+class Command(NamedTuple):
+    """执行一条命令"""
+
+    command: str
+
+    def to_command(self) -> str:
+        """转为命令"""
+        return self.command
+
+
+class SetBlock(NamedTuple):
+    """在主世界放置方块，其他维度请使用 Command("execute in ... run setblock ...")"""
+
+    pos: Sequence[int]
+    block: str
+
+    def to_command(self) -> str:
+        """转为命令"""
+        x, y, z = self.pos
+        return f"setblock {int(x)} {int(y)} {int(z)} {self.block}"
+
+
+class MoveEntity(NamedTuple):
+    """按 UUID 传送实体"""
+
+    uuid: str
+    pos: Sequence[float]
+
+    def to_command(self) -> str:
+        """转为命令"""
+        return f"tp {self.uuid} {' '.join(_coord(v) for v in self.pos)}"
+
+
+class SetVelocity(NamedTuple):
+    """按 UUID 设置实体速度（对玩家无效）"""
+
+    uuid: str
+    velocity: Sequence[float]
+
+    def to_command(self) -> str:
+        """转为命令"""
+        motion = ",".join(f"{_coord(v)}d" for v in self.velocity)
+        return f"data merge entity {self.uuid} {{Motion:[{motion}]}}"
+
+
+# 卸载任务返回的修改，各自转为一条命令执行，其他修改请使用 Command
+type Mutation = Command | SetBlock | MoveEntity | SetVelocity
+
+
+def _run(payload: bytes) -> list[Mutation]:
+    """在子进程中执行 submit 提交的函数"""
+    func, args = pickle.loads(payload)
+    result = func(*args)
+    return [] if result is None else list(result)
+
+
+class Offload:
+    """
+    进程池与待执行结果队列
+
+    进程池在第一次提交时创建；有未执行的任务时注册一个高优先级的 tick 任务，
+    每个 tick 开始时执行已完成的结果，队列清空后自行取消。
+    """
+
+    # 执行结果的 tick 任务的优先级，高于普通任务，在 tick 开始时执行
+    APPLY_PRIORITY = 1 << 20
+    # 执行命令时的命令源名称
+    COMMAND_SOURCE = "PYMC"
+
+    max_pending: int
+    _pool_args: tuple[int | None, str | None]
+    _pool: ProcessPoolExecutor | None
+    _pending: deque[tuple[Future[list[Mutation]], int, ProcessPoolExecutor]]
+    _applier: At[Server] | None
+    _lock: threading.Lock
+    _counters: dict[str, int]
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_pending: int = 16,
+        mp_context: str | None = None,
+    ) -> None:
+        """
+        Args:
+            max_workers (int | None): 子进程数量，默认为 CPU 数量
+            max_pending (int): 同时未执行的任务数量上限
+            mp_context (str | None): multiprocessing 启动方式，默认为 forkserver（不支持时为 spawn）。
+                进程池在回调中创建，此时已有 py4j 线程，不应使用 fork
+        """
+        if max_pending <= 0:
+            raise ValueError(f"max_pending must be positive: {max_pending}")
+        self.max_pending = max_pending
+        self._pool_args = (max_workers, mp_context)
+        self._pool = None
+        self._pending = deque()
+        self._applier = None
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ("submitted", "rejected", "completed", "failed", "applied", "errors"), 0
+        )
+        self._counters["latency_max_ns"] = 0
+
+    def submit(
+        self, func: Callable[..., Iterable[Mutation] | None], *args: Any
+    ) -> Future[list[Mutation]] | None:
+        """
+        在进程池中执行 func(*args)，返回的修改在之后某个 tick 开始时执行
+
+        参数在调用时立即序列化，之后修改参数不影响执行。
+
+        Args:
+            func: 模块级函数，返回修改的序列或None
+            *args: 可序列化的参数，不能包含 py4j 对象
+
+        Returns:
+            Future | None: 子进程执行结果，队列已满时为None
+
+        Raises:
+            TypeError: 函数或参数无法序列化
+        """
+        try:
+            payload = pickle.dumps((func, args), pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise TypeError(
+                f"Offloaded function and arguments must be picklable: {e}"
+            ) from e
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self._counters["rejected"] += 1
+                return None
+            pool = self.pool
+            future = pool.submit(_run, payload)
+            self._pending.append((future, time.perf_counter_ns(), pool))
+            self._counters["submitted"] += 1
+            if self._applier is None:
+                self._applier = At(
+                    "tick",
+                    Running.always(),
+                    Priority(self.APPLY_PRIORITY),
+                    arg_type=Server,
+                )
+                self._applier(self._apply)
+        return future
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """进程池，第一次使用时创建"""
+        if self._pool is None:
+            multiprocessing = importlib.import_module("multiprocessing")
+            process = importlib.import_module("concurrent.futures.process")
+            max_workers, method = self._pool_args
+            if method is None:
+                methods = multiprocessing.get_all_start_methods()
+                method = "forkserver" if "forkserver" in methods else "spawn"
+            self._pool = process.ProcessPoolExecutor(
+                max_workers, mp_context=multiprocessing.get_context(method)
+            )
+        return self._pool
+
+    def _apply(self, server: Server, _data: Any) -> None:
+        """执行已完成的结果，队列清空后取消 tick 任务"""
+        commands: list[str] = []
+        with self._lock:
+            while self._pending and self._pending[0][0].done():
+                future, submitted, pool = self._pending.popleft()
+                self._counters["latency_max_ns"] = max(
+                    self._counters["latency_max_ns"], time.perf_counter_ns() - submitted
+                )
+                error = future.exception()
+                if error is None:
+                    self._counters["completed"] += 1
+                    commands.extend(
+                        mutation.to_command() for mutation in future.result()
+                    )
+                    continue
+                self._counters["failed"] += 1
+                if not isinstance(error, BrokenExecutor):
+                    LOGGER.error("Offloaded task failed", exc_info=error)
+                    continue
+                # 子进程异常退出后进程池不再可用，下一次提交时重新创建
+                LOGGER.error(
+                    "Offload process pool is broken, recreating", exc_info=error
+                )
+                if self._pool is pool:
+                    self._pool = None
+                    pool.shutdown(wait=False)
+            if not self._pending and self._applier is not None:
+                self._applier.cancel()
+                self._applier = None
+        if commands:
+            results = server.mngr.execute_commands(commands, self.COMMAND_SOURCE)
+            with self._lock:
+                self._counters["applied"] += len(commands)
+                self._counters["errors"] += results.count(0)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        队列与背压统计
+
+        Returns:
+            dict: pending 为未执行的任务数，submitted/rejected 为提交与因队列已满被拒绝的次数，
+                completed/failed 为成功与抛出异常的任务数，applied/errors 为执行的命令数
+                与其中返回 0 的命令数，latency_max_ms 为提交到开始执行结果的最长时间
+        """
+        with self._lock:
+            stats: dict[str, Any] = {
+                "pending": len(self._pending),
+                "max_pending": self.max_pending,
+                **self._counters,
+            }
+        stats["latency_max_ms"] = stats.pop("latency_max_ns") / 1e6
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭进程池，丢弃未执行的结果"""
+        with self._lock:
+            if self._applier is not None:
+                self._applier.cancel()
+                self._applier = None
+            for future, _, _ in self._pending:
+                future.cancel()
+            self._pending.clear()
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+OFFLOAD = Offload()
+
+
+def offload(
+    func: Callable[..., Iterable[Mutation] | None], *args: Any
+) -> Future[list[Mutation]] | None:
+    """在默认进程池中执行 func(*args)，详见 Offload.submit"""
+    return OFFLOAD.submit(func, *args)
@@ -0,0 +1,477 @@
+"""Java对象代理基类"""
+
+from __future__ import annotations
+
+from typing import (
+    Callable,
+    overload,
+    Any,
+    Literal,
+    Iterable,
+    ClassVar,
+    Self,
+    TYPE_CHECKING,
+)
+from collections.abc import Sequence
+
+from .cache import READ_CACHE, MEMBER_CACHE, PROXY_TABLE
+from .metrics import CALL_METRICS
+from .refs import REFERENCES
+from .buffer import WRITE_BUFFER
+from .vec import Vec3
+from .utils import py4j_names
+
+if TYPE_CHECKING:
+    from py4j.java_gateway import JavaObject, JavaGateway
+    from py4j.java_collections import JavaList
+    from .javaobj import PymcMngr
+
+__all__ = ("JavaObjectProxy", "JavaListProxy", "JavaClassFactory")
+
+
+class JavaObjectProxy:
+    """
+    Java对象代理基类
+
+    用于包装Java对象，提供统一的访问接口。
+    代理对象数量可能很多（如大量实体），子类均使用 __slots__ 且不应添加实例属性
+    """
+
+    __slots__ = ("_obj", "_gateway", "_constants", "__weakref__")
+
+    _obj: JavaObject
+    _gateway: JavaGateway
+    _constants: dict[str, Any] | None
+
+    # pymc管理器的代理类型，定义 PymcMngr 时设置，使本模块不需要导入 javaobj
+    mngr_type: ClassVar[type[PymcMngr]]
+
+    def __init__(self, java_object: JavaObject, java_gateway: JavaGateway):
+        """初始化Java对象代理"""
+        self._obj = java_object
+        self._gateway = java_gateway
+        self._constants = None
+        REFERENCES.track(java_object)
+
+    @classmethod
+    def wrap(cls, java_object: JavaObject, java_gateway: JavaGateway) -> Self:
+        """
+        包装Java对象
+
+        启用 PROXY_TABLE 时，同一 py4j 对象（相同 target id）以同一类型包装时返回同一代理
+        """
+        if PROXY_TABLE.enabled and java_object is not None:
+            return PROXY_TABLE.intern(
+                java_gateway,
+                cls,
+                getattr(java_object, "_target_id", ""),
+                lambda: cls(java_object, java_gateway),
+            )
+        return cls(java_object, java_gateway)
+
+    @property
+    def mngr(self) -> PymcMngr:
+        """获取pymc管理器"""
+        if isinstance(self, self.mngr_type):
+            return self
+
+        return self.mngr_type.from_gateway(self._gateway)
+
+    @property
+    def class_factory(self) -> JavaClassFactory:
+        """获取JavaGateway实例"""
+        if isinstance(self, JavaClassFactory):
+            return self
+
+        return JavaClassFactory.from_gateway(self._gateway)
+
+    @property
+    def obj(self) -> JavaObject:
+        """获取Java对象"""
+        return self._obj
+
+    @property
+    def gateway(self) -> JavaGateway:
+        """获取Java对象对应的JavaGateway"""
+        return self._gateway
+
+    @property
+    def target_id(self) -> str:
+        """py4j 中Java对象的id"""
+        return getattr(self._obj, "_target_id", "")
+
+    def java_arg(self, arg: Any) -> Any:
+        """
+        将参数转为可传给Java的值
+
+        包装后的对象使用本身；Vec3 在此时才创建对应的 Java Vec3d。
+        参数有待提交的缓冲写入时先提交
+        """
+        if isinstance(arg, JavaObjectProxy):
+            WRITE_BUFFER.sync(arg.target_id)
+            return arg.obj
+        if isinstance(arg, Vec3):
+            return self.class_factory.new(
+                "net.minecraft.util.math.Vec3d", tuple(float(w) for w in arg.xyz)
+            ).obj
+        return arg
+
+    def cached[T](
+        self, key: str, compute: Callable[[], T], lifetime: bool = False
+    ) -> T:
+        """
+        带缓存的读取
+
+        Args:
+            key (str): 缓存键，通常为getter名称
+            compute: 未命中时的读取函数
+            lifetime (bool): 值在对象生命周期内不变（如uuid），缓存到代理对象上
+
+        Returns:
+            T: 读取的值
+        """
+        if lifetime:
+            constants = self._constants
+            if constants is None:
+                constants = self._constants = {}
+            if key not in constants:
+                constants[key] = compute()
+            return constants[key]
+        if READ_CACHE.active:
+            return READ_CACHE.get(self.target_id, key, compute)
+        return compute()
+
+    @overload
+    def proxy(self, obj: JavaObject) -> JavaObjectProxy: ...
+
+    @overload
+    def proxy[T](self, obj: Any, cls: type[T]) -> T: ...
+    @overload
+    def proxy[T](self, obj: Any, cls: type[T] | None) -> T | JavaObjectProxy: ...
+    def proxy[T](self, obj: Any, cls: type[T] | None = None) -> T | JavaObjectProxy:
+        """
+        代理对象
+
+        Args:
+            obj: Java对象
+            cls: 代理对象类型
+        """
+        if cls is None:
+            return JavaObjectProxy.wrap(obj, self._gateway)
+
+        if isinstance(obj, cls):
+            return obj
+
+        if not issubclass(cls, JavaObjectProxy):
+            raise TypeError(f"{cls} is not a JavaObjectProxy and {obj} is not a {cls}")
+
+        return cls.wrap(obj, self._gateway)  # 元素是 JavaObject ，使用cls包装
+
+    def proxy_list[T](self, obj: Any, cls: type[T]) -> JavaListProxy[T]:
+        """列表代理"""
+        return JavaListProxy(obj, self._gateway, cls)
+
+    @overload
+    def call[T](self, path: str, args: Iterable[Any], ret: type[T]) -> T: ...
+    @overload
+    def call(self, path: str, args: Iterable[Any], ret: None) -> None: ...
+    @overload
+    def call(self, path: str, args: Iterable[Any] = ()) -> JavaObjectProxy: ...
+
+    def call[T](
+        self,
+        path: str,
+        args: Iterable[Any] = (),
+        ret: type[T] | None | Literal["JavaObjectProxy"] = "JavaObjectProxy",
+    ) -> T | JavaObjectProxy | None:
+        """
+        调用指定路径的方法
+
+        Args:
+            path: 方法路径
+            cls: 返回值类型
+            args: 方法参数
+
+        Returns:
+            返回值
+        """
+        if ret is None and WRITE_BUFFER.pipelined:
+            args = tuple(args)
+            if WRITE_BUFFER.record_call(self, path, args):
+                return None
+        WRITE_BUFFER.sync(self.target_id)
+
+        func = self.member(path)
+        CALL_METRICS.count()
+        obj: Any = func(*[self.java_arg(arg) for arg in args]) if args else func()
+
+        if ret is None:
+            READ_CACHE.invalidate(self.target_id)
+
+        if obj is None and ret is None:
+            return None
+
+        if ret is None or obj is None:
+            raise TypeError(f"{path} not return type {ret} but {type(obj)}")
+
+        return self.proxy(obj, JavaObjectProxy if ret == "JavaObjectProxy" else ret)
+
+    def member(self, path: str) -> Callable[..., Any]:
+        """
+        获取Java对象的方法
+
+        同一代理类已确认为方法的名称直接创建 py4j 方法对象，跳过 auto_field 的字段查询，
+        详见 MemberCache
+        """
+        names = py4j_names()
+        obj = self._obj
+        key = (type(self), path)
+        if isinstance(obj, names.JavaObject) and MEMBER_CACHE.is_method(
+            self._gateway, key
+        ):
+            return names.get_method(obj, path)
+        func = getattr(obj, path)
+        if not callable(func):
+            raise TypeError(f"{path} is not a function")
+        if isinstance(func, names.JavaMember):
+            MEMBER_CACHE.add_method(key)
+        return func
+
+    @overload
+    def call_list[T](
+        self, path: str, args: Iterable[Any], ret: type[T]
+    ) -> JavaListProxy[T]: ...
+
+    @overload
+    def call_list(
+        self, path: str, args: Iterable[Any] = ()
+    ) -> JavaListProxy[JavaObjectProxy]: ...
+    def call_list[T](
+        self, path: str, args: Iterable[Any] = (), ret: type[T] | None = None
+    ) -> JavaListProxy[T] | JavaListProxy[JavaObjectProxy]:
+        """
+        调用指定路径的方法（返回列表）
+
+        Args:
+            path: 方法路径
+            cls: 返回值类型
+            args: 方法参数
+
+        Returns:
+            列表返回值
+        """
+        java_list = self.call(path, args, py4j_names().JavaList)
+        if ret is None:
+            return self.new_list(java_list)
+        return self.new_list(java_list, ret)
+
+    @overload
+    def get(self, path: str) -> JavaObjectProxy: ...
+
+    @overload
+    def get[T](self, path: str, cls: type[T]) -> T: ...
+
+    @overload
+    def get[T](self, path: str, cls: type[T] | None = None) -> T | JavaObjectProxy: ...
+
+    def get[T](self, path: str, cls: type[T] | None = None) -> T | JavaObjectProxy:
+        """
+        从Java对象中获取指定路径的值
+
+        Args:
+            cls (type[T]): 如果是java对象代理类，就返回对应的Java对象代理；否则判断并直接返回值
+            path (str): 要获取的值
+
+        Returns:
+            T: 生成的Java对象代理
+        """
+        WRITE_BUFFER.sync(self.target_id)
+        CALL_METRICS.count()
+        return self.proxy(py4j_names().get_field(self._obj, path), cls)
+
+    def get_list[T](self, path: str, cls: type[T]) -> JavaListProxy[T]:
+        """从Java对象中获取指定路径的列表
+
+        Args:
+            cls (type[T]): 列表中元素的类型
+            path (str): 要获取的列表
+
+        Returns:
+            JavaListProxy[T]: 生成的Java列表代理
+        """
+        WRITE_BUFFER.sync(self.target_id)
+        CALL_METRICS.count()
+        return self.proxy_list(py4j_names().get_field(self._obj, path), cls)
+
+    @overload
+    def new_list[T](self, java_list: JavaList, cls: type[T]) -> JavaListProxy[T]: ...
+
+    @overload
+    def new_list(self, java_list: JavaList) -> JavaListProxy[JavaObjectProxy]: ...
+
+    def new_list[T](
+        self, java_list: JavaList, cls: type[T] | None = None
+    ) -> JavaListProxy[T] | JavaListProxy[JavaObjectProxy]:
+        """
+        生成Java对象列表代理
+
+        Args:
+            cls (type[T]): 要生成的Java对象列表代理类
+            java_list (JavaList): 要包装的Java对象列表
+
+        Returns:
+            T: 生成的Java对象列表代理
+        """
+        if cls is None:
+            return JavaListProxy(java_list, self._gateway, JavaObjectProxy)
+        return JavaListProxy(java_list, self._gateway, cls)
+
+    def __bool__(self) -> bool:
+        """判断Java对象是否存在，不访问JVM"""
+        return self._obj is not None
+
+    def __str__(self) -> str:
+        """将Java对象转换为字符串"""
+        return str(self._obj)
+
+    def is_null(self) -> bool:
+        """
+        检查对象是否为null
+
+        py4j 将Java的null转为None，因此只需在本地判断，不访问JVM
+        """
+        return self._obj is None
+
+
+class JavaListProxy[T](JavaObjectProxy, Sequence[T]):
+    """Java列表包装类"""
+
+    __slots__ = ("_list", "_item_handler_type")
+
+    _list: JavaList
+    _item_handler_type: type[T]
+
+    def __init__(
+        self,
+        java_list: JavaList,
+        java_gateway: JavaGateway,
+        item_handler_type: type[T],
+    ):
+        """
+        初始化Java列表代理
+
+        Args:
+            java_list (JavaList): 要包装的Java列表
+            item_handler_type (type[T]): 列表项代理的类型
+        """
+        super().__init__(java_list, java_gateway)
+        self._list = java_list
+        self._item_handler_type = item_handler_type
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | Sequence[T]:
+        """获取指定索引处的元素"""
+        CALL_METRICS.count()
+        if isinstance(index, slice):
+            # 处理切片
+            sliced_list = self._list[index]
+            return JavaListProxy(sliced_list, self._gateway, self._item_handler_type)
+        return (
+            self.proxy(self._list[index], self._item_handler_type)
+            if issubclass(self._item_handler_type, JavaObjectProxy)
+            else self._list[index]
+        )
+
+    def __len__(self) -> int:
+        """返回列表长度"""
+        CALL_METRICS.count()
+        return len(self._list)
+
+
+class JavaClassFactory(JavaObjectProxy):
+    """提供java类实例化方法 此类内的路径为绝对路径"""
+
+    __slots__ = ()
+
+    _instance: ClassVar[JavaClassFactory | None] = None
+
+    @staticmethod
+    def from_gateway(gateway: JavaGateway) -> JavaClassFactory:
+        """获取gateway对应的JavaClassFactory实例，同一gateway复用同一实例"""
+        factory = JavaClassFactory._instance
+        if factory is None or factory.gateway is not gateway:
+            factory = JavaClassFactory._instance = JavaClassFactory(
+                gateway.entry_point, gateway
+            )
+        return factory
+
+    @staticmethod
+    def __phrase(clazz: str):
+        return clazz.rpartition(".")
+
+    @overload
+    def new(self, clazz: str, args: Iterable[Any] = ()) -> JavaObjectProxy: ...
+    @overload
+    def new[T](self, clazz: str, args: Iterable[Any], cls: type[T]) -> T: ...
+    @overload
+    def new[T](
+        self, clazz: str, args: Iterable[Any], cls: type[T] | None = None
+    ) -> T | JavaObjectProxy: ...
+    def new[T](
+        self, clazz: str, args: Iterable[Any] = (), cls: type[T] | None = None
+    ) -> T | JavaObjectProxy:
+        """根据类名实例化java类"""
+        return self.call_static(clazz, args, cls)
+
+    @overload
+    def get_static(self, clazz: str) -> JavaObjectProxy: ...
+    @overload
+    def get_static[T](self, clazz: str, cls: type[T]) -> T: ...
+    @overload
+    def get_static[T](
+        self, clazz: str, cls: type[T] | None = None
+    ) -> T | JavaObjectProxy: ...
+    def get_static[T](
+        self, clazz: str, cls: type[T] | None = None
+    ) -> T | JavaObjectProxy:
+        """获取静态类实例"""
+        path, _, field = self.__phrase(clazz)
+        WRITE_BUFFER.sync("")
+        CALL_METRICS.count()
+        return self.proxy(getattr(self.java_class(path), field), cls)
+
+    @overload
+    def call_static(self, clazz: str, args: Iterable[Any]) -> JavaObjectProxy: ...
+    @overload
+    def call_static[T](self, clazz: str, args: Iterable[Any], cls: type[T]) -> T: ...
+    @overload
+    def call_static[T](
+        self, clazz: str, args: Iterable[Any], cls: type[T] | None = None
+    ) -> T | JavaObjectProxy: ...
+    def call_static[T](
+        self, clazz: str, args: Iterable[Any], cls: type[T] | None = None
+    ) -> T | JavaObjectProxy:
+        """调用静态方法"""
+        path, _, method = self.__phrase(clazz)
+        WRITE_BUFFER.sync("")
+        func = MEMBER_CACHE.static(
+            self._gateway, clazz, lambda: getattr(self.java_class(path), method)
+        )
+        CALL_METRICS.count()
+        return self.proxy(func(*[self.java_arg(arg) for arg in args]), cls)
+
+    def java_class(self, clazz: str) -> Any:
+        """
+        根据类名获取py4j类引用（或包），按类名缓存，详见 MemberCache
+
+        Args:
+            clazz (str): 类的全限定名
+        """
+        return MEMBER_CACHE.static(
+            self._gateway, clazz, lambda: getattr(self._gateway.jvm, clazz)
+        )
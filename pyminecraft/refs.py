@@ -0,0 +1,203 @@
+"""
+引用管理
+
+py4j 在两端各保留一张引用表：Java 端为返回给 Python 的每个对象保留引用，直到 Python 端
+对应的 JavaObject 被回收后逐个通知释放；Python 端为传给 Java 的每个回调（Middleman）保留引用，
+直到 Java 端回收对应的代理。两者都可能在不再使用后长时间占用内存。
+
+- 执行器中的任务执行完毕、被取消或被清空后，对应 Middleman 的回调函数与附加数据随即释放
+  （一次性任务在执行后、可挂起任务在结束后、取消时立即释放，其余情况由 Java 端记录，
+  Python 端每注册 References.DRAIN_INTERVAL 个任务或离开 scope 时批量取回）
+- scope() 中创建的代理对象，其 Java 端引用在离开时一次释放：
+
+    with pymc.scope():
+        for entity in server.get_entities("@e[type=item]"):
+            entity.velocity = (0, 0.5, 0)
+
+  离开 scope 后不应再使用其中创建的代理对象；执行器等在整个连接期间缓存的对象不受影响。
+- references() 返回两端的引用数量
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+import struct
+import threading
+
+from .buffer import WRITE_BUFFER
+from .connection import get_gateway
+from .utils import py4j_names
+
+__all__ = ("References", "REFERENCES", "scope", "references")
+
+
+class References:
+    """
+    回调与Java对象引用的登记表
+
+    回调按执行器任务 id 登记，任务移出执行器后释放；
+    scope 期间创建的代理对象按 py4j 对象 id 登记，离开 scope 时批量释放。
+    """
+
+    DRAIN_INTERVAL = 256
+
+    _callbacks: dict[int, Any]
+    _executor: Any
+    _binds: int
+    _lock: threading.Lock
+    _local: threading.local
+
+    def __init__(self) -> None:
+        self._callbacks = {}
+        self._executor = None
+        self._binds = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def bind(self, executor: Any, task_id: int, callback: Any) -> None:
+        """
+        登记任务 id 对应的回调
+
+        第一次登记（或重新连接后）时让Java端开始记录移出执行器的任务；
+        每登记 DRAIN_INTERVAL 个回调，释放一次已移出执行器的回调
+        """
+        if self._executor is None or self._executor.gateway is not executor.gateway:
+            with self._lock:
+                self._callbacks.clear()
+            executor.call("setTrackRetired", (True,), None)
+            self._executor = executor
+        with self._lock:
+            self._callbacks[task_id] = callback
+            callback.tasks += 1
+            self._binds += 1
+            drain = self._binds % self.DRAIN_INTERVAL == 0
+        if drain:
+            self.release_retired()
+
+    def release(self, task_id: int | None) -> None:
+        """释放任务 id 对应的回调，回调由多个任务共用时在最后一个任务释放时释放"""
+        if task_id is None:
+            return
+        with self._lock:
+            callback = self._callbacks.pop(task_id, None)
+            if callback is not None:
+                callback.tasks -= 1
+                if callback.tasks > 0:
+                    callback = None
+        if callback is not None:
+            callback.release()
+
+    def release_all(self) -> None:
+        """释放全部回调"""
+        with self._lock:
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            callback.release()
+
+    def release_retired(self) -> int:
+        """
+        取回Java端已移出执行器的任务并释放对应的回调
+
+        Returns:
+            int: 取回的任务数量
+        """
+        if self._executor is None:
+            return 0
+        data: bytes = self._executor.call("drainRetired", (), bytes)
+        for (task_id,) in struct.iter_unpack("<i", data):
+            self.release(task_id)
+        return len(data) // 4
+
+    @property
+    def callback_count(self) -> int:
+        """已登记且尚未释放回调的任务数量"""
+        return len(self._callbacks)
+
+    def track(self, java_object: Any) -> None:
+        """在当前线程的 scope 中登记Java对象，不在 scope 中时忽略"""
+        scopes: list[set[str]] | None = getattr(self._local, "scopes", None)
+        if not scopes:
+            return
+        target_id = getattr(java_object, "_target_id", None)
+        # 只有 "o" 开头的是 py4j 为返回值分配的对象，入口点等特殊对象不释放
+        if target_id is not None and target_id.startswith("o"):
+            scopes[-1].add(target_id)
+
+    def untrack(self, java_object: Any) -> None:
+        """
+        从当前线程的所有 scope 中移除Java对象，离开 scope 时不释放
+
+        用于在 scope 中第一次创建、之后一直缓存使用的对象（如执行器）
+        """
+        target_id = getattr(java_object, "_target_id", None)
+        for tracked in getattr(self._local, "scopes", ()):
+            tracked.discard(target_id)
+
+    def enter_scope(self) -> None:
+        """进入 scope"""
+        if not hasattr(self._local, "scopes"):
+            self._local.scopes = []
+        self._local.scopes.append(set())
+
+    def exit_scope(self) -> int:
+        """
+        离开 scope，一次释放其中登记的Java对象，并释放已移出执行器的回调
+
+        Returns:
+            int: Java端实际释放的对象数量
+        """
+        tracked: set[str] = self._local.scopes.pop()
+        if not tracked:
+            return 0
+        names = py4j_names()
+        gateway = get_gateway()
+        # 缓冲的写入可能引用这些对象，先提交
+        WRITE_BUFFER.flush()
+        # py4j 终结器的键为网关地址、端口与对象 id
+        params = gateway.gateway_parameters
+        prefix = names.smart_decode(params.address) + names.smart_decode(params.port)
+        for target_id in tracked:
+            # 移除 py4j 的终结器，之后 JavaObject 被回收时不再逐个通知Java端
+            names.ThreadSafeFinalizer.remove_finalizer(prefix + target_id)
+        released: int = gateway.entry_point.releaseObjects("\n".join(tracked))
+        self.release_retired()
+        return released
+
+
+REFERENCES = References()
+
+
+@contextmanager
+def scope() -> Iterator[None]:
+    """
+    引用作用域，离开时一次释放其中创建的代理对象在Java端的引用
+
+    可以嵌套，内层离开时只释放内层创建的对象。
+    """
+    REFERENCES.enter_scope()
+    try:
+        yield
+    finally:
+        REFERENCES.exit_scope()
+
+
+def references() -> dict[str, int]:
+    """
+    两端的引用数量，获取前先释放已移出执行器的回调
+
+    Returns:
+        dict: java_objects 为Java端为 Python 保留的对象引用，
+            python_objects 为 Python 端存活的 py4j 对象，
+            python_callbacks 为 Python 端为Java保留的回调，
+            tracked_callbacks 为尚未释放回调函数的执行器任务
+    """
+    REFERENCES.release_retired()
+    gateway = get_gateway()
+    return {
+        "java_objects": gateway.entry_point.countObjects(),
+        "python_objects": len(py4j_names().ThreadSafeFinalizer.finalizers),
+        "python_callbacks": len(gateway.gateway_property.pool),
+        "tracked_callbacks": REFERENCES.callback_count,
+    }
@@ -0,0 +1,89 @@
+"""
+共享内存传输
+
+Connection.connect() 在 Connection.shared_buffer_size 大于 0 时创建一个内存映射文件
+（有 /dev/shm 时位于其中），并让 Java 端 PymcMngr.openSharedBuffer 映射同一文件。
+之后实体快照、批量召唤等批量接口只通过 py4j 传递长度与偏移，数据直接在共享内存中交换。
+Java 端无法映射（如不在同一台机器上）时不启用，批量接口退回 py4j 传输。
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+import threading
+
+from .utils import LOGGER
+
+__all__ = ("SharedBuffer",)
+
+
+class SharedBuffer:
+    """
+    与 Java 端共享的内存映射文件
+
+    同一时刻只能有一个调用使用共享内存，使用期间需持有 lock。
+    """
+
+    path: str
+    size: int
+    lock: threading.Lock
+    _mmap: mmap.mmap
+    _view: memoryview
+
+    def __init__(self, path: str, size: int) -> None:
+        """
+        映射已存在的文件
+
+        Args:
+            path (str): 文件路径
+            size (int): 映射的字节数
+        """
+        self.path = path
+        self.size = size
+        self.lock = threading.Lock()
+        with open(path, "r+b") as file:
+            self._mmap = mmap.mmap(file.fileno(), size)
+        self._view = memoryview(self._mmap)
+
+    @staticmethod
+    def create(size: int) -> SharedBuffer:
+        """创建指定大小的临时文件并映射"""
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        fd, path = tempfile.mkstemp(prefix="pymc-", suffix=".buf", dir=directory)
+        try:
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+        return SharedBuffer(path, size)
+
+    @property
+    def view(self) -> memoryview:
+        """整个共享内存的视图"""
+        return self._view
+
+    def write(self, data: bytes) -> bool:
+        """
+        将数据写入共享内存起始处
+
+        Returns:
+            bool: 是否写入，空间不足时返回False
+        """
+        if len(data) > self.size:
+            return False
+        self._view[: len(data)] = data
+        return True
+
+    def close(self) -> None:
+        """解除映射并删除文件"""
+        try:
+            self._view.release()
+            self._mmap.close()
+        except BufferError:
+            # 仍有零拷贝返回的数组引用共享内存，映射随这些数组一起释放
+            LOGGER.warning("Shared buffer is still referenced, leaving it mapped")
+        try:
+            os.unlink(self.path)
+        except OSError as e:
+            LOGGER.warning("Failed to remove shared buffer %s: %s", self.path, e)
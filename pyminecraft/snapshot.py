@@ -0,0 +1,125 @@
+"""实体快照与实体状态的解码"""
+
+from __future__ import annotations
+
+from typing import Any, Literal, NamedTuple, TypeAlias
+from collections.abc import Sequence
+from array import array
+from functools import cache
+import importlib
+import struct
+import sys
+import uuid
+
+from .vec import Vec3
+
+__all__ = ("SnapshotField", "SNAPSHOT_FIELDS", "EntityState")
+
+SnapshotField: TypeAlias = Literal["uuid", "pos", "vel", "rot", "type"]
+SNAPSHOT_FIELDS: tuple[SnapshotField, ...] = ("uuid", "pos", "vel", "rot", "type")
+
+# NumPy 导入较慢，只在第一次需要时导入
+
+
+@cache
+def _numpy() -> Any:
+    """导入 NumPy，未安装时返回None"""
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:  # NumPy 为可选依赖，缺失时退化为 array.array
+        return None
+
+
+def _numeric_column(
+    raw: memoryview, typecode: Literal["d", "f"], width: int, copy: bool = False
+) -> Any:
+    """
+    将小端数值列转为 NumPy 数组（形状 (n, width)）或扁平的 array.array
+
+    NumPy 数组默认直接引用 raw，copy 为 True 时复制
+    """
+    np = _numpy()
+    if np is not None:
+        column = np.frombuffer(raw, dtype="<" + typecode).reshape(-1, width)
+        return column.copy() if copy else column
+    column = array(typecode)
+    column.frombytes(raw)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _decode_snapshot(
+    data: bytes | memoryview, fields: Sequence[SnapshotField], copy: bool = False
+) -> dict[str, Any]:
+    """
+    解码 PymcMngr.snapshotEntities 返回的列式数据
+
+    Args:
+        copy (bool): 数值列是否复制，data 会被复用（如共享内存）时需要复制
+    """
+    view = memoryview(data)
+    (count,) = struct.unpack_from("<i", view)
+    offset = 4
+    columns: dict[str, Any] = {}
+    for field in fields:
+        if field == "uuid":
+            size = count * 16
+            columns[field] = [
+                str(uuid.UUID(int=msb << 64 | lsb))
+                for msb, lsb in struct.iter_unpack("<QQ", view[offset : offset + size])
+            ]
+        elif field in ("pos", "vel"):
+            size = count * 24
+            columns[field] = _numeric_column(view[offset : offset + size], "d", 3, copy)
+        elif field == "rot":
+            size = count * 8
+            columns[field] = _numeric_column(view[offset : offset + size], "f", 2, copy)
+        elif field == "type":
+            (palette_size,) = struct.unpack_from("<i", view, offset)
+            offset += 4
+            palette: list[str] = []
+            for _ in range(palette_size):
+                (length,) = struct.unpack_from("<h", view, offset)
+                palette.append(str(view[offset + 2 : offset + 2 + length], "utf-8"))
+                offset += 2 + length
+            size = count * 4
+            columns[field] = [
+                palette[index]
+                for (index,) in struct.iter_unpack("<i", view[offset : offset + size])
+            ]
+        else:
+            raise ValueError(f"Unknown snapshot field: {field}")
+        offset += size
+    return columns
+
+
+STATE_ALIVE = 1
+STATE_REMOVED = 2
+STATE_ON_GROUND = 4
+
+
+class EntityState(NamedTuple):
+    """PymcMngr.getEntityState 一次取回的实体状态"""
+
+    alive: bool
+    removed: bool
+    on_ground: bool
+    pos: Vec3
+    velocity: Vec3
+    pitch: float
+    yaw: float
+
+    @staticmethod
+    def unpack(data: bytes) -> EntityState:
+        """解码 PymcMngr.getEntityState 返回的数据"""
+        flags, x, y, z, vx, vy, vz, pitch, yaw = struct.unpack("<i6d2f", data)
+        return EntityState(
+            bool(flags & STATE_ALIVE),
+            bool(flags & STATE_REMOVED),
+            bool(flags & STATE_ON_GROUND),
+            Vec3(x, y, z),
+            Vec3(vx, vy, vz),
+            pitch,
+            yaw,
+        )
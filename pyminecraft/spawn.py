@@ -0,0 +1,111 @@
+"""批量召唤实体的参数编码"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping, NamedTuple, Sequence
+import struct
+import uuid
+
+from .nbt import dumps
+from .vec import Vec3, Vec3Like
+
+__all__ = ("SummonSpec",)
+
+HAS_POS = 1
+HAS_VELOCITY = 2
+HAS_ROTATION = 4
+HAS_NBT = 8
+
+
+class SummonSpec(NamedTuple):
+    """
+    World.summon_many 中的一个实体
+
+    Attributes:
+        id (str): 实体 id，如 "firework_rocket"
+        pos: 位置，缺省为世界出生点
+        velocity: 初速度
+        rotation: 旋转角度（俯仰角、偏航角）
+        nbt: 实体 NBT
+    """
+
+    id: str
+    pos: Vec3Like | None = None
+    velocity: Vec3Like | None = None
+    rotation: tuple[float, float] | None = None
+    nbt: Mapping[str, Any] | None = None
+
+
+SummonSpecs = Iterable[SummonSpec | Sequence[Any]] | Mapping[str, Sequence[Any]]
+
+
+def _rows(specs: SummonSpecs) -> Iterable[SummonSpec]:
+    """行式（SummonSpec 或元组的列表）或列式（字段名到列的映射）参数"""
+    if isinstance(specs, Mapping):
+        columns = [specs.get(field) for field in SummonSpec._fields]
+        count = len(specs["id"])
+        for column in columns:
+            if column is not None and len(column) != count:
+                raise ValueError("All summon columns must have the same length")
+        for i in range(count):
+            yield SummonSpec(
+                *(None if column is None else column[i] for column in columns)
+            )
+    else:
+        for spec in specs:
+            yield spec if isinstance(spec, SummonSpec) else SummonSpec(*spec)
+
+
+def pack_summon_specs(specs: SummonSpecs) -> bytes:
+    """
+    编码为 PymcMngr.summonMany 的参数（小端序）
+
+    数量 (int32)，之后每个实体依次为：id (int32 长度 + UTF-8)、标志 (int8)，
+    以及标志中存在的位置 (3 x float64)、速度 (3 x float64)、
+    旋转 (2 x float32，俯仰角、偏航角)、NBT (int32 长度 + 二进制 NBT)
+    """
+    out = bytearray(4)
+    count = 0
+    for spec in _rows(specs):
+        count += 1
+        name = spec.id.encode("utf-8")
+        flags = (
+            (HAS_POS if spec.pos is not None else 0)
+            | (HAS_VELOCITY if spec.velocity is not None else 0)
+            | (HAS_ROTATION if spec.rotation is not None else 0)
+            | (HAS_NBT if spec.nbt else 0)
+        )
+        out += struct.pack(f"<i{len(name)}sb", len(name), name, flags)
+        if spec.pos is not None:
+            out += struct.pack("<3d", *Vec3.of(spec.pos))
+        if spec.velocity is not None:
+            out += struct.pack("<3d", *Vec3.of(spec.velocity))
+        if spec.rotation is not None:
+            out += struct.pack("<2f", *spec.rotation)
+        if spec.nbt:
+            data = dumps(spec.nbt)
+            out += struct.pack("<i", len(data))
+            out += data
+    struct.pack_into("<i", out, 0, count)
+    return bytes(out)
+
+
+# summonMany 为每个实体返回的字节数：UUID (2 x uint64) 与任务 id (int32)
+RESULT_SIZE = struct.calcsize("<QQi")
+
+
+def unpack_summon_results(
+    data: bytes | memoryview,
+) -> tuple[list[str | None], list[int]]:
+    """
+    解码 summonMany 返回的结果
+
+    Returns:
+        tuple: 实体 UUID（召唤失败的实体为 None）与 on removed 任务 id（没有注册任务时为 -1）
+    """
+    uuids: list[str | None] = []
+    task_ids: list[int] = []
+    for msb, lsb, task_id in struct.iter_unpack("<QQi", data):
+        uuids.append(str(uuid.UUID(int=msb << 64 | lsb)) if msb or lsb else None)
+        task_ids.append(task_id)
+    return uuids, task_ids
@@ -1,8 +1,10 @@
 """工具"""
 
 from logging import getLogger
+from types import SimpleNamespace
 from typing import Callable
-from functools import wraps
+from functools import cache, wraps
+from importlib import import_module
 import time
 
 __all__ = ["LOGGER", "time_it"]
@@ -10,6 +12,35 @@ __all__ = ["LOGGER", "time_it"]
 LOGGER = getLogger("pymc")
 
 
+@cache
+def py4j_names() -> SimpleNamespace:
+    """
+    本包用到的 py4j 类与函数
+
+    py4j 导入较慢，import pyminecraft 时不导入，第一次调用时导入一次，之后直接返回
+    """
+    clientserver = import_module("py4j.clientserver")
+    java_gateway = import_module("py4j.java_gateway")
+    protocol = import_module("py4j.protocol")
+    return SimpleNamespace(
+        ClientServer=clientserver.ClientServer,
+        JavaParameters=clientserver.JavaParameters,
+        PythonParameters=clientserver.PythonParameters,
+        ThreadSafeFinalizer=import_module("py4j.finalizer").ThreadSafeFinalizer,
+        JavaList=import_module("py4j.java_collections").JavaList,
+        CallbackConnection=java_gateway.CallbackConnection,
+        CallbackServerParameters=java_gateway.CallbackServerParameters,
+        JavaGateway=java_gateway.JavaGateway,
+        JavaMember=java_gateway.JavaMember,
+        JavaObject=java_gateway.JavaObject,
+        get_field=java_gateway.get_field,
+        get_method=java_gateway.get_method,
+        Py4JJavaError=protocol.Py4JJavaError,
+        Py4JNetworkError=protocol.Py4JNetworkError,
+        smart_decode=protocol.smart_decode,
+    )
+
+
 def time_it(func: Callable, name="", time_limit=0) -> Callable:
     """
     装饰器，用于计算函数执行时间。
@@ -0,0 +1,150 @@
+"""纯 Python 的三维向量值类型"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, SupportsFloat, TypeAlias
+import math
+import sys
+
+__all__ = ("Vec3",)
+
+
+class Vec3:
+    """
+    不可变的三维向量
+
+    运算全部在本地完成，只有作为参数传回 Java 时才会创建 Vec3d。
+    可以像元组一样解包，也支持 numpy.asarray(vec)。
+    """
+
+    __slots__ = ("x", "y", "z")
+
+    x: float
+    y: float
+    z: float
+
+    def __init__(self, x: SupportsFloat, y: SupportsFloat, z: SupportsFloat) -> None:
+        object.__setattr__(self, "x", float(x))
+        object.__setattr__(self, "y", float(y))
+        object.__setattr__(self, "z", float(z))
+
+    @classmethod
+    def of(cls, value: Vec3Like) -> Vec3:
+        """将 Vec3、元组或任意长度为3的可迭代对象转为 Vec3"""
+        if isinstance(value, Vec3):
+            return value
+        x, y, z = value
+        return cls(x, y, z)
+
+    @classmethod
+    def zero(cls) -> Vec3:
+        """零向量"""
+        return cls(0.0, 0.0, 0.0)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (type(self), (self.x, self.y, self.z))
+
+    @property
+    def xyz(self) -> tuple[float, float, float]:
+        """x, y, z"""
+        return self.x, self.y, self.z
+
+    def __iter__(self) -> Iterator[float]:
+        """允许将 Vec3 解包为 (x, y, z)"""
+        yield self.x
+        yield self.y
+        yield self.z
+
+    def __len__(self) -> int:
+        return 3
+
+    def __getitem__(self, index: int) -> float:
+        return self.xyz[index]
+
+    def __add__(self, other: Vec3Like) -> Vec3:
+        """两个向量相加"""
+        x, y, z = other
+        return Vec3(self.x + x, self.y + y, self.z + z)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Vec3Like) -> Vec3:
+        """两个向量相减"""
+        x, y, z = other
+        return Vec3(self.x - x, self.y - y, self.z - z)
+
+    def __rsub__(self, other: Vec3Like) -> Vec3:
+        x, y, z = other
+        return Vec3(x - self.x, y - self.y, z - self.z)
+
+    def __mul__(self, other: float) -> Vec3:
+        """向量数乘"""
+        return Vec3(self.x * other, self.y * other, self.z * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: float) -> Vec3:
+        """向量数除"""
+        return Vec3(self.x / other, self.y / other, self.z / other)
+
+    def __neg__(self) -> Vec3:
+        return Vec3(-self.x, -self.y, -self.z)
+
+    def __abs__(self) -> float:
+        return self.length()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Vec3):
+            return self.xyz == other.xyz
+        if isinstance(other, tuple):
+            return self.xyz == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.xyz)
+
+    def __repr__(self) -> str:
+        return f"Vec3({self.x!r}, {self.y!r}, {self.z!r})"
+
+    def __array__(self, dtype: Any = None, copy: bool | None = None) -> Any:
+        """NumPy 互操作：numpy.asarray(vec)"""
+        # 只有 NumPy 会调用本方法，此时它已导入
+        np = sys.modules["numpy"]
+        _ = copy  # 总是返回新数组
+        return np.array(self.xyz, dtype=dtype)
+
+    def dot(self, other: Vec3Like) -> float:
+        """点积"""
+        x, y, z = other
+        return self.x * x + self.y * y + self.z * z
+
+    def cross(self, other: Vec3Like) -> Vec3:
+        """叉积"""
+        x, y, z = other
+        return Vec3(
+            self.y * z - self.z * y,
+            self.z * x - self.x * z,
+            self.x * y - self.y * x,
+        )
+
+    def length(self) -> float:
+        """向量长度"""
+        return math.sqrt(self.dot(self))
+
+    def normalize(self) -> Vec3:
+        """单位向量，零向量返回自身"""
+        length = self.length()
+        return self if length == 0 else self / length
+
+    def distance_to(self, other: Vec3Like) -> float:
+        """到另一点的距离"""
+        return (self - other).length()
+
+
+Vec3Like: TypeAlias = Vec3 | tuple[float, float, float] | Iterable[SupportsFloat]
@@ -0,0 +1,69 @@
+"""
+PyMiecraft Fabric
+测试：写后缓冲的参数编码
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import struct
+from types import SimpleNamespace
+
+from pyminecraft.buffer import (
+    ARG_BOOL,
+    ARG_BYTES,
+    ARG_DOUBLE,
+    ARG_INT,
+    ARG_LONG,
+    ARG_NULL,
+    ARG_REF,
+    ARG_STRING,
+    NBT_ENCODED,
+    NBT_REF,
+    pack_arg,
+    pack_invoke,
+    pack_nbt_value,
+    pack_string,
+)
+from pyminecraft.nbt import dumps
+
+# 带 target_id 的代理对象
+REF = SimpleNamespace(target_id="o12")
+
+
+def test_pack_string() -> None:
+    """小端 int32 字节长度 + UTF-8"""
+    assert pack_string("é") == struct.pack("<i", 2) + "é".encode("utf-8")
+
+
+def test_pack_arg() -> None:
+    """各类型参数，int 超出 int32 时为 long"""
+    assert pack_arg(None) == struct.pack("<b", ARG_NULL)
+    assert pack_arg(True) == struct.pack("<b?", ARG_BOOL, True)
+    assert pack_arg(2**31 - 1) == struct.pack("<bi", ARG_INT, 2**31 - 1)
+    assert pack_arg(2**31) == struct.pack("<bq", ARG_LONG, 2**31)
+    assert pack_arg(0.5) == struct.pack("<bd", ARG_DOUBLE, 0.5)
+    assert pack_arg("a") == struct.pack("<b", ARG_STRING) + pack_string("a")
+    assert pack_arg(b"xy") == struct.pack("<bi", ARG_BYTES, 2) + b"xy"
+    assert pack_arg(REF) == struct.pack("<b", ARG_REF) + pack_string("o12")
+
+
+def test_pack_arg_unsupported() -> None:
+    """无法编码的参数需要同步调用"""
+    assert pack_arg(object()) is None
+    assert pack_arg([1, 2]) is None
+
+
+def test_pack_invoke() -> None:
+    """方法名、int32 参数个数与各参数；有参数无法编码时为 None"""
+    assert pack_invoke("setSilent", [True]) == (
+        pack_string("setSilent") + struct.pack("<i", 1) + pack_arg(True)
+    )
+    assert pack_invoke("kill", ()) == pack_string("kill") + struct.pack("<i", 0)
+    assert pack_invoke("setSilent", [object()]) is None
+
+
+def test_pack_nbt_value() -> None:
+    """Java 端对象按 id 引用，其余编码为二进制 NBT"""
+    assert pack_nbt_value(REF) == struct.pack("<b", NBT_REF) + pack_string("o12")
+    data = dumps({"": 3})
+    assert pack_nbt_value(3) == struct.pack("<bi", NBT_ENCODED, len(data)) + data
@@ -0,0 +1,60 @@
+"""
+PyMiecraft Fabric
+测试：过滤标志编译为 S 表达式
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import pytest
+
+from pyminecraft.filters import (
+    EntityType,
+    EveryNth,
+    HasNbt,
+    HasTag,
+    Near,
+    Sample,
+    WithinBox,
+)
+
+
+def test_entity_filters() -> None:
+    """实体条件，实体 id 缺省命名空间时补全为 minecraft"""
+    assert EntityType("creeper", "mod:thing").compile() == (
+        "(type minecraft:creeper mod:thing)"
+    )
+    assert WithinBox((0, 0, 0), (1, 2, 3)).compile() == (
+        "(box 0.0 0.0 0.0 1.0 2.0 3.0)"
+    )
+    assert Near((0, 64, 0), 16).compile() == "(near 0.0 64.0 0.0 16.0)"
+    assert HasTag("boss").compile() == "(tag boss)"
+    assert HasNbt("CustomName").compile() == "(nbt CustomName)"
+
+
+def test_tick_filters() -> None:
+    """相位取模，概率以浮点数输出"""
+    assert EveryNth(20, 25).compile() == "(every 20 5)"
+    assert Sample(1).compile() == "(sample 1.0)"
+
+
+def test_combinators() -> None:
+    """&、|、~ 组合为 and、or、not"""
+    combined = (HasTag("a") & ~HasTag("b")) | EveryNth(2)
+    assert combined.compile() == "(or (and (tag a) (not (tag b))) (every 2 0))"
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        EntityType,
+        lambda: EntityType("bad id"),
+        lambda: HasTag("a(b)"),
+        lambda: HasNbt(""),
+        lambda: EveryNth(0),
+        lambda: Sample(1.5),
+    ],
+)
+def test_invalid_arguments(make) -> None:
+    """空参数、含空白或括号的原子与超出范围的数值"""
+    with pytest.raises(ValueError):
+        make()
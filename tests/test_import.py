@@ -0,0 +1,54 @@
+"""
+PyMiecraft Fabric
+测试：import pyminecraft 没有副作用
+
+在新的解释器中导入，检查没有导入较慢的可选模块、没有启动线程、没有连接游戏。
+耗时的测量见 benchmarks/import_time.py
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import json
+import pathlib
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# 只在第一次需要时导入的模块
+LAZY_MODULES = ("py4j", "multiprocessing", "concurrent.futures.process", "numpy")
+
+PROBE = """
+import json, sys, threading
+import pyminecraft
+from pyminecraft.connection import _connection
+print(json.dumps({
+    "modules": [name for name in %r if name in sys.modules],
+    "threads": threading.active_count(),
+    "connected": _connection.connected,
+}))
+""" % (LAZY_MODULES,)
+
+
+def _probe() -> dict:
+    stdout = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+        timeout=60,
+    ).stdout
+    return json.loads(stdout.splitlines()[-1])
+
+
+def test_import_is_lazy() -> None:
+    """导入时不导入 py4j、multiprocessing 与 NumPy"""
+    assert not _probe()["modules"]
+
+
+def test_import_has_no_side_effects() -> None:
+    """导入时不启动线程，也不连接游戏"""
+    result = _probe()
+    assert result["threads"] == 1
+    assert not result["connected"]
@@ -0,0 +1,99 @@
+"""
+PyMiecraft Fabric
+测试：二进制 NBT 编码
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import struct
+
+import pytest
+
+from pyminecraft.nbt import (
+    NbtByte,
+    NbtFloat,
+    NbtInt,
+    NbtIntArray,
+    NbtLong,
+    NbtLongArray,
+    NbtShort,
+    dumps,
+)
+
+# 根标签：Compound 类型与空名称
+ROOT = b"\x0a\x00\x00"
+
+
+def _entry(kind: int, name: str, payload: bytes) -> bytes:
+    data = name.encode("utf-8")
+    return bytes((kind,)) + struct.pack(">H", len(data)) + data + payload
+
+
+def test_empty_compound() -> None:
+    """空 compound 只有根标签与 End"""
+    assert dumps({}) == ROOT + b"\x00"
+
+
+def test_inferred_types() -> None:
+    """bool 为 Byte，int 按范围为 Int 或 Long，float 为 Double"""
+    data = dumps({"b": True, "i": 7, "l": 2**40, "d": 0.5, "s": "hi"})
+    assert data == (
+        ROOT
+        + _entry(1, "b", b"\x01")
+        + _entry(3, "i", struct.pack(">i", 7))
+        + _entry(4, "l", struct.pack(">q", 2**40))
+        + _entry(6, "d", struct.pack(">d", 0.5))
+        + _entry(8, "s", b"\x00\x02hi")
+        + b"\x00"
+    )
+
+
+def test_explicit_tags() -> None:
+    """显式类型的标签按各自格式编码"""
+    data = dumps({"s": NbtShort(3), "f": NbtFloat(1.5), "y": NbtByte(False)})
+    assert data == (
+        ROOT
+        + _entry(2, "s", struct.pack(">h", 3))
+        + _entry(5, "f", struct.pack(">f", 1.5))
+        + _entry(1, "y", b"\x00")
+        + b"\x00"
+    )
+
+
+def test_arrays() -> None:
+    """数组为 int32 长度加各元素"""
+    assert NbtIntArray([1, -1]).pack() == struct.pack(">iii", 2, 1, -1)
+    assert NbtLongArray(()).pack() == struct.pack(">i", 0)
+
+
+def test_nested_list_and_compound() -> None:
+    """列表带元素类型与长度，Int 与 Long 混合时统一为 Long"""
+    data = dumps({"l": [1, 2**40], "c": {"x": NbtInt(1)}})
+    assert data == (
+        ROOT
+        + _entry(9, "l", b"\x04" + struct.pack(">iqq", 2, 1, 2**40))
+        + _entry(10, "c", _entry(3, "x", struct.pack(">i", 1)) + b"\x00")
+        + b"\x00"
+    )
+
+
+def test_modified_utf8() -> None:
+    """NUL 编码为两个字节，补充平面字符拆分为代理项"""
+    data = dumps({"s": "\0\U0001f600"})
+    payload = b"\xc0\x80" + b"\xed\xa0\xbd\xed\xb8\x80"
+    assert data == ROOT + _entry(8, "s", struct.pack(">H", 8) + payload) + b"\x00"
+
+
+def test_tags_compare_by_type_and_value() -> None:
+    """相同类型与值的标签相等"""
+    assert NbtInt(1) == NbtInt(1.0)
+    assert NbtInt(1) != NbtLong(1)
+    assert len({NbtInt(1), NbtInt(1), NbtLong(1)}) == 2
+
+
+def test_invalid_values() -> None:
+    """无法编码的值与元素类型不一致的列表"""
+    with pytest.raises(TypeError):
+        dumps({"x": object()})
+    with pytest.raises(TypeError):
+        dumps({"x": [1, "a"]})
@@ -0,0 +1,71 @@
+"""
+PyMiecraft Fabric
+测试：实体快照与实体状态的解码
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import struct
+import uuid
+
+import pytest
+
+from pyminecraft import snapshot
+from pyminecraft.snapshot import EntityState, _decode_snapshot
+from pyminecraft.vec import Vec3
+
+UUIDS = [uuid.uuid4(), uuid.uuid4()]
+
+
+def _snapshot() -> bytes:
+    """两个实体的全部字段，顺序与 SNAPSHOT_FIELDS 一致"""
+    data = struct.pack("<i", 2)
+    for entity in UUIDS:
+        data += struct.pack("<QQ", entity.int >> 64, entity.int & (2**64 - 1))
+    data += struct.pack("<6d", 1, 2, 3, 4, 5, 6)
+    data += struct.pack("<6d", 0, 0.5, 0, 0, -0.5, 0)
+    data += struct.pack("<4f", 10, 20, 30, 40)
+    data += struct.pack("<ih3sh6s", 2, 3, b"pig", 6, b"zombie")
+    data += struct.pack("<2i", 1, 0)
+    return data
+
+
+def test_decode_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """未安装 NumPy 时数值列为扁平的 array.array"""
+    monkeypatch.setattr(snapshot, "_numpy", lambda: None)
+    columns = _decode_snapshot(_snapshot(), snapshot.SNAPSHOT_FIELDS)
+    assert columns["uuid"] == [str(entity) for entity in UUIDS]
+    assert list(columns["pos"]) == [1, 2, 3, 4, 5, 6]
+    assert list(columns["vel"]) == [0, 0.5, 0, 0, -0.5, 0]
+    assert list(columns["rot"]) == [10, 20, 30, 40]
+    assert columns["type"] == ["zombie", "pig"]
+
+
+def test_decode_with_numpy() -> None:
+    """NumPy 数组形状为 (n, width)，copy 为 True 时不引用原数据"""
+    np = pytest.importorskip("numpy")
+    data = bytearray(_snapshot())
+    columns = _decode_snapshot(data, ("uuid", "pos"), copy=True)
+    assert columns["pos"].shape == (2, 3)
+    data[36:44] = struct.pack("<d", 9)
+    assert np.array_equal(columns["pos"], [[1, 2, 3], [4, 5, 6]])
+
+
+def test_decode_field_subset() -> None:
+    """只解码请求的字段"""
+    data = struct.pack("<i", 1) + struct.pack("<ih3s", 1, 3, b"pig") + b"\0" * 4
+    assert _decode_snapshot(data, ("type",)) == {"type": ["pig"]}
+
+
+def test_unknown_field() -> None:
+    """未知的字段名"""
+    with pytest.raises(ValueError):
+        _decode_snapshot(struct.pack("<i", 0), ("health",))
+
+
+def test_entity_state() -> None:
+    """标志位与位置、速度、朝向"""
+    data = struct.pack("<i6d2f", 1 | 4, 1, 2, 3, 0, -1, 0, 15, 90)
+    assert EntityState.unpack(data) == EntityState(
+        True, False, True, Vec3(1, 2, 3), Vec3(0, -1, 0), 15.0, 90.0
+    )
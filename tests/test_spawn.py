@@ -0,0 +1,78 @@
+"""
+PyMiecraft Fabric
+测试：批量召唤的参数编码与结果解码
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import struct
+import uuid
+
+import pytest
+
+from pyminecraft.nbt import dumps
+from pyminecraft.spawn import (
+    HAS_NBT,
+    HAS_POS,
+    HAS_ROTATION,
+    HAS_VELOCITY,
+    RESULT_SIZE,
+    SummonSpec,
+    pack_summon_specs,
+    unpack_summon_results,
+)
+
+
+def test_pack_minimal_spec() -> None:
+    """只有 id 时标志为 0"""
+    assert pack_summon_specs([SummonSpec("pig")]) == struct.pack(
+        "<ii3sb", 1, 3, b"pig", 0
+    )
+
+
+def test_pack_full_spec() -> None:
+    """标志中存在的字段依次编码"""
+    nbt = dumps({"Glowing": True})
+    spec = SummonSpec("pig", (1, 2, 3), (0, 0.5, 0), (10.0, 90.0), {"Glowing": True})
+    assert pack_summon_specs([spec]) == (
+        struct.pack(
+            "<ii3sb3d3d2fi",
+            1,
+            3,
+            b"pig",
+            HAS_POS | HAS_VELOCITY | HAS_ROTATION | HAS_NBT,
+            1,
+            2,
+            3,
+            0,
+            0.5,
+            0,
+            10,
+            90,
+            len(nbt),
+        )
+        + nbt
+    )
+
+
+def test_rows_and_columns_are_equivalent() -> None:
+    """行式与列式参数编码结果相同"""
+    rows = [("pig", (0, 64, 0)), SummonSpec("cow", (1, 64, 0))]
+    columns = {"id": ["pig", "cow"], "pos": [(0, 64, 0), (1, 64, 0)]}
+    assert pack_summon_specs(rows) == pack_summon_specs(columns)
+
+
+def test_columns_must_share_length() -> None:
+    """列式参数的各列长度不一致"""
+    with pytest.raises(ValueError):
+        pack_summon_specs({"id": ["pig", "cow"], "pos": [(0, 64, 0)]})
+
+
+def test_unpack_results() -> None:
+    """全零的 UUID 表示召唤失败"""
+    entity = uuid.uuid4()
+    data = struct.pack(
+        "<QQiQQi", entity.int >> 64, entity.int & (2**64 - 1), 5, 0, 0, -1
+    )
+    assert len(data) == 2 * RESULT_SIZE
+    assert unpack_summon_results(data) == ([str(entity), None], [5, -1])
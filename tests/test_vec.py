@@ -0,0 +1,58 @@
+"""
+PyMiecraft Fabric
+测试：三维向量值类型
+
+Link: https://github.com/StickyMouse27/PyMiecraft-Fabric
+"""
+
+import math
+import pickle
+
+import pytest
+
+from pyminecraft.vec import Vec3
+
+
+def test_arithmetic() -> None:
+    """与 Vec3 或元组运算"""
+    v = Vec3(1, 2, 3)
+    assert v + (1, 1, 1) == Vec3(2, 3, 4)
+    assert (1, 1, 1) + v == (2, 3, 4)
+    assert (0, 0, 0) - v == -v
+    assert 2 * v == v * 2 == Vec3(2, 4, 6)
+    assert v / 2 == Vec3(0.5, 1, 1.5)
+
+
+def test_products_and_length() -> None:
+    """点积、叉积、长度与单位向量"""
+    x, y = Vec3(1, 0, 0), Vec3(0, 1, 0)
+    assert x.dot(y) == 0
+    assert x.cross(y) == Vec3(0, 0, 1)
+    assert abs(Vec3(3, 4, 0)) == 5
+    assert Vec3(0, 0, 2).normalize() == Vec3(0, 0, 1)
+    assert Vec3.zero().normalize() == Vec3.zero()
+    assert math.isclose(x.distance_to(y), math.sqrt(2))
+
+
+def test_sequence_protocol() -> None:
+    """解包、索引、长度与哈希"""
+    v = Vec3.of([1, 2, 3])
+    x, y, z = v
+    assert (x, y, z) == v.xyz == (1.0, 2.0, 3.0)
+    assert v[2] == 3 and len(v) == 3
+    assert hash(v) == hash((1.0, 2.0, 3.0))
+    assert Vec3.of(v) is v
+
+
+def test_immutable_and_picklable() -> None:
+    """不可修改，可以序列化（传给卸载任务的子进程）"""
+    v = Vec3(1, 2, 3)
+    with pytest.raises(AttributeError):
+        v.x = 0
+    assert pickle.loads(pickle.dumps(v)) == v
+
+
+def test_numpy_interop() -> None:
+    """numpy.asarray(vec)"""
+    np = pytest.importorskip("numpy")
+    assert np.asarray(Vec3(1, 2, 3), dtype=np.float32).tolist() == [1, 2, 3]